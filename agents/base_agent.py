@@ -0,0 +1,521 @@
+"""
+Base Agent - Shared LLM call path for the co-founder agents
+Every agent sends its messages through these helpers, so behaviour that
+applies to all LLM calls lives in one place
+"""
+
+import asyncio
+import json
+import time
+from typing import Callable, Iterator, List, Optional
+
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration
+from pydantic import ValidationError
+
+from agents.cassettes import get_cassette
+from agents.instrumentation import LLMCallRecord, cached_prompt_tokens, record_llm_call, usage_tokens
+from agents.llm_cache import cache_lookup_skipped, get_llm_cache
+from agents.llm_client import get_llm
+from agents.model_routing import get_escalation_policy, model_for
+from agents.rate_limiter import estimate_call_tokens, get_rate_limiter
+from agents.resilience import backend_answered, get_circuit_breaker, get_retry_policy, is_retryable
+from agents.schemas import AgentBrief
+
+
+class BaseAgent:
+    """
+    Common parent of the Strategy, Technical and Marketing agents.
+
+    Subclasses call _load_models() and set `self.system_prompt` in
+    __init__ and build their own messages; this class only knows how to
+    send them.
+
+    Every call goes: response cache -> circuit breaker -> rate limiter
+    -> LLM, retrying transient failures with backoff. Cache hits never
+    touch the rate limiter or the network. With a cassette on
+    (agents/cassettes.py) the LLM step is recorded to or replayed from disk.
+
+    Prompts are laid out static-first (see _build_messages): the system
+    prompt and a method's fixed instructions open every call, and the
+    idea and upstream context come last. Calls of the same method then
+    share a prompt prefix the provider can serve from its prompt cache.
+    """
+
+    # Typical answer length, used to reserve rate-limit budget before a call
+    EXPECTED_COMPLETION_TOKENS = 1500
+
+    def _load_models(self, agent: str, temperature: float) -> None:
+        """
+        Create the agent's models from the routing config (agents/model_routing.py):
+        `self.llm` for the analyses, `self.draft_llm` and `self.quick_llm`
+        for cheaper calls
+        """
+        self.model_name = model_for(agent, "analysis")
+        self.llm = get_llm(self.model_name, temperature=temperature)
+        self.draft_llm = get_llm(model_for(agent, "draft"), temperature=temperature)
+        self.quick_llm = get_llm(model_for(agent, "quick"), temperature=temperature)
+
+    def _build_messages(self, instructions: str, inputs: str) -> list:
+        """
+        System prompt, then the fixed instructions, then the variable inputs
+
+        Args:
+            instructions (str): The method's instructions - must not contain
+                anything that changes between calls
+            inputs (str): The startup idea, upstream context, ...
+
+        Returns:
+            list: Messages for the call
+        """
+        return [
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(content=f"{instructions}\n\n{inputs}")
+        ]
+
+    def _cache_key(self, messages: List[BaseMessage], llm) -> tuple:
+        # Same key LangChain builds for its own llm cache: the serialized
+        # messages plus the model parameters (model name, temperature, ...).
+        # A bound model (llm.bind(response_format=...)) forwards
+        # _get_llm_string to the inner model, so its call options are added
+        llm_string = llm._get_llm_string()
+        bound = getattr(llm, "kwargs", None)
+        if bound:
+            llm_string += "\x00" + json.dumps(bound, sort_keys=True, default=str)
+        return dumps(messages), llm_string
+
+    def _cache_lookup(self, messages: List[BaseMessage], llm) -> tuple:
+        """
+        Returns:
+            tuple: (cache key, cached AIMessage or None)
+        """
+        llm_cache = get_llm_cache()
+        if llm_cache is None:
+            return None, None
+
+        key = self._cache_key(messages, llm)
+        if cache_lookup_skipped():
+            return key, None
+
+        cached = llm_cache.lookup(*key)
+        if cached:
+            return key, cached[0].message
+        return key, None
+
+    def _cache_store(self, key: Optional[tuple], message: AIMessage) -> None:
+        llm_cache = get_llm_cache()
+        if llm_cache is not None and key is not None:
+            llm_cache.update(*key, [ChatGeneration(message=message)])
+
+    @staticmethod
+    def _total_tokens(message: AIMessage) -> Optional[int]:
+        usage = getattr(message, "usage_metadata", None)
+        return usage["total_tokens"] if usage else None
+
+    def _attempt_failed(self, error: Exception, attempt: int, estimate: int) -> Optional[float]:
+        """
+        Book-keeping after a failed LLM attempt
+
+        Returns:
+            float: Seconds to wait before the next attempt, or None when
+            the error should be raised (fatal error or attempts used up)
+        """
+        limiter = get_rate_limiter()
+        if limiter:
+            # Nothing was generated - give the reserved tokens back
+            limiter.record_usage(estimate, 0)
+
+        breaker = get_circuit_breaker()
+        if not is_retryable(error):
+            if backend_answered(error):
+                # The backend answered, it just rejected this request
+                breaker.record_success()
+            else:
+                # Never got an answer (cassette miss, parsing error, bug) -
+                # says nothing about the backend either way
+                breaker.release_trial()
+            return None
+
+        breaker.record_failure()
+
+        policy = get_retry_policy()
+        if attempt >= policy.max_attempts:
+            return None
+        return policy.delay(attempt, error)
+
+    def _attempt_abandoned(self, estimate: int) -> None:
+        """
+        Book-keeping when an attempt ends without an outcome: the stream's
+        reader stopped, the task was cancelled or the user hit Ctrl+C
+        """
+        limiter = get_rate_limiter()
+        if limiter:
+            limiter.record_usage(estimate, 0)
+        get_circuit_breaker().release_trial()
+
+    @staticmethod
+    def _record_call(
+        started_at: float,
+        response: Optional[AIMessage],
+        llm,
+        first_token_at: Optional[float] = None,
+        cache_hit: bool = False,
+        queued_s: float = 0.0
+    ) -> None:
+        prompt_tokens, completion_tokens = (0, 0) if cache_hit else usage_tokens(response)
+        record_llm_call(LLMCallRecord(
+            started_at=started_at,
+            ended_at=time.time(),
+            first_token_at=first_token_at,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_prompt_tokens=0 if cache_hit else cached_prompt_tokens(response),
+            cache_hit=cache_hit,
+            queued_s=round(queued_s, 3),
+            model=getattr(llm, "model_name", type(llm).__name__)
+        ))
+
+    def _call_llm(self, llm, messages: List[BaseMessage]) -> AIMessage:
+        # The model itself, or the cassette recording/replaying it (agents/cassettes.py)
+        cassette = get_cassette()
+        if cassette is None:
+            return llm.invoke(messages)
+        return cassette.invoke(type(self).__name__, llm, messages)
+
+    def _stream_llm(self, llm, messages: List[BaseMessage]) -> Iterator:
+        cassette = get_cassette()
+        if cassette is None:
+            return llm.stream(messages)
+        return cassette.stream(type(self).__name__, llm, messages)
+
+    async def _acall_llm(self, llm, messages: List[BaseMessage]) -> AIMessage:
+        cassette = get_cassette()
+        if cassette is None:
+            return await llm.ainvoke(messages)
+        return await cassette.ainvoke(type(self).__name__, llm, messages)
+
+    def _attempt_succeeded(self, response: AIMessage, estimate: int) -> None:
+        get_circuit_breaker().record_success()
+
+        limiter = get_rate_limiter()
+        if limiter:
+            limiter.record_usage(estimate, self._total_tokens(response))
+
+    def _draft_is_enough(self, response: AIMessage, expected_sections: int) -> bool:
+        if get_escalation_policy().is_complete(response, expected_sections):
+            return True
+        print(f"   ↗️ Draft answer looked incomplete - escalating to {self.model_name}")
+        return False
+
+    def _escalates(self, expected_sections: Optional[int]) -> bool:
+        """
+        True when this call should try the small draft model first
+        """
+        draft_llm = getattr(self, "draft_llm", None)
+        return (
+            expected_sections is not None
+            and get_escalation_policy() is not None
+            and draft_llm is not None
+            and draft_llm is not self.llm
+        )
+
+    def _invoke(
+        self,
+        messages: List[BaseMessage],
+        llm=None,
+        expected_sections: Optional[int] = None
+    ) -> str:
+        """
+        Send messages to the LLM and wait for the complete answer
+
+        Args:
+            messages (list): System and human messages for the call
+            llm: Model to use (default: the agent's analysis model)
+            expected_sections (int): "## " sections the prompt asks for;
+                lets the escalation policy try the draft model first
+
+        Returns:
+            str: The full response text
+        """
+        if self._escalates(expected_sections):
+            draft = self._invoke_message(messages, self.draft_llm)
+            if self._draft_is_enough(draft, expected_sections):
+                return draft.content
+
+        return self._invoke_message(messages, llm or self.llm).content
+
+    def _invoke_message(
+        self,
+        messages: List[BaseMessage],
+        llm,
+        cacheable: Optional[Callable[[AIMessage], bool]] = None
+    ) -> AIMessage:
+        """
+        One model's complete answer, through cache, breaker, limiter and retries
+
+        Args:
+            messages (list): Messages for the call
+            llm: Model to call
+            cacheable: A fresh answer is only stored in the response cache
+                if this returns True for it (default: always stored)
+        """
+        started_at = time.time()
+        key, cached = self._cache_lookup(messages, llm)
+        if cached is not None:
+            self._record_call(started_at, cached, llm, cache_hit=True)
+            return cached
+
+        limiter = get_rate_limiter()
+        estimate = estimate_call_tokens(messages, self.EXPECTED_COMPLETION_TOKENS)
+        attempt = 0
+        queued = 0.0
+
+        while True:
+            attempt += 1
+            get_circuit_breaker().before_call()
+            try:
+                if limiter:
+                    queued += limiter.acquire(estimate)
+                response = self._call_llm(llm, messages)
+            except Exception as e:
+                delay = self._attempt_failed(e, attempt, estimate)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self._attempt_abandoned(estimate)
+                raise
+
+            self._attempt_succeeded(response, estimate)
+            self._record_call(started_at, response, llm, queued_s=queued)
+            if cacheable is None or cacheable(response):
+                self._cache_store(key, response)
+            return response
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        llm=None,
+        expected_sections: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Send messages to the LLM and yield the answer token by token
+
+        A failed attempt is only retried if it had not produced any text
+        yet - once tokens reached the caller the error is raised.
+
+        With escalation on, the draft model's answer is checked before
+        anything is yielded: it arrives in one piece if kept, otherwise
+        the analysis model streams as usual.
+
+        Args:
+            messages (list): System and human messages for the call
+            llm: Model to use (default: the agent's analysis model)
+            expected_sections (int): "## " sections the prompt asks for
+
+        Yields:
+            str: Response text fragments as they arrive
+        """
+        if self._escalates(expected_sections):
+            draft = self._invoke_message(messages, self.draft_llm)
+            if self._draft_is_enough(draft, expected_sections):
+                yield draft.content
+                return
+
+        llm = llm or self.llm
+        started_at = time.time()
+        key, cached = self._cache_lookup(messages, llm)
+        if cached is not None:
+            first_token_at = time.time()
+            yield cached.content
+            self._record_call(started_at, cached, llm, first_token_at, cache_hit=True)
+            return
+
+        limiter = get_rate_limiter()
+        estimate = estimate_call_tokens(messages, self.EXPECTED_COMPLETION_TOKENS)
+        attempt = 0
+        queued = 0.0
+
+        while True:
+            attempt += 1
+            get_circuit_breaker().before_call()
+            response = None
+            first_token_at = None
+            try:
+                if limiter:
+                    queued += limiter.acquire(estimate)
+                for chunk in self._stream_llm(llm, messages):
+                    response = chunk if response is None else response + chunk
+                    if chunk.content:
+                        if first_token_at is None:
+                            first_token_at = time.time()
+                        yield chunk.content
+            except Exception as e:
+                delay = self._attempt_failed(e, attempt, estimate)
+                if delay is None or (response is not None and response.content):
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # GeneratorExit lands here when the reader closes the stream
+                self._attempt_abandoned(estimate)
+                raise
+
+            break
+
+        self._attempt_succeeded(response, estimate)
+        self._record_call(started_at, response, llm, first_token_at, queued_s=queued)
+        if response is None:
+            return
+
+        self._cache_store(
+            key,
+            AIMessage(
+                content=response.content,
+                usage_metadata=response.usage_metadata,
+                response_metadata=response.response_metadata
+            )
+        )
+
+    async def _ainvoke(
+        self,
+        messages: List[BaseMessage],
+        llm=None,
+        expected_sections: Optional[int] = None
+    ) -> str:
+        """
+        Async version of _invoke - awaits the complete answer without
+        blocking the event loop
+
+        Args:
+            messages (list): System and human messages for the call
+            llm: Model to use (default: the agent's analysis model)
+            expected_sections (int): "## " sections the prompt asks for
+
+        Returns:
+            str: The full response text
+        """
+        if self._escalates(expected_sections):
+            draft = await self._ainvoke_message(messages, self.draft_llm)
+            if self._draft_is_enough(draft, expected_sections):
+                return draft.content
+
+        response = await self._ainvoke_message(messages, llm or self.llm)
+        return response.content
+
+    async def _ainvoke_message(
+        self,
+        messages: List[BaseMessage],
+        llm,
+        cacheable: Optional[Callable[[AIMessage], bool]] = None
+    ) -> AIMessage:
+        """
+        Async version of _invoke_message - the response cache's SQLite
+        reads and writes run in a worker thread, off the event loop
+        """
+        started_at = time.time()
+        key, cached = await asyncio.to_thread(self._cache_lookup, messages, llm)
+        if cached is not None:
+            self._record_call(started_at, cached, llm, cache_hit=True)
+            return cached
+
+        limiter = get_rate_limiter()
+        estimate = estimate_call_tokens(messages, self.EXPECTED_COMPLETION_TOKENS)
+        attempt = 0
+        queued = 0.0
+
+        while True:
+            attempt += 1
+            get_circuit_breaker().before_call()
+            try:
+                if limiter:
+                    queued += await limiter.aacquire(estimate)
+                response = await self._acall_llm(llm, messages)
+            except Exception as e:
+                delay = self._attempt_failed(e, attempt, estimate)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # CancelledError is a BaseException
+                self._attempt_abandoned(estimate)
+                raise
+
+            self._attempt_succeeded(response, estimate)
+            self._record_call(started_at, response, llm, queued_s=queued)
+            if cacheable is None or cacheable(response):
+                await asyncio.to_thread(self._cache_store, key, response)
+            return response
+
+    @staticmethod
+    def _json_mode(llm):
+        # Groq's JSON mode: the answer is guaranteed to parse as JSON
+        return llm.bind(response_format={"type": "json_object"})
+
+    @staticmethod
+    def _repair_messages(messages: List[BaseMessage], response: AIMessage, error: ValidationError) -> list:
+        """
+        Messages asking the model to fix an answer that didn't match the schema
+        """
+        return messages + [
+            response,
+            HumanMessage(content=f"That JSON does not match the schema:\n{error}\n\nReply with the corrected JSON object only."),
+        ]
+
+    @staticmethod
+    def _matches_schema(schema: type) -> Callable[[AIMessage], bool]:
+        """
+        Cache check for structured calls - an answer that doesn't validate
+        is not stored, so a later identical call asks the model again
+        instead of replaying the broken answer into the repair step
+        """
+        def matches(response: AIMessage) -> bool:
+            try:
+                schema.model_validate_json(response.content)
+                return True
+            except ValidationError:
+                return False
+        return matches
+
+    def _invoke_structured(self, messages: List[BaseMessage], schema: type, llm=None) -> AgentBrief:
+        """
+        Send messages in JSON mode and parse the answer into `schema`
+
+        An answer that doesn't validate is sent back once with the errors
+        before giving up.
+
+        Args:
+            messages (list): Messages whose prompt includes
+                schema.prompt_instructions()
+            schema (type): AgentBrief subclass to parse into
+            llm: Model to use (default: the agent's analysis model)
+
+        Returns:
+            AgentBrief: The parsed answer
+        """
+        llm = self._json_mode(llm or self.llm)
+        cacheable = self._matches_schema(schema)
+        response = self._invoke_message(messages, llm, cacheable)
+        try:
+            return schema.model_validate_json(response.content)
+        except ValidationError as e:
+            print(f"   ↩️ Answer did not match {schema.__name__} - asking for a fix")
+            response = self._invoke_message(self._repair_messages(messages, response, e), llm, cacheable)
+            return schema.model_validate_json(response.content)
+
+    async def _ainvoke_structured(self, messages: List[BaseMessage], schema: type, llm=None) -> AgentBrief:
+        """
+        Async version of _invoke_structured
+        """
+        llm = self._json_mode(llm or self.llm)
+        cacheable = self._matches_schema(schema)
+        response = await self._ainvoke_message(messages, llm, cacheable)
+        try:
+            return schema.model_validate_json(response.content)
+        except ValidationError as e:
+            print(f"   ↩️ Answer did not match {schema.__name__} - asking for a fix")
+            response = await self._ainvoke_message(self._repair_messages(messages, response, e), llm, cacheable)
+            return schema.model_validate_json(response.content)
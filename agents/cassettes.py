@@ -0,0 +1,255 @@
+"""
+LLM Cassettes - Record real agent LLM traffic and replay it offline
+In record mode every call that reaches the model is appended to a JSONL
+cassette: the agent, the request messages, the full response with its
+usage, and when each streamed fragment arrived. In replay mode the
+agents are answered from the cassette instead of the network, with the
+recorded timing (optionally scaled), so a slow production run can be
+profiled on a laptop.
+
+BaseAgent routes its model calls through the cassette, after the response
+cache, circuit breaker and rate limiter - only calls that actually went
+to the provider are recorded. Turn the response cache off
+(LLM_CACHE_ENABLED=false) while replaying to exercise every recorded call.
+
+Usage:
+    LLM_CASSETTE_MODE=record streamlit run app.py
+    LLM_CASSETTE_MODE=replay GROQ_API_KEY=offline LLM_CACHE_ENABLED=false streamlit run app.py
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Iterator, List, Optional
+
+from dotenv import load_dotenv
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+
+load_dotenv()
+
+MODES = ("record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised in replay mode for a request the cassette has no answer for
+    """
+
+    def __init__(self, agent: str, model: str):
+        super().__init__(
+            f"No recorded response for this {agent} request to {model} - "
+            "record the cassette again after changing prompts or models"
+        )
+
+
+def _model_name(llm) -> str:
+    return getattr(llm, "model_name", type(llm).__name__)
+
+
+def request_key(messages: List[BaseMessage], llm) -> str:
+    """
+    Identify a request by what decides its answer: the messages, the model,
+    its temperature and call options such as JSON mode. Connection settings
+    (base URL, timeouts) are left out so a cassette recorded against the
+    real API replays against any backend.
+    """
+    options = {
+        "model": _model_name(llm),
+        "temperature": getattr(llm, "temperature", None),
+        "bound": getattr(llm, "kwargs", {}),
+    }
+    payload = json.dumps(options, sort_keys=True, default=str) + "\x00" + dumps(messages)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _response_fields(response) -> dict:
+    # Streamed answers arrive as merged chunks - keep what an AIMessage needs
+    return {
+        "content": response.content,
+        "usage_metadata": response.usage_metadata,
+        "response_metadata": response.response_metadata,
+    }
+
+
+class Cassette:
+    """
+    One cassette file, either being recorded or being replayed
+
+    The same request may be recorded several times (regenerated answers);
+    replay hands the recordings out in order and keeps repeating the last.
+    """
+
+    def __init__(self, path: str, mode: str, time_scale: float = 1.0):
+        """
+        Args:
+            path (str): JSONL file
+            mode (str): "record" (append calls to the file) or "replay"
+                (answer calls from it)
+            time_scale (float): Replay delays are multiplied by this -
+                1 keeps the recorded timing, 0.5 replays twice as fast,
+                0 answers instantly
+        """
+        if mode not in MODES:
+            raise ValueError(f"Cassette mode must be one of {MODES}, got {mode!r}")
+
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+
+        self._lock = threading.Lock()
+        self._recordings = defaultdict(list)  # request key -> entries, in recording order
+        self._replayed = defaultdict(int)     # request key -> entries handed out
+
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._recordings[entry["key"]].append(entry)
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    # Recording
+
+    def _record(
+        self,
+        agent: str,
+        llm,
+        messages: List[BaseMessage],
+        response,
+        duration_s: float,
+        chunks: Optional[list] = None
+    ) -> None:
+        entry = {
+            "key": request_key(messages, llm),
+            "agent": agent,
+            "model": _model_name(llm),
+            "recorded_at": time.time(),
+            "messages": [{"role": m.type, "content": m.content} for m in messages],
+            "response": json.loads(json.dumps(_response_fields(response), default=str)),
+            "duration_s": round(duration_s, 4),
+            "ttft_s": chunks[0][0] if chunks else None,
+            "chunks": chunks,  # [seconds after the request, text] - streamed calls only
+        }
+        with self._lock:
+            # One line per call, flushed right away so a crashed run keeps its calls
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    # Replaying
+
+    def _next_entry(self, agent: str, llm, messages: List[BaseMessage]) -> dict:
+        key = request_key(messages, llm)
+        with self._lock:
+            entries = self._recordings.get(key)
+            if not entries:
+                raise CassetteMissError(agent, _model_name(llm))
+            index = min(self._replayed[key], len(entries) - 1)
+            self._replayed[key] += 1
+            return entries[index]
+
+    def _schedule(self, entry: dict) -> list:
+        """
+        Returns:
+            list: (delay after the request in seconds, text) per fragment,
+            scaled - a call recorded without streaming is one fragment
+            arriving at the end
+        """
+        chunks = entry.get("chunks") or [[entry["duration_s"], entry["response"]["content"]]]
+        return [(offset * self.time_scale, text) for offset, text in chunks]
+
+    # What BaseAgent calls instead of llm.invoke / llm.stream / llm.ainvoke
+
+    def invoke(self, agent: str, llm, messages: List[BaseMessage]) -> AIMessage:
+        if self.mode == "record":
+            started = time.perf_counter()
+            response = llm.invoke(messages)
+            self._record(agent, llm, messages, response, time.perf_counter() - started)
+            return response
+
+        entry = self._next_entry(agent, llm, messages)
+        time.sleep(entry["duration_s"] * self.time_scale)
+        return AIMessage(**entry["response"])
+
+    async def ainvoke(self, agent: str, llm, messages: List[BaseMessage]) -> AIMessage:
+        if self.mode == "record":
+            started = time.perf_counter()
+            response = await llm.ainvoke(messages)
+            self._record(agent, llm, messages, response, time.perf_counter() - started)
+            return response
+
+        entry = self._next_entry(agent, llm, messages)
+        await asyncio.sleep(entry["duration_s"] * self.time_scale)
+        return AIMessage(**entry["response"])
+
+    def stream(self, agent: str, llm, messages: List[BaseMessage]) -> Iterator[AIMessageChunk]:
+        if self.mode == "record":
+            started = time.perf_counter()
+            response = None
+            chunks = []
+            for chunk in llm.stream(messages):
+                response = chunk if response is None else response + chunk
+                if chunk.content:
+                    chunks.append([round(time.perf_counter() - started, 4), chunk.content])
+                yield chunk
+            if response is not None:
+                self._record(agent, llm, messages, response, time.perf_counter() - started, chunks)
+            return
+
+        entry = self._next_entry(agent, llm, messages)
+        started = time.perf_counter()
+
+        for delay, text in self._schedule(entry):
+            wait = delay - (time.perf_counter() - started)
+            if wait > 0:
+                time.sleep(wait)
+            yield AIMessageChunk(content=text)
+
+        wait = entry["duration_s"] * self.time_scale - (time.perf_counter() - started)
+        if wait > 0:
+            time.sleep(wait)
+        # Usage arrives with the last chunk, as it does from the provider
+        yield AIMessageChunk(
+            content="",
+            usage_metadata=entry["response"]["usage_metadata"],
+            response_metadata=entry["response"]["response_metadata"]
+        )
+
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Return the process-wide cassette, if recording or replaying is on
+
+    Configured from the environment:
+        LLM_CASSETTE_MODE        - "record" or "replay" (default: off)
+        LLM_CASSETTE_PATH        - JSONL file (default: .cache/llm_cassette.jsonl)
+        LLM_CASSETTE_TIME_SCALE  - replay delay multiplier (default: 1, 0 = no delays)
+
+    Returns:
+        Cassette or None when neither recording nor replaying
+    """
+    global _cassette
+
+    mode = os.getenv("LLM_CASSETTE_MODE", "").lower()
+    if not mode:
+        return None
+
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(
+                path=os.getenv("LLM_CASSETTE_PATH", ".cache/llm_cassette.jsonl"),
+                mode=mode,
+                time_scale=float(os.getenv("LLM_CASSETTE_TIME_SCALE", "1"))
+            )
+        return _cassette
@@ -0,0 +1,112 @@
+"""
+Instrumentation - Timing and token usage of agent LLM calls
+BaseAgent reports every call here; a workflow node collects the calls it
+made with track_llm_calls() and turns them into one metrics entry.
+
+Calls are collected in a context variable, so concurrent runs (threads or
+asyncio tasks) never see each other's calls. Blocks can be nested: a call
+is reported to every enclosing block, so a benchmark can collect all the
+calls of a run while each node still collects its own.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+
+@dataclass
+class LLMCallRecord:
+    """
+    What happened during one agent LLM call
+    """
+    started_at: float
+    ended_at: float
+    first_token_at: Optional[float] = None  # only known for streamed calls
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0  # prompt prefix the provider served from its cache
+    cache_hit: bool = False
+    queued_s: float = 0.0  # held back by the shared rate limiter
+    model: str = ""
+
+
+# Lists of the enclosing track_llm_calls() blocks, outermost first
+_current_calls: ContextVar[tuple] = ContextVar("current_llm_calls", default=())
+
+
+@contextmanager
+def track_llm_calls() -> Iterator[List[LLMCallRecord]]:
+    """
+    Collect the LLM calls made inside the `with` block
+
+    Yields:
+        list: LLMCallRecord entries, appended as calls finish
+    """
+    calls = []
+    token = _current_calls.set(_current_calls.get() + (calls,))
+    try:
+        yield calls
+    finally:
+        _current_calls.reset(token)
+
+
+def record_llm_call(record: LLMCallRecord) -> None:
+    """
+    Report a finished call to the enclosing track_llm_calls() blocks, if any
+    """
+    for calls in _current_calls.get():
+        calls.append(record)
+
+
+def usage_tokens(message) -> tuple:
+    """
+    Returns:
+        tuple: (prompt_tokens, completion_tokens) from a response's usage metadata
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+
+def cached_prompt_tokens(message) -> int:
+    """
+    Prompt tokens the provider read from its prompt cache (0 if it
+    doesn't report them)
+    """
+    usage = getattr(message, "usage_metadata", None) or {}
+    return (usage.get("input_token_details") or {}).get("cache_read") or 0
+
+
+def summarize_node(started_at: float, calls: List[LLMCallRecord]) -> dict:
+    """
+    Turn one node's LLM calls into its metrics entry
+
+    Args:
+        started_at (float): time.time() when the node started
+        calls (list): LLMCallRecord entries collected for the node
+
+    Returns:
+        dict: start/end timestamps, duration, time-to-first-token,
+        token counts, the share of prompt tokens served from the
+        provider's prompt cache, call counts and the models used
+    """
+    ended_at = time.time()
+    first_tokens = [call.first_token_at for call in calls if call.first_token_at]
+    prompt_tokens = sum(call.prompt_tokens for call in calls)
+    cached_tokens = sum(call.cached_prompt_tokens for call in calls)
+
+    return {
+        "started_at": started_at,
+        "ended_at": ended_at,
+        "duration_s": round(ended_at - started_at, 3),
+        "ttft_s": round(min(first_tokens) - started_at, 3) if first_tokens else None,
+        "llm_time_s": round(sum(call.ended_at - call.started_at for call in calls), 3),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": sum(call.completion_tokens for call in calls),
+        "cached_prompt_tokens": cached_tokens,
+        "prompt_cache_hit_rate": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else None,
+        "llm_calls": len(calls),
+        "cache_hits": sum(1 for call in calls if call.cache_hit),
+        "models": sorted({call.model for call in calls if call.model}),
+    }
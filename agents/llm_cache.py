@@ -0,0 +1,251 @@
+"""
+LLM Response Cache - Two-tier cache shared by all agents
+Tier 1: bounded in-process LRU (microseconds)
+Tier 2: SQLite file on disk with TTL and size-based eviction (survives restarts)
+
+BaseAgent looks responses up and stores them itself, around every LLM
+call (invoke, ainvoke and stream) - the cache is not plugged into the
+models through LangChain's cache= hook. Entries are keyed the way
+LangChain keys its llm cache: the serialized messages (system prompt and
+rendered human prompt) plus the model parameters (model name,
+temperature) and any options bound to the model, such as JSON mode.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+load_dotenv()
+
+
+class TwoTierLLMCache(BaseCache):
+    """
+    In-memory LRU in front of a persistent SQLite table.
+
+    A lookup checks memory first, then disk (promoting disk hits into
+    memory). Every new response is written to both tiers.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ".cache/llm_cache.sqlite",
+        max_memory_entries: int = 256,
+        max_disk_entries: int = 10000,
+        ttl_seconds: float = 7 * 24 * 3600
+    ):
+        """
+        Args:
+            db_path (str): SQLite file for the persistent tier
+            max_memory_entries (int): Size of the in-process LRU
+            max_disk_entries (int): Rows kept on disk before the least
+                recently used ones are evicted
+            ttl_seconds (float): Age after which an entry is treated as a miss
+        """
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory = OrderedDict()  # key -> (created_at, return_val)
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, return_val: RETURN_VAL_TYPE) -> None:
+        # Caller holds self._lock
+        self._memory[key] = (created_at, return_val)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """
+        Return the cached generations for this prompt, or None on a miss
+        """
+        key = self._make_key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, return_val = entry
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return return_val
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, created_at = row
+            if self._is_expired(created_at, now):
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._stats["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+            return_val = loads(value)
+            self._remember(key, created_at, return_val)
+            self._stats["disk_hits"] += 1
+            return return_val
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """
+        Store freshly generated output in both tiers
+        """
+        key = self._make_key(prompt, llm_string)
+        now = time.time()
+        value = dumps(return_val)
+
+        with self._lock:
+            self._remember(key, now, return_val)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            # Size-based eviction: drop expired rows, then the least recently used
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                """DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_disk_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self, **kwargs) -> None:
+        """
+        Empty both tiers and reset the counters
+        """
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters since the cache was created
+
+        Returns:
+            dict: memory_hits, disk_hits, misses, hit_rate and entry counts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = self._conn.execute(
+                "SELECT COUNT(*) FROM llm_cache"
+            ).fetchone()[0]
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+_skip_lookup: ContextVar[bool] = ContextVar("skip_llm_cache_lookup", default=False)
+
+
+@contextmanager
+def fresh_llm_responses() -> Iterator[None]:
+    """
+    Ignore cached answers for LLM calls made inside the `with` block
+
+    Used when the user asks for a new version of an answer - the same
+    prompt would otherwise just return the cached one. The fresh responses
+    are still stored, replacing the old entries.
+    """
+    token = _skip_lookup.set(True)
+    try:
+        yield
+    finally:
+        _skip_lookup.reset(token)
+
+
+def cache_lookup_skipped() -> bool:
+    """
+    True inside a fresh_llm_responses() block
+    """
+    return _skip_lookup.get()
+
+
+def get_llm_cache() -> Optional[TwoTierLLMCache]:
+    """
+    Return the process-wide cache shared by all agents
+
+    Configured from the environment:
+        LLM_CACHE_ENABLED      - "false" turns caching off (default: true)
+        LLM_CACHE_PATH         - SQLite file (default: .cache/llm_cache.sqlite)
+        LLM_CACHE_TTL_SECONDS  - entry lifetime (default: 7 days)
+        LLM_CACHE_MAX_MEMORY   - in-memory LRU size (default: 256)
+        LLM_CACHE_MAX_DISK     - rows kept on disk (default: 10000)
+
+    Returns:
+        TwoTierLLMCache or None when caching is disabled
+    """
+    global _llm_cache
+
+    if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = TwoTierLLMCache(
+                db_path=os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite"),
+                max_memory_entries=int(os.getenv("LLM_CACHE_MAX_MEMORY", "256")),
+                max_disk_entries=int(os.getenv("LLM_CACHE_MAX_DISK", "10000")),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+            )
+        return _llm_cache
@@ -0,0 +1,128 @@
+"""
+LLM Client Registry - One pooled Groq connection setup shared by all agents
+Agents ask get_llm() for a model instead of building their own ChatGroq,
+so the whole workflow reuses one keep-alive HTTP connection pool.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from dotenv import load_dotenv
+from langchain_groq import ChatGroq
+
+load_dotenv()
+
+DEFAULT_BASE_URL = "https://api.groq.com"
+
+_http_client = None
+_llms = {}
+_lock = threading.Lock()
+
+
+def get_base_url() -> str:
+    """
+    Groq API root (GROQ_API_BASE overrides it, e.g. for a proxy)
+    """
+    return os.getenv("GROQ_API_BASE", DEFAULT_BASE_URL).rstrip("/")
+
+
+def get_request_timeout() -> float:
+    return float(os.getenv("LLM_HTTP_TIMEOUT", "60"))
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Return the process-wide HTTP client behind every sync LLM call
+
+    Pool settings come from the environment:
+        LLM_HTTP_MAX_CONNECTIONS   - total open connections (default: 100)
+        LLM_HTTP_MAX_KEEPALIVE     - idle connections kept open (default: 20)
+        LLM_HTTP_KEEPALIVE_EXPIRY  - seconds an idle connection is kept (default: 120)
+        LLM_HTTP_TIMEOUT           - seconds to wait for a response (default: 60)
+    """
+    global _http_client
+
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+                    max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20")),
+                    keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "120"))
+                ),
+                timeout=httpx.Timeout(get_request_timeout(), connect=5.0)
+            )
+        return _http_client
+
+
+def get_llm(model_name: str, temperature: float) -> ChatGroq:
+    """
+    Return the shared ChatGroq for this model and temperature
+
+    Agents asking for the same settings get the same instance; all
+    instances send their sync requests through get_http_client(). The
+    async client is left to the Groq SDK because an httpx.AsyncClient
+    is tied to the event loop that first uses it.
+
+    Args:
+        model_name (str): Groq model id
+        temperature (float): Sampling temperature
+
+    Returns:
+        ChatGroq: Ready-to-use chat model
+    """
+    key = (model_name, temperature)
+
+    with _lock:
+        llm = _llms.get(key)
+
+    if llm is None:
+        http_client = get_http_client()
+        with _lock:
+            llm = _llms.get(key)
+            if llm is None:
+                llm = ChatGroq(
+                    api_key=os.getenv("GROQ_API_KEY"),
+                    model_name=model_name,
+                    temperature=temperature,
+                    base_url=get_base_url(),
+                    http_client=http_client,
+                    request_timeout=get_request_timeout(),
+                    # Retries are handled by BaseAgent (agents/resilience.py)
+                    max_retries=0
+                )
+                _llms[key] = llm
+
+    return llm
+
+
+def warm_up_connections(connections: int = 3) -> int:
+    """
+    Open pooled connections ahead of the first analysis
+
+    Sends cheap authenticated requests in parallel so the pool already
+    holds `connections` live TLS connections (one per agent by default)
+    when the first real LLM call goes out. Failures are ignored - the
+    real call will simply open its own connection.
+
+    Args:
+        connections (int): Number of connections to open
+
+    Returns:
+        int: How many warm-up requests succeeded
+    """
+    client = get_http_client()
+    url = f"{get_base_url()}/openai/v1/models"
+    headers = {"Authorization": f"Bearer {os.getenv('GROQ_API_KEY', '')}"}
+
+    def ping(_):
+        try:
+            client.get(url, headers=headers, timeout=5.0)
+            return True
+        except httpx.HTTPError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        return sum(pool.map(ping, range(connections)))
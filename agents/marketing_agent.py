@@ -4,15 +4,18 @@ This agent creates marketing strategy based on business strategy AND technical d
 Designed for maximum collaboration with other agents
 """
 
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
-import os
+from typing import Iterator
 from dotenv import load_dotenv
 
+from agents.base_agent import BaseAgent
+from agents.llm_client import get_llm
+from agents.model_routing import model_for
+from agents.schemas import MarketingBrief
+
 load_dotenv()
 
-class MarketingAgent:
+class MarketingAgent(BaseAgent):
     """
     The Marketing Agent acts like a CMO with expertise in brand strategy,
     customer acquisition, and growth marketing.
@@ -27,15 +30,9 @@ class MarketingAgent:
         """
         Initialize the Marketing Agent
         """
-        
-        self.api_key = os.getenv("GROQ_API_KEY")
-        self.model_name = os.getenv("MODEL_NAME", "llama-3.3-70b-versatile")
-        
-        self.llm = ChatGroq(
-            api_key=self.api_key,
-            model_name=self.model_name,
-            temperature=0.8  
-        )
+        # Large model for the analysis, small ones for quick feedback and drafts
+        self._load_models("marketing", temperature=0.8)
+        self.campaign_llm = get_llm(model_for("marketing", "campaign"), temperature=0.8)
         
         # Defines CMO personality -  collaboration
         self.system_prompt = """You are an experienced CMO and marketing strategist with 15+ years in brand building, customer acquisition, and growth marketing.
@@ -78,39 +75,15 @@ When creating marketing strategy, provide:
 Always reference the strategy and technical context in your recommendations!
 """
 
-    def create_marketing_strategy(
-        self, 
-        startup_idea: str,
-        strategy_context: str = None,
-        technical_context: str = None
-    ) -> str:
-        """
-        Create comprehensive marketing strategy
-        
-        Args:
-            startup_idea (str): The business idea
-            strategy_context (str): Output from Strategy Agent
-            technical_context (str): Output from Technical Agent
-            
-        Returns:
-            str: Complete marketing strategy and go-to-market plan
-        """
-        
-        # Buildng collaborative prompt
-        if strategy_context and technical_context:
-            
-            prompt = f"""You are the CMO. Read the analyses from your CEO (Strategy) and CTO (Technical) below, then create a marketing strategy that aligns with both.
+    # "## " sections the fully collaborative prompt asks for (checked before escalating)
+    ANALYSIS_SECTIONS = 9
 
-**CEO'S BUSINESS STRATEGY:**
-{strategy_context}
+    # Fixed instructions of each kind of call - they go before the idea and
+    # context, so every call shares a cacheable prompt prefix (see
+    # BaseAgent._build_messages)
+    COLLABORATIVE_INSTRUCTIONS = """You are the CMO. Read the analyses from your CEO (Strategy) and CTO (Technical) at the end of this message, then create a marketing strategy that aligns with both.
 
-**CTO'S TECHNICAL PLAN:**
-{technical_context}
-
-**ORIGINAL STARTUP IDEA:**
-{startup_idea}
-
-Now, create a comprehensive marketing strategy that:
+Create a comprehensive marketing strategy that:
 - Targets the customers identified by the CEO
 - Works within the budget and timeline from business strategy
 - Aligns with the technical platform and launch plan from CTO
@@ -152,35 +125,206 @@ Structure your response as:
 (Detailed plan for launch week/month)
 
 **IMPORTANT:** Reference specific points from both the Strategy and Technical analyses throughout your recommendations. Show how marketing connects business goals with technical capabilities!"""
+
+    STRATEGY_ONLY_INSTRUCTIONS = """Based on the business strategy below, create a comprehensive marketing strategy that aligns with its business goals."""
+
+    STANDALONE_INSTRUCTIONS = """Create a comprehensive marketing strategy for the startup idea below.
+
+Include brand positioning, target audience, channels, content strategy, and go-to-market plan."""
+
+    STRUCTURED_INSTRUCTIONS = (
+        "You are the CMO. Read the briefs from your CEO (Strategy) and CTO (Technical) below, "
+        "given as JSON, then create a marketing strategy that aligns with both. Target the "
+        "CEO's segments, work within the pricing and next steps, and time the go-to-market "
+        "with the CTO's roadmap.\n\n"
+        + MarketingBrief.prompt_instructions()
+    )
+
+    LAUNCH_CAMPAIGN_INSTRUCTIONS = """Create a detailed launch campaign plan for the startup idea below.
+
+Include:
+1. Pre-launch activities (4-6 weeks before)
+2. Launch week strategy
+3. Post-launch momentum tactics
+4. Budget allocation
+5. Key messaging"""
+
+    def _expected_sections(self, strategy_context: str = None, technical_context: str = None):
+        # Only the fully collaborative prompt prescribes "## " sections
+        return self.ANALYSIS_SECTIONS if strategy_context and technical_context else None
+
+    def _build_marketing_messages(
+        self,
+        startup_idea: str,
+        strategy_context: str = None,
+        technical_context: str = None
+    ) -> list:
+        """
+        Build the conversation messages for a marketing strategy
+        Picks the most collaborative prompt the available context allows
+        """
         
-        elif strategy_context:
-            # STRATEGY-ONLY COLLABORATION
-            prompt = f"""Based on the business strategy below, create a marketing strategy:
+        # Buildng collaborative prompt
+        if strategy_context and technical_context:
+            return self._build_messages(
+                self.COLLABORATIVE_INSTRUCTIONS,
+                f"""**CEO'S BUSINESS STRATEGY:**
+{strategy_context}
+
+**CTO'S TECHNICAL PLAN:**
+{technical_context}
 
-**BUSINESS STRATEGY:**
+**ORIGINAL STARTUP IDEA:**
+{startup_idea}"""
+            )
+        
+        if strategy_context:
+            # STRATEGY-ONLY COLLABORATION
+            return self._build_messages(
+                self.STRATEGY_ONLY_INSTRUCTIONS,
+                f"""**BUSINESS STRATEGY:**
 {strategy_context}
 
 **STARTUP IDEA:**
-{startup_idea}
+{startup_idea}"""
+            )
+        
+        return self._build_messages(self.STANDALONE_INSTRUCTIONS, f"**STARTUP IDEA:**\n{startup_idea}")
 
-Create comprehensive marketing strategy that aligns with the business goals above."""
+    def create_marketing_strategy(
+        self, 
+        startup_idea: str,
+        strategy_context: str = None,
+        technical_context: str = None
+    ) -> str:
+        """
+        Create comprehensive marketing strategy
         
-        else:
-            prompt = f"""Create a comprehensive marketing strategy for:
+        Args:
+            startup_idea (str): The business idea
+            strategy_context (str): Output from Strategy Agent
+            technical_context (str): Output from Technical Agent
+            
+        Returns:
+            str: Complete marketing strategy and go-to-market plan
+        """
+        
+        messages = self._build_marketing_messages(
+            startup_idea, strategy_context, technical_context
+        )
+        
+        return self._invoke(
+            messages,
+            expected_sections=self._expected_sections(strategy_context, technical_context)
+        )
 
-**STARTUP IDEA:**
-{startup_idea}
+    def create_marketing_strategy_stream(
+        self,
+        startup_idea: str,
+        strategy_context: str = None,
+        technical_context: str = None
+    ) -> Iterator[str]:
+        """
+        Streaming version of create_marketing_strategy
+        
+        Args:
+            startup_idea (str): The business idea
+            strategy_context (str): Output from Strategy Agent
+            technical_context (str): Output from Technical Agent
+            
+        Yields:
+            str: Fragments of the marketing strategy as they are generated
+        """
+        
+        messages = self._build_marketing_messages(
+            startup_idea, strategy_context, technical_context
+        )
+        yield from self._stream(
+            messages,
+            expected_sections=self._expected_sections(strategy_context, technical_context)
+        )
 
-Include brand positioning, target audience, channels, content strategy, and go-to-market plan."""
+    async def acreate_marketing_strategy(
+        self,
+        startup_idea: str,
+        strategy_context: str = None,
+        technical_context: str = None
+    ) -> str:
+        """
+        Async version of create_marketing_strategy
+        
+        Args:
+            startup_idea (str): The business idea
+            strategy_context (str): Output from Strategy Agent
+            technical_context (str): Output from Technical Agent
+            
+        Returns:
+            str: Complete marketing strategy and go-to-market plan
+        """
+        
+        messages = self._build_marketing_messages(
+            startup_idea, strategy_context, technical_context
+        )
+        return await self._ainvoke(
+            messages,
+            expected_sections=self._expected_sections(strategy_context, technical_context)
+        )
+
+    def _build_structured_messages(
+        self,
+        startup_idea: str,
+        strategy_brief: str,
+        technical_brief: str
+    ) -> list:
+        """
+        Build the messages for a marketing strategy answered as JSON, based
+        on the Strategy and Technical Agents' structured briefs
+        """
+        return self._build_messages(
+            self.STRUCTURED_INSTRUCTIONS,
+            f"""**CEO'S BUSINESS STRATEGY:**
+{strategy_brief}
+
+**CTO'S TECHNICAL PLAN:**
+{technical_brief}
+
+**ORIGINAL STARTUP IDEA:**
+{startup_idea}"""
+        )
+
+    def create_marketing_strategy_structured(
+        self,
+        startup_idea: str,
+        strategy_brief: str,
+        technical_brief: str
+    ) -> MarketingBrief:
+        """
+        Structured version of create_marketing_strategy
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
-        ]
+        Args:
+            startup_idea (str): The business idea
+            strategy_brief (str): StrategyBrief.to_context() from the Strategy Agent
+            technical_brief (str): TechnicalBrief.to_context() from the Technical Agent
+            
+        Returns:
+            MarketingBrief: The marketing strategy as typed fields
+        """
         
-        response = self.llm.invoke(messages)
+        messages = self._build_structured_messages(startup_idea, strategy_brief, technical_brief)
+        return self._invoke_structured(messages, MarketingBrief)
+
+    async def acreate_marketing_strategy_structured(
+        self,
+        startup_idea: str,
+        strategy_brief: str,
+        technical_brief: str
+    ) -> MarketingBrief:
+        """
+        Async version of create_marketing_strategy_structured
+        """
         
-        return response.content
+        messages = self._build_structured_messages(startup_idea, strategy_brief, technical_brief)
+        return await self._ainvoke_structured(messages, MarketingBrief)
 
     def create_launch_campaign(
         self,
@@ -189,26 +333,19 @@ Include brand positioning, target audience, channels, content strategy, and go-t
     ) -> str:
         """
         Creates focused launch campaign plan
+        A full deliverable even when the quick scan asks for it, so it runs
+        on the "campaign" model (the analysis model by default)
         """
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""Create a detailed launch campaign plan for:
-
+        messages = self._build_messages(
+            self.LAUNCH_CAMPAIGN_INSTRUCTIONS,
+            f"""**STARTUP IDEA:**
 {startup_idea}
 
-Launch date: {launch_date}
-
-Include:
-1. Pre-launch activities (4-6 weeks before)
-2. Launch week strategy
-3. Post-launch momentum tactics
-4. Budget allocation
-5. Key messaging""")
-        ]
+**Launch date:** {launch_date}"""
+        )
         
-        response = self.llm.invoke(messages)
-        return response.content
+        return self._invoke(messages, llm=self.campaign_llm)
 
 
 # Test function
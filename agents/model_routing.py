@@ -0,0 +1,115 @@
+"""
+Model Routing - Which Groq model each agent uses for which kind of call
+A small, fast model handles quick feedback and drafts; the large model
+writes the deep analyses. An optional escalation policy tries the small
+model first even for the deep analyses and only falls back to the large
+one when the answer fails a cheap local completeness check.
+"""
+
+import os
+import re
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Kinds of calls an agent makes
+#   analysis    - the full collaborative analyses in the workflow
+#   speculative - the standalone technical plan of speculative mode; it
+#                 becomes the body of the final plan, so by default it
+#                 uses the analysis model (None below)
+#   campaign    - the Marketing Agent's launch campaign plan, a full
+#                 deliverable: the analysis model by default as well
+#   draft       - the first try when escalation is on
+#   quick       - quick scan / short-form answers
+DEFAULT_MODELS = {
+    "analysis": "llama-3.3-70b-versatile",
+    "speculative": None,
+    "campaign": None,
+    "draft": "llama-3.1-8b-instant",
+    "quick": "llama-3.1-8b-instant",
+}
+
+
+def model_for(agent: str, task: str) -> str:
+    """
+    Resolve the model for one agent and kind of call
+
+    The first of these that is set wins:
+        LLM_MODEL_<AGENT>_<TASK>  - e.g. LLM_MODEL_MARKETING_QUICK
+        LLM_MODEL_<TASK>          - e.g. LLM_MODEL_QUICK (for "analysis",
+                                    MODEL_NAME is accepted as well)
+        DEFAULT_MODELS[task] (the agent's analysis model if None)
+
+    Args:
+        agent (str): "strategy", "technical" or "marketing"
+        task (str): "analysis", "speculative", "campaign", "draft" or "quick"
+
+    Returns:
+        str: Groq model id
+    """
+    if task not in DEFAULT_MODELS:
+        raise ValueError(f"Unknown task {task!r}, expected one of {', '.join(DEFAULT_MODELS)}")
+
+    candidates = [f"LLM_MODEL_{agent.upper()}_{task.upper()}", f"LLM_MODEL_{task.upper()}"]
+    if task == "analysis":
+        candidates.append("MODEL_NAME")
+
+    for name in candidates:
+        if os.getenv(name):
+            return os.getenv(name)
+    return DEFAULT_MODELS[task] or model_for(agent, "analysis")
+
+
+# "## 3. Target Market" - the sections the analysis prompts ask for
+SECTION_HEADING = re.compile(r"^##\s+\S", re.MULTILINE)
+
+
+class EscalationPolicy:
+    """
+    Decides whether a small-model answer is good enough to keep
+
+    Purely local checks - no extra LLM call:
+    - the model stopped on its own (not cut off by the token limit)
+    - the answer has at least the number of "## " sections the prompt asked for
+    - the answer is not suspiciously short
+    """
+
+    def __init__(self, min_chars: int = 1500):
+        """
+        Args:
+            min_chars (int): Shortest answer accepted as a full analysis
+        """
+        self.min_chars = min_chars
+
+    def is_complete(self, message, expected_sections: int) -> bool:
+        """
+        Args:
+            message (AIMessage): The small model's answer
+            expected_sections (int): "## " sections the prompt asked for
+
+        Returns:
+            bool: True to keep the answer, False to escalate
+        """
+        metadata = getattr(message, "response_metadata", None) or {}
+        if metadata.get("finish_reason") == "length":
+            return False
+
+        text = message.content
+        if len(text) < self.min_chars:
+            return False
+        return len(SECTION_HEADING.findall(text)) >= expected_sections
+
+
+def get_escalation_policy() -> Optional[EscalationPolicy]:
+    """
+    Return the escalation policy, or None when escalation is off
+
+    Configured from the environment:
+        LLM_ESCALATION            - "true" to try the draft model first (default: off)
+        LLM_ESCALATION_MIN_CHARS  - shortest acceptable analysis (default: 1500)
+    """
+    if os.getenv("LLM_ESCALATION", "false").lower() not in ("1", "true", "yes"):
+        return None
+    return EscalationPolicy(min_chars=int(os.getenv("LLM_ESCALATION_MIN_CHARS", "1500")))
@@ -0,0 +1,176 @@
+"""
+Rate Limiter - Process-wide requests/minute and tokens/minute budget
+Keeps all agents together just under the provider's limits instead of
+letting individual calls fail with 429s
+
+Both budgets are token buckets that may go into debt. A caller reserves
+its request and estimated tokens the moment it arrives and then sleeps
+until the buckets have refilled past that debt, so callers are served
+strictly in arrival order and nobody is rejected.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Rough characters-per-token ratio used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+
+class TokenBucketRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets shared by all callers.
+    Works from threads (acquire) and from asyncio code (aacquire).
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        headroom: float = 0.9
+    ):
+        """
+        Args:
+            requests_per_minute (float): Provider RPM limit, None for no limit
+            tokens_per_minute (float): Provider TPM limit, None for no limit
+            headroom (float): Fraction of each limit to actually use
+        """
+        self.request_capacity = requests_per_minute * headroom if requests_per_minute else None
+        self.token_capacity = tokens_per_minute * headroom if tokens_per_minute else None
+
+        self._request_level = self.request_capacity or 0.0
+        self._token_level = self.token_capacity or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        # Caller holds self._lock
+        elapsed = now - self._updated
+        self._updated = now
+
+        if self.request_capacity:
+            self._request_level = min(
+                self.request_capacity,
+                self._request_level + elapsed * self.request_capacity / 60.0
+            )
+        if self.token_capacity:
+            self._token_level = min(
+                self.token_capacity,
+                self._token_level + elapsed * self.token_capacity / 60.0
+            )
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Take one request and `tokens` from the buckets
+
+        Returns:
+            float: Seconds the caller has to wait before sending
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = 0.0
+
+            if self.request_capacity:
+                self._request_level -= 1
+                if self._request_level < 0:
+                    wait = max(wait, -self._request_level * 60.0 / self.request_capacity)
+
+            if self.token_capacity:
+                self._token_level -= tokens
+                if self._token_level < 0:
+                    wait = max(wait, -self._token_level * 60.0 / self.token_capacity)
+
+            return wait
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Block the calling thread until a call of `tokens` fits the budget
+
+        Returns:
+            float: Seconds the call was held back
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int) -> float:
+        """
+        Async version of acquire - waits without blocking the event loop
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """
+        Correct the token bucket once the response reports real usage
+
+        Args:
+            estimated_tokens (int): What was reserved in acquire()
+            actual_tokens (int): Total tokens from the response, None if unknown
+        """
+        if not self.token_capacity or actual_tokens is None:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._token_level = min(
+                self.token_capacity,
+                self._token_level + estimated_tokens - actual_tokens
+            )
+
+
+def estimate_call_tokens(messages: list, expected_completion_tokens: int) -> int:
+    """
+    Estimate the total tokens a call will use before sending it
+
+    Args:
+        messages (list): Messages about to be sent
+        expected_completion_tokens (int): Typical answer length
+
+    Returns:
+        int: Prompt estimate plus expected completion
+    """
+    prompt_chars = sum(len(str(message.content)) for message in messages)
+    return prompt_chars // CHARS_PER_TOKEN + expected_completion_tokens
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[TokenBucketRateLimiter]:
+    """
+    Return the process-wide limiter shared by all agents
+
+    Configured from the environment:
+        GROQ_RPM_LIMIT            - requests per minute allowed by the provider
+        GROQ_TPM_LIMIT            - tokens per minute allowed by the provider
+        LLM_RATE_LIMIT_HEADROOM   - fraction of the limits to use (default: 0.9)
+
+    Returns:
+        TokenBucketRateLimiter or None when neither limit is set
+    """
+    global _rate_limiter
+
+    rpm = os.getenv("GROQ_RPM_LIMIT")
+    tpm = os.getenv("GROQ_TPM_LIMIT")
+    if not rpm and not tpm:
+        return None
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucketRateLimiter(
+                requests_per_minute=float(rpm) if rpm else None,
+                tokens_per_minute=float(tpm) if tpm else None,
+                headroom=float(os.getenv("LLM_RATE_LIMIT_HEADROOM", "0.9"))
+            )
+        return _rate_limiter
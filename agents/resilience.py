@@ -0,0 +1,216 @@
+"""
+Resilience - Retry and circuit breaker for agent LLM calls
+A transient error in one agent is retried in place instead of throwing
+away the analyses the earlier agents already paid for
+
+- Errors are classified as retryable (timeouts, connection errors, 408,
+  409, 429, 5xx) or fatal (bad request, auth, ...)
+- Retries back off exponentially with full jitter and honor Retry-After
+- A circuit breaker fails fast once the backend keeps failing
+"""
+
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+import groq
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised instead of calling the LLM while the circuit breaker is open
+    """
+
+    def __init__(self, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(
+            f"LLM backend is failing repeatedly; not sending requests for another {retry_in:.0f}s"
+        )
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    True when trying the same call again may succeed
+    """
+    if isinstance(error, groq.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    if isinstance(error, (groq.APIConnectionError, httpx.TransportError)):
+        return True
+    return False
+
+
+def backend_answered(error: Exception) -> bool:
+    """
+    True when the error is the backend's own answer (an HTTP status),
+    rather than a failure to reach it or a bug on this side
+    """
+    return isinstance(error, groq.APIStatusError)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Read the server's Retry-After hint from an API error, if it sent one
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000.0
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time()) if retry_at else None
+
+
+class RetryPolicy:
+    """
+    How often and how long to wait between attempts of one LLM call
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        Args:
+            max_attempts (int): Total attempts including the first one
+            base_delay (float): Backoff ceiling for the first retry, doubled each time
+            max_delay (float): Upper bound for any single wait
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """
+        Seconds to wait after failed attempt number `attempt` (1-based)
+        """
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        # Full jitter: spreads retries of many concurrent callers apart
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive retryable failures and
+    rejects calls for `reset_timeout` seconds. After that one trial call
+    is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def before_call(self) -> None:
+        """
+        Raise CircuitOpenError if calls are currently not allowed
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if remaining > 0 or self._trial_in_flight:
+                raise CircuitOpenError(max(remaining, 0.0))
+
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        Let the next caller make the trial call - the current one ended
+        (cancelled, interrupted, abandoned) without showing whether the
+        backend has recovered
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+_retry_policy = None
+_circuit_breaker = None
+_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """
+    Return the retry policy used by all agents
+
+    Configured from the environment:
+        LLM_RETRY_MAX_ATTEMPTS  - attempts per call including the first (default: 4)
+        LLM_RETRY_BASE_DELAY    - first backoff ceiling in seconds (default: 1)
+        LLM_RETRY_MAX_DELAY     - longest single wait in seconds (default: 30)
+    """
+    global _retry_policy
+
+    with _lock:
+        if _retry_policy is None:
+            _retry_policy = RetryPolicy(
+                max_attempts=int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "4")),
+                base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "1")),
+                max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))
+            )
+        return _retry_policy
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """
+    Return the circuit breaker shared by all agents
+
+    Configured from the environment:
+        LLM_CIRCUIT_FAILURE_THRESHOLD  - consecutive failures before opening (default: 5)
+        LLM_CIRCUIT_RESET_SECONDS      - how long the circuit stays open (default: 30)
+    """
+    global _circuit_breaker
+
+    with _lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker(
+                failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")),
+                reset_timeout=float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30"))
+            )
+        return _circuit_breaker
@@ -0,0 +1,247 @@
+"""
+Schemas - Typed hand-off between the agents
+In structured mode each agent answers with JSON matching one of these
+models instead of free-form markdown. Downstream agents read the compact
+JSON, and the markdown shown to people is rendered from the same data.
+"""
+
+import json
+from abc import abstractmethod
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class CustomerSegment(BaseModel):
+    name: str
+    description: str = Field(description="Who they are and what they need, one or two sentences")
+
+
+class PricePoint(BaseModel):
+    tier: str
+    price: str = Field(description='e.g. "$9.99/month" or "free"')
+    includes: str = ""
+
+
+class Risk(BaseModel):
+    risk: str
+    mitigation: str
+
+
+class Phase(BaseModel):
+    name: str
+    timeline: str = Field(description='e.g. "Months 1-3"')
+    deliverables: List[str]
+
+
+class CostItem(BaseModel):
+    item: str
+    estimate: str = Field(description='e.g. "$2,000/month" or "$40k one-off"')
+
+
+class Channel(BaseModel):
+    name: str
+    tactics: str
+    budget_share: str = Field(default="", description='e.g. "30%"')
+
+
+def _bullets(items: List[str]) -> str:
+    return "\n".join(f"- {item}" for item in items)
+
+
+class AgentBrief(BaseModel):
+    """
+    Common parent of the agents' structured answers
+    """
+
+    def to_context(self) -> str:
+        """
+        Compact JSON handed to downstream agents
+        """
+        return json.dumps(self.model_dump(exclude_defaults=True), separators=(",", ":"))
+
+    @classmethod
+    def prompt_instructions(cls) -> str:
+        """
+        The part of a prompt asking for this schema
+        """
+        schema = json.dumps(cls.model_json_schema(), separators=(",", ":"))
+        return (
+            "Respond with a single JSON object (no markdown, no commentary) that "
+            f"matches this JSON schema:\n{schema}\n\n"
+            "Keep every string short and specific - figures, names and decisions, not prose."
+        )
+
+    @abstractmethod
+    def to_markdown(self) -> str:
+        """
+        The answer as the markdown report section people read
+        """
+
+
+class StrategyBrief(AgentBrief):
+    """
+    The Strategy Agent's analysis, section by section
+    """
+    executive_summary: str = Field(description="The opportunity and overall verdict, 2-3 sentences")
+    value_proposition: str
+    business_model: str
+    target_segments: List[CustomerSegment]
+    competitors: List[str]
+    differentiation: str
+    pricing: List[PricePoint]
+    revenue_streams: List[str]
+    key_success_factors: List[str]
+    risks: List[Risk]
+    next_steps: List[str]
+
+    def to_markdown(self) -> str:
+        segments = _bullets([f"**{s.name}**: {s.description}" for s in self.target_segments])
+        pricing = _bullets([
+            f"**{p.tier}** ({p.price})" + (f": {p.includes}" if p.includes else "")
+            for p in self.pricing
+        ])
+        risks = _bullets([f"**{r.risk}** - {r.mitigation}" for r in self.risks])
+        return f"""## 1. Executive Summary
+{self.executive_summary}
+
+## 2. Business Model & Value Proposition
+{self.value_proposition}
+
+{self.business_model}
+
+## 3. Target Market & Customer Segments
+{segments}
+
+## 4. Competitive Analysis
+{_bullets(self.competitors)}
+
+{self.differentiation}
+
+## 5. Revenue Model & Pricing Strategy
+{_bullets(self.revenue_streams)}
+
+{pricing}
+
+## 6. Key Success Factors
+{_bullets(self.key_success_factors)}
+
+## 7. Potential Risks & Mitigation
+{risks}
+
+## 8. Strategic Recommendations & Next Steps
+{_bullets(self.next_steps)}"""
+
+
+class TechStack(BaseModel):
+    frontend: str
+    backend: str
+    database: str
+    infrastructure: str
+    ai_ml: Optional[str] = None
+
+
+class TechnicalBrief(AgentBrief):
+    """
+    The Technical Agent's plan, section by section
+    """
+    overview: str = Field(description="How the technical approach supports the business goals")
+    stack: TechStack
+    architecture: str
+    roadmap: List[Phase]
+    team: List[str]
+    risks: List[Risk]
+    costs: List[CostItem]
+    scalability: str
+
+    def to_markdown(self) -> str:
+        stack = [
+            f"- **Frontend**: {self.stack.frontend}",
+            f"- **Backend**: {self.stack.backend}",
+            f"- **Database**: {self.stack.database}",
+            f"- **Infrastructure**: {self.stack.infrastructure}",
+        ]
+        if self.stack.ai_ml:
+            stack.append(f"- **AI/ML**: {self.stack.ai_ml}")
+        roadmap = "\n\n".join(
+            f"**{phase.name}** ({phase.timeline})\n{_bullets(phase.deliverables)}"
+            for phase in self.roadmap
+        )
+        risks = _bullets([f"**{r.risk}** - {r.mitigation}" for r in self.risks])
+        costs = _bullets([f"**{c.item}**: {c.estimate}" for c in self.costs])
+        return f"""## 1. Technical Strategy Overview
+{self.overview}
+
+## 2. Recommended Technology Stack
+{chr(10).join(stack)}
+
+## 3. System Architecture
+{self.architecture}
+
+## 4. Development Roadmap
+{roadmap}
+
+## 5. Team & Resource Requirements
+{_bullets(self.team)}
+
+## 6. Technical Risks & Mitigation
+{risks}
+
+## 7. Cost Estimates
+{costs}
+
+## 8. Scalability & Performance Strategy
+{self.scalability}"""
+
+
+class MarketingBrief(AgentBrief):
+    """
+    The Marketing Agent's strategy, section by section
+    """
+    positioning: str
+    audiences: List[CustomerSegment] = Field(description="Segments and how to acquire each")
+    channels: List[Channel]
+    content: List[str]
+    timeline: List[Phase]
+    budget: List[CostItem]
+    messaging: List[str] = Field(description="Taglines and value propositions")
+    kpis: List[str]
+    launch_plan: List[str]
+
+    def to_markdown(self) -> str:
+        audiences = _bullets([f"**{a.name}**: {a.description}" for a in self.audiences])
+        channels = _bullets([
+            f"**{c.name}**" + (f" ({c.budget_share})" if c.budget_share else "") + f": {c.tactics}"
+            for c in self.channels
+        ])
+        timeline = "\n\n".join(
+            f"**{phase.name}** ({phase.timeline})\n{_bullets(phase.deliverables)}"
+            for phase in self.timeline
+        )
+        budget = _bullets([f"**{b.item}**: {b.estimate}" for b in self.budget])
+        return f"""## 1. Brand Positioning & Messaging
+{self.positioning}
+
+## 2. Target Audience Strategy
+{audiences}
+
+## 3. Marketing Channel Strategy
+{channels}
+
+## 4. Content & Creative Strategy
+{_bullets(self.content)}
+
+## 5. Go-to-Market Timeline
+{timeline}
+
+## 6. Budget Allocation
+{budget}
+
+## 7. Key Messaging & Copy
+{_bullets(self.messaging)}
+
+## 8. Success Metrics & KPIs
+{_bullets(self.kpis)}
+
+## 9. Launch Campaign Plan
+{_bullets(self.launch_plan)}"""
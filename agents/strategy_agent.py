@@ -3,16 +3,17 @@ Strategy Agent - Acts as a CEO/Business Strategist
 This agent analyzes startup ideas and provides strategic business advice
 """
 
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
-import os
+from typing import Iterator
 from dotenv import load_dotenv
 
+from agents.base_agent import BaseAgent
+from agents.schemas import StrategyBrief
+
 
 load_dotenv()
 
-class StrategyAgent:
+class StrategyAgent(BaseAgent):
     """
     The Strategy Agent acts like a CEO with years of business experience.
     It analyzes startup ideas and provides comprehensive business strategy.
@@ -21,21 +22,11 @@ class StrategyAgent:
     def __init__(self):
         """
         Initialize the Strategy Agent with:
-        - API key from .env file
-        - Groq LLM model
+        - Groq LLM models (shared client, routing from agents/model_routing.py)
         - System prompt (agent's personality)
         """
-        
-    
-        self.api_key = os.getenv("GROQ_API_KEY")
-        self.model_name = os.getenv("MODEL_NAME", "llama-3.1-70b-versatile")
-        
-        
-        self.llm = ChatGroq(
-            api_key=self.api_key,
-            model_name=self.model_name,
-            temperature=0.7  
-        )
+        # Large model for the analysis, small ones for quick feedback and drafts
+        self._load_models("strategy", temperature=0.7)
         
         
         self.system_prompt = """You are an experienced CEO and business strategist with 20+ years of experience in startup advisory. 
@@ -57,6 +48,49 @@ When analyzing a startup idea, you provide:
 
 Be thorough, analytical, and provide actionable insights. Use clear structure and bullet points for readability."""
 
+    # "## " sections the analysis prompt asks for (checked before escalating)
+    ANALYSIS_SECTIONS = 8
+
+    # Fixed instructions of each kind of call - they go before the idea, so
+    # every call shares a cacheable prompt prefix (see BaseAgent._build_messages)
+    ANALYSIS_INSTRUCTIONS = """Analyze the startup idea below comprehensively.
+
+Provide a detailed strategic analysis. Structure your response as:
+
+## 1. Executive Summary
+(The opportunity and your overall verdict in a few sentences)
+
+## 2. Business Model & Value Proposition
+
+## 3. Target Market & Customer Segments
+
+## 4. Competitive Analysis
+
+## 5. Revenue Model & Pricing Strategy
+
+## 6. Key Success Factors
+
+## 7. Potential Risks & Mitigation
+
+## 8. Strategic Recommendations & Next Steps
+
+Be specific and actionable in your recommendations."""
+
+    STRUCTURED_INSTRUCTIONS = (
+        "Analyze the startup idea below comprehensively.\n\n"
+        + StrategyBrief.prompt_instructions()
+    )
+
+    QUICK_FEEDBACK_INSTRUCTIONS = """Provide quick strategic feedback on the idea below in 3-4 sentences.
+
+Focus on: viability, key opportunity, and one major risk."""
+
+    def _build_analysis_messages(self, startup_idea: str) -> list:
+        """
+        Build the conversation messages for a full strategic analysis
+        """
+        return self._build_messages(self.ANALYSIS_INSTRUCTIONS, f"**Startup Idea:** {startup_idea}")
+
     def analyze_startup_idea(self, startup_idea: str) -> str:
         """
         Main method: Analyzes a startup idea
@@ -68,32 +102,69 @@ Be thorough, analytical, and provide actionable insights. Use clear structure an
             str: Comprehensive strategic analysis
         """
         
-        # Creatng the conversation messages
-        messages = [
-            SystemMessage(content=self.system_prompt),
+        messages = self._build_analysis_messages(startup_idea)
+        
+        # Sends messages to the LLM and get response
+        # This is where the AI "thinks" and generates the analysis
+        return self._invoke(messages, expected_sections=self.ANALYSIS_SECTIONS)
+
+    def analyze_startup_idea_stream(self, startup_idea: str) -> Iterator[str]:
+        """
+        Streaming version of analyze_startup_idea
+        Yields the analysis as it is generated so the UI can show it immediately
+        
+        Args:
+            startup_idea (str): The business idea to analyze
             
-            HumanMessage(content=f"""Analyze this startup idea comprehensively:
+        Yields:
+            str: Fragments of the strategic analysis
+        """
+        
+        messages = self._build_analysis_messages(startup_idea)
+        yield from self._stream(messages, expected_sections=self.ANALYSIS_SECTIONS)
 
-**Startup Idea:** {startup_idea}
+    async def aanalyze_startup_idea(self, startup_idea: str) -> str:
+        """
+        Async version of analyze_startup_idea
+        Lets one event loop run many analyses at the same time
+        
+        Args:
+            startup_idea (str): The business idea to analyze
+            
+        Returns:
+            str: Comprehensive strategic analysis
+        """
+        
+        messages = self._build_analysis_messages(startup_idea)
+        return await self._ainvoke(messages, expected_sections=self.ANALYSIS_SECTIONS)
 
-Provide a detailed strategic analysis covering:
-1. Business Model & Value Proposition
-2. Target Market & Customer Segments
-3. Competitive Analysis
-4. Revenue Model & Pricing Strategy
-5. Key Success Factors
-6. Potential Risks & Mitigation
-7. Strategic Recommendations & Next Steps
+    def _build_structured_messages(self, startup_idea: str) -> list:
+        """
+        Build the messages for a strategic analysis answered as JSON
+        """
+        return self._build_messages(self.STRUCTURED_INSTRUCTIONS, f"**Startup Idea:** {startup_idea}")
 
-Be specific and actionable in your recommendations.""")
-        ]
+    def analyze_startup_idea_structured(self, startup_idea: str) -> StrategyBrief:
+        """
+        Structured version of analyze_startup_idea
         
-        # Sends messages to the LLM and get response
-        # This is where the AI "thinks" and generates the analysis
-        response = self.llm.invoke(messages)
+        Args:
+            startup_idea (str): The business idea to analyze
+            
+        Returns:
+            StrategyBrief: The analysis as typed fields
+        """
         
-        # Returns the agent's analysis
-        return response.content
+        messages = self._build_structured_messages(startup_idea)
+        return self._invoke_structured(messages, StrategyBrief)
+
+    async def aanalyze_startup_idea_structured(self, startup_idea: str) -> StrategyBrief:
+        """
+        Async version of analyze_startup_idea_structured
+        """
+        
+        messages = self._build_structured_messages(startup_idea)
+        return await self._ainvoke_structured(messages, StrategyBrief)
 
     def get_quick_feedback(self, startup_idea: str) -> str:
         """
@@ -107,17 +178,9 @@ Be specific and actionable in your recommendations.""")
             str: Brief strategic feedback
         """
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""Provide quick strategic feedback on this idea in 3-4 sentences:
-
-{startup_idea}
-
-Focus on: viability, key opportunity, and one major risk.""")
-        ]
+        messages = self._build_messages(self.QUICK_FEEDBACK_INSTRUCTIONS, f"**Startup Idea:** {startup_idea}")
         
-        response = self.llm.invoke(messages)
-        return response.content
+        return self._invoke(messages, llm=self.quick_llm)
 
 
 # Test function
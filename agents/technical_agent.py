@@ -4,15 +4,18 @@ This agent makes technology decisions based on business strategy
 Designed to work collaboratively with Strategy Agent
 """
 
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
-import os
+from typing import Iterator
 from dotenv import load_dotenv
 
+from agents.base_agent import BaseAgent
+from agents.llm_client import get_llm
+from agents.model_routing import model_for
+from agents.schemas import TechnicalBrief
+
 load_dotenv()
 
-class TechnicalAgent:
+class TechnicalAgent(BaseAgent):
     """
     The Technical Agent acts like a CTO with deep technical expertise.
     It reads the business strategy and makes informed technical decisions.
@@ -27,16 +30,10 @@ class TechnicalAgent:
         """
         Initialize the Technical Agent
         """
-        
-        self.api_key = os.getenv("GROQ_API_KEY")
-        self.model_name = os.getenv("MODEL_NAME", "llama-3.3-70b-versatile")
-        
-        # Initializingg LLM
-        self.llm = ChatGroq(
-            api_key=self.api_key,
-            model_name=self.model_name,
-            temperature=0.7
-        )
+        # Initializingg LLMs
+        # Large model for the analysis, small ones for quick feedback and drafts
+        self._load_models("technical", temperature=0.7)
+        self.speculative_llm = get_llm(model_for("technical", "speculative"), temperature=0.7)
         
         # Defines CTO personality and expertise
         #This prompt is designed for COLLABORATION
@@ -70,34 +67,15 @@ For example: "Given the target of busy professionals mentioned in the strategy,
 we'll prioritize mobile-first design and quick load times under 2 seconds."
 """
 
-    def analyze_technical_requirements(
-        self, 
-        startup_idea: str, 
-        strategy_context: str = None
-    ) -> str:
-        """
-        Analyze technical requirements for a startup
-        
-        Args:
-            startup_idea (str): The business idea
-            strategy_context (str): Output from Strategy Agent (for collaboration)
-            
-        Returns:
-            str: Comprehensive technical analysis and recommendations
-        """
-        
-        # Builds the prompt based on whether we have strategy context orr not
-        if strategy_context:
-            # COLLABORATIVE MODE: Usees strategy insights
-            prompt = f"""Based on the business strategy analysis below, provide comprehensive technical recommendations.
+    # "## " sections the collaborative prompt asks for (checked before escalating)
+    ANALYSIS_SECTIONS = 8
 
-**BUSINESS STRATEGY ANALYSIS:**
-{strategy_context}
-
-**ORIGINAL STARTUP IDEA:**
-{startup_idea}
+    # Fixed instructions of each kind of call - they go before the idea and
+    # context, so every call shares a cacheable prompt prefix (see
+    # BaseAgent._build_messages)
+    COLLABORATIVE_INSTRUCTIONS = """Based on the business strategy analysis at the end of this message, provide comprehensive technical recommendations.
 
-Now, as the CTO, provide technical analysis that ALIGNS with the business strategy above. 
+As the CTO, provide technical analysis that ALIGNS with the business strategy.
 
 Structure your response as:
 
@@ -134,13 +112,8 @@ Structure your response as:
 (How we'll handle growth based on business projections)
 
 **Remember:** Reference specific points from the business strategy in your recommendations!"""
-        
-        else:
-            # STANDALONE MODE: No strategy context
-            prompt = f"""Analyze the technical requirements for this startup idea:
 
-**STARTUP IDEA:**
-{startup_idea}
+    STANDALONE_INSTRUCTIONS = """Analyze the technical requirements for the startup idea below.
 
 Provide comprehensive technical recommendations covering:
 1. Technology Stack
@@ -150,34 +123,259 @@ Provide comprehensive technical recommendations covering:
 5. Technical Risks
 6. Cost Estimates
 7. Scalability Plan"""
+
+    STRUCTURED_INSTRUCTIONS = (
+        "Based on the business strategy below (as JSON), provide technical recommendations "
+        "that ALIGN with it. Tie the stack, roadmap, team and costs to the segments, pricing "
+        "and next steps in the strategy.\n\n"
+        + TechnicalBrief.prompt_instructions()
+    )
+
+    RECONCILE_INSTRUCTIONS = """You wrote the technical draft at the end of this message before the business strategy was available. The Strategy Agent has now finished its analysis, included below as well.
+
+Do NOT repeat the draft. Write only one additional section:
+
+## Alignment with Business Strategy
+- Which draft recommendations the strategy confirms, and why
+- Which recommendations change (stack, architecture, roadmap, team, costs), what they change to, and which strategy point drives it
+- Any technical risks the strategy adds
+
+Reference specific points from the business strategy. Keep it concise."""
+
+    QUICK_ASSESSMENT_INSTRUCTIONS = """Provide a quick technical assessment (3-4 sentences) for the idea below.
+
+Focus on: recommended tech stack, biggest technical challenge, and estimated timeline."""
+
+    def _expected_sections(self, strategy_context: str = None):
+        # Only the collaborative prompt prescribes "## " sections
+        return self.ANALYSIS_SECTIONS if strategy_context else None
+
+    def _build_technical_messages(
+        self,
+        startup_idea: str,
+        strategy_context: str = None
+    ) -> list:
+        """
+        Build the conversation messages for a technical analysis
+        Uses the collaborative prompt when strategy context is available
+        """
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=prompt)
-        ]
+        # Builds the prompt based on whether we have strategy context orr not
+        if strategy_context:
+            # COLLABORATIVE MODE: Usees strategy insights
+            return self._build_messages(
+                self.COLLABORATIVE_INSTRUCTIONS,
+                f"""**BUSINESS STRATEGY ANALYSIS:**
+{strategy_context}
+
+**ORIGINAL STARTUP IDEA:**
+{startup_idea}"""
+            )
+        
+        # STANDALONE MODE: No strategy context
+        return self._build_messages(self.STANDALONE_INSTRUCTIONS, f"**STARTUP IDEA:**\n{startup_idea}")
+
+    def analyze_technical_requirements(
+        self, 
+        startup_idea: str, 
+        strategy_context: str = None
+    ) -> str:
+        """
+        Analyze technical requirements for a startup
+        
+        Args:
+            startup_idea (str): The business idea
+            strategy_context (str): Output from Strategy Agent (for collaboration)
+            
+        Returns:
+            str: Comprehensive technical analysis and recommendations
+        """
+        
+        messages = self._build_technical_messages(startup_idea, strategy_context)
         
         # Gets response from LLM
-        response = self.llm.invoke(messages)
+        return self._invoke(messages, expected_sections=self._expected_sections(strategy_context))
+
+    def analyze_technical_requirements_stream(
+        self,
+        startup_idea: str,
+        strategy_context: str = None
+    ) -> Iterator[str]:
+        """
+        Streaming version of analyze_technical_requirements
+        
+        Args:
+            startup_idea (str): The business idea
+            strategy_context (str): Output from Strategy Agent (for collaboration)
+            
+        Yields:
+            str: Fragments of the technical analysis as they are generated
+        """
         
-        return response.content
+        messages = self._build_technical_messages(startup_idea, strategy_context)
+        yield from self._stream(messages, expected_sections=self._expected_sections(strategy_context))
 
-    def quick_tech_assessment(self, startup_idea: str) -> str:
+    async def aanalyze_technical_requirements(
+        self,
+        startup_idea: str,
+        strategy_context: str = None
+    ) -> str:
         """
-        Provides quick technical assessment
-        Useful for rapid validation
+        Async version of analyze_technical_requirements
+        
+        Args:
+            startup_idea (str): The business idea
+            strategy_context (str): Output from Strategy Agent (for collaboration)
+            
+        Returns:
+            str: Comprehensive technical analysis and recommendations
+        """
+        
+        messages = self._build_technical_messages(startup_idea, strategy_context)
+        return await self._ainvoke(
+            messages, expected_sections=self._expected_sections(strategy_context)
+        )
+
+    def _build_structured_messages(self, startup_idea: str, strategy_brief: str) -> list:
+        """
+        Build the messages for a technical plan answered as JSON, based on
+        the Strategy Agent's structured brief
+        """
+        return self._build_messages(
+            self.STRUCTURED_INSTRUCTIONS,
+            f"""**BUSINESS STRATEGY:**
+{strategy_brief}
+
+**ORIGINAL STARTUP IDEA:**
+{startup_idea}"""
+        )
+
+    def analyze_technical_requirements_structured(
+        self,
+        startup_idea: str,
+        strategy_brief: str
+    ) -> TechnicalBrief:
+        """
+        Structured version of analyze_technical_requirements
+        
+        Args:
+            startup_idea (str): The business idea
+            strategy_brief (str): StrategyBrief.to_context() of the Strategy Agent's answer
+            
+        Returns:
+            TechnicalBrief: The technical plan as typed fields
+        """
+        
+        messages = self._build_structured_messages(startup_idea, strategy_brief)
+        return self._invoke_structured(messages, TechnicalBrief)
+
+    async def aanalyze_technical_requirements_structured(
+        self,
+        startup_idea: str,
+        strategy_brief: str
+    ) -> TechnicalBrief:
+        """
+        Async version of analyze_technical_requirements_structured
+        """
+        
+        messages = self._build_structured_messages(startup_idea, strategy_brief)
+        return await self._ainvoke_structured(messages, TechnicalBrief)
+
+    def draft_technical_plan(self, startup_idea: str) -> str:
+        """
+        Standalone technical plan, written alongside the strategy in
+        speculative mode - it becomes the body of the final plan, so it
+        runs on the "speculative" model (the analysis model by default)
+        
+        Args:
+            startup_idea (str): The business idea
+            
+        Returns:
+            str: Technical analysis without strategy context
         """
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"""Provide a quick technical assessment (3-4 sentences) for:
+        messages = self._build_technical_messages(startup_idea)
+        return self._invoke(messages, llm=self.speculative_llm)
 
+    async def adraft_technical_plan(self, startup_idea: str) -> str:
+        """
+        Async version of draft_technical_plan
+        """
+        
+        messages = self._build_technical_messages(startup_idea)
+        return await self._ainvoke(messages, llm=self.speculative_llm)
+
+    def _build_reconcile_messages(
+        self,
+        startup_idea: str,
+        strategy_context: str,
+        technical_draft: str
+    ) -> list:
+        """
+        Build the messages that align a standalone draft with the strategy
+        Asks only for the changes, so this answer is much shorter than a
+        full collaborative analysis
+        """
+        return self._build_messages(
+            self.RECONCILE_INSTRUCTIONS,
+            f"""**ORIGINAL STARTUP IDEA:**
 {startup_idea}
 
-Focus on: recommended tech stack, biggest technical challenge, and estimated timeline.""")
-        ]
+**BUSINESS STRATEGY ANALYSIS:**
+{strategy_context}
+
+**YOUR TECHNICAL DRAFT:**
+{technical_draft}"""
+        )
+
+    def reconcile_technical_draft_stream(
+        self,
+        startup_idea: str,
+        strategy_context: str,
+        technical_draft: str
+    ) -> Iterator[str]:
+        """
+        Stream the section that turns a standalone draft (written in
+        parallel with the strategy) into the collaborative plan
+        
+        Args:
+            startup_idea (str): The business idea
+            strategy_context (str): Output from Strategy Agent
+            technical_draft (str): Output of analyze_technical_requirements
+                without strategy context
+            
+        Yields:
+            str: Fragments of the alignment section as they are generated
+        """
+        
+        messages = self._build_reconcile_messages(startup_idea, strategy_context, technical_draft)
+        yield from self._stream(messages)
+
+    async def areconcile_technical_draft(
+        self,
+        startup_idea: str,
+        strategy_context: str,
+        technical_draft: str
+    ) -> str:
+        """
+        Async version of reconcile_technical_draft_stream
+        
+        Returns:
+            str: The alignment section
+        """
+        
+        messages = self._build_reconcile_messages(startup_idea, strategy_context, technical_draft)
+        return await self._ainvoke(messages)
+
+    def quick_tech_assessment(self, startup_idea: str) -> str:
+        """
+        Provides quick technical assessment
+        Useful for rapid validation
+        """
+        
+        messages = self._build_messages(self.QUICK_ASSESSMENT_INSTRUCTIONS, f"**STARTUP IDEA:**\n{startup_idea}")
         
-        response = self.llm.invoke(messages)
-        return response.content
+        return self._invoke(messages, llm=self.quick_llm)
 
 
 # Test function
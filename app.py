@@ -4,13 +4,19 @@ Complete workflow with Strategy, Technical, and Marketing agents
 """
 
 import streamlit as st
+import groq
 import sys
 import os
+import time
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from workflows.collaboration import StartupCoFounderWorkflow
-import time
+from workflows.jobs import JobManager
+from agents.llm_cache import get_llm_cache
+from agents.llm_client import warm_up_connections
+from agents.model_routing import model_for
+from agents.resilience import CircuitOpenError
 
 # Page configuration
 st.set_page_config(
@@ -52,13 +58,305 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Agent outputs rendered live while the team works: (state field, tab label)
+LIVE_SECTIONS = [
+    ("strategy_analysis", "🎯 Strategy (CEO)"),
+    ("technical_analysis", "💻 Technical (CTO)"),
+    ("marketing_strategy", "📢 Marketing (CMO)"),
+]
+
+# Seconds between refreshes of a running analysis (each refresh re-sends
+# the live tabs' whole markdown, so it can't follow every token)
+JOB_POLL_INTERVAL = 0.5
+
+# Live status of each agent node: (node, label, output field)
+AGENT_NODES = [
+    ("strategy_agent", "🎯 **Strategy Agent**", "strategy_analysis"),
+    ("technical_agent", "💻 **Technical Agent**", "technical_analysis"),
+    ("marketing_agent", "📢 **Marketing Agent**", "marketing_strategy"),
+]
+
+# Progress shown when each workflow node finishes: (percent, status message, next agent node)
+NODE_PROGRESS = {
+    "strategy_agent": (25, "Technical Agent (CTO) creating the tech plan...", "technical_agent"),
+    "technical_agent": (50, "Marketing Agent (CMO) developing the marketing strategy...", "marketing_agent"),
+    "marketing_agent": (75, "Compiling comprehensive report...", None),
+    "pipelined_agents": (75, "Compiling comprehensive report...", None),
+    "compile_report": (100, "Comprehensive report compiled!", None),
+}
+
+def error_tips(error: Exception) -> str:
+    """
+    Pick troubleshooting tips that match the kind of failure
+    (transient failures were already retried by the agents)
+    """
+    if isinstance(error, CircuitOpenError):
+        return f"💡 The AI service is failing repeatedly, so requests are paused.\n- Try again in about {error.retry_in:.0f} seconds"
+    if isinstance(error, groq.AuthenticationError):
+        return "💡 Tips:\n- Check your API key in .env"
+    if isinstance(error, groq.RateLimitError):
+        return "💡 The AI service is rate limiting us even after retries.\n- Wait a minute and try again"
+    if isinstance(error, (groq.APIConnectionError, groq.InternalServerError)):
+        return "💡 The AI service could not be reached even after retries.\n- Ensure internet connection\n- Try again"
+    return "💡 Tips:\n- Check your API key in .env\n- Ensure internet connection\n- Try again"
+
+# Agent behind each result tab: (agent name, label, agents re-run with it)
+REGENERATE_OPTIONS = {
+    "strategy": ("Strategy", "Technical and Marketing build on it and are re-run too"),
+    "technical": ("Technical Plan", "Marketing builds on it and is re-run too"),
+    "marketing": ("Marketing Strategy", "Strategy and Technical are reused as they are"),
+}
+
 # Initializeiing workflow (cached)
 @st.cache_resource
 def load_workflow():
     """
     Load and cache the multi-agent workflow
+    Also opens the shared LLM connections now, so the first analysis
+    doesn't pay for connection setup
+    """
+    workflow = StartupCoFounderWorkflow()
+    warm_up_connections()
+    return workflow
+
+@st.cache_resource
+def load_job_manager():
+    """
+    Background workers shared by all sessions - at most ANALYSIS_WORKERS
+    analyses run at once, the rest wait their turn
+    """
+    return JobManager(load_workflow())
+
+def regenerate_button(agent: str):
+    """
+    Button that asks one agent for a new version of its section
+    Only that agent and the agents reading its output are called again,
+    as a background job the page polls like an analysis
+    """
+    label, note = REGENERATE_OPTIONS[agent]
+    
+    if load_workflow().pipelined:
+        # All three agents share one graph node there - nothing to re-run alone
+        return
+    
+    if st.button(
+        f"🔄 Regenerate {label}",
+        key=f"regenerate_{agent}",
+        help=note,
+        disabled=bool(st.session_state.get("job_id"))
+    ):
+        st.session_state.job_id = load_job_manager().submit_regenerate(
+            st.session_state.analysis_result["run_id"], agent
+        )
+        st.session_state.regenerate_error = None
+        st.rerun()
+
+def render_results(result: dict, analysis_time: float, first_token_time: float = None):
+    """
+    Show a finished analysis: timing breakdown, one tab per agent and the
+    export options (benchmarks/ times this function on its own)
+    
+    Args:
+        result (dict): Final workflow state
+        analysis_time (float): Seconds the analysis took
+        first_token_time (float): Seconds until the first streamed token,
+            if it was streamed
+    """
+    st.success(f"✅ Complete analysis by your AI team! (took {analysis_time} seconds)")
+    if first_token_time is not None:
+        st.caption(f"⚡ First words appeared after {first_token_time} seconds")
+    
+    if result.get("metrics"):
+        with st.expander("⏱️ Where the time went"):
+            st.table([
+                {
+                    "Step": node,
+                    "Time (s)": m["duration_s"],
+                    "First token (s)": m["ttft_s"],
+                    "Prompt tokens": m["prompt_tokens"],
+                    "Cached prompt tokens": m.get("cached_prompt_tokens", 0),
+                    "Output tokens": m["completion_tokens"],
+                }
+                for node, m in result["metrics"].items()
+            ])
+            
+            prompt_tokens = sum(m["prompt_tokens"] for m in result["metrics"].values())
+            cached = sum(m.get("cached_prompt_tokens", 0) for m in result["metrics"].values())
+            if cached:
+                st.caption(f"♻️ Provider prompt cache served {cached / prompt_tokens:.0%} of prompt tokens")
+            
+            saved = sum(m.get("context_tokens_saved", 0) for m in result["metrics"].values())
+            if saved:
+                st.caption(f"🗜️ Context selection and compression saved ~{saved} prompt tokens")
+            
+            path = result.get("critical_path")
+            if path:
+                st.caption(f"🧭 Critical path: {' → '.join(path['nodes'])} ({path['duration_s']}s)")
+    
+    st.markdown("---")
+    
+    # Creating tabs for different views
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "📊 Master Plan", 
+        "🎯 Strategy (CEO)", 
+        "💻 Technical (CTO)", 
+        "📢 Marketing (CMO)",
+        "💾 Export"
+    ])
+    
+    with tab1:
+        st.header("📊 Comprehensive Master Plan")
+        st.markdown("*All three agents collaborated to create this unified strategy*")
+        st.markdown(result["final_report"])
+    
+    with tab2:
+        st.header("🎯 Business Strategy Analysis")
+        st.markdown("*by Strategy Agent (CEO)*")
+        st.markdown(result["strategy_analysis"])
+        regenerate_button("strategy")
+    
+    with tab3:
+        st.header("💻 Technical Architecture & Plan")
+        st.markdown("*by Technical Agent (CTO)*")
+        st.markdown(result["technical_analysis"])
+        regenerate_button("technical")
+    
+    with tab4:
+        st.header("📢 Marketing Strategy & Go-to-Market")
+        st.markdown("*by Marketing Agent (CMO)*")
+        st.markdown(result["marketing_strategy"])
+        regenerate_button("marketing")
+    
+    with tab5:
+        st.markdown("### 💾 Export Your Analysis")
+        
+        col_e1, col_e2 = st.columns(2)
+        
+        with col_e1:
+            st.markdown("**📥 Download Complete Report**")
+            st.download_button(
+                label="Download Master Plan (Markdown)",
+                data=result["final_report"],
+                file_name="startup_analysis_complete.md",
+                mime="text/markdown"
+            )
+        
+        with col_e2:
+            st.markdown("**📋 Copy to Clipboard**")
+            st.code(result["final_report"], language=None)
+            st.caption("Click the copy button ☝️")
+        
+        st.markdown("---")
+        st.markdown("**Individual Agent Reports:**")
+        
+        col_d1, col_d2, col_d3 = st.columns(3)
+        
+        with col_d1:
+            st.download_button(
+                label="📥 Strategy Report",
+                data=result["strategy_analysis"],
+                file_name="strategy_analysis.txt",
+                mime="text/plain"
+            )
+        
+        with col_d2:
+            st.download_button(
+                label="📥 Technical Report",
+                data=result["technical_analysis"],
+                file_name="technical_analysis.txt",
+                mime="text/plain"
+            )
+        
+        with col_d3:
+            st.download_button(
+                label="📥 Marketing Report",
+                data=result["marketing_strategy"],
+                file_name="marketing_strategy.txt",
+                mime="text/plain"
+            )
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def analysis_progress():
+    """
+    Live view of this session's job - an analysis, a resumed run or a
+    regenerated section
+    Refreshes itself every JOB_POLL_INTERVAL seconds; once the job has
+    finished it stores the outcome and reruns the whole page
     """
-    return StartupCoFounderWorkflow()
+    job_manager = load_job_manager()
+    job = job_manager.get(st.session_state.job_id)
+    
+    if job is None or job.done:
+        st.session_state.job_id = None
+        if job is not None and job.status == "complete":
+            st.session_state.analysis_result = job.result
+            st.session_state.analysis_time = round(job.finished_at - job.submitted_at, 2)
+            st.session_state.first_token_time = (
+                round(job.first_token_at - job.submitted_at, 2) if job.first_token_at else None
+            )
+        elif job is not None and job.kind == "regenerate":
+            # The previous result stays on screen - only the new version failed
+            st.session_state.regenerate_error = job.error
+        elif job is not None:
+            # Progress is checkpointed under the run id, so the run can be resumed
+            st.session_state.failed_run_id = job.run_id
+            st.session_state.analysis_error = job.error
+        st.rerun()
+    
+    if job.kind != "analysis":
+        # Resumed and regenerated runs don't stream - just say where they are
+        if job.status == "queued":
+            ahead = job_manager.queue_position(job.job_id)
+            st.info(f"⏳ Waiting for a free worker ({ahead} jobs ahead of yours)...")
+        elif job.kind == "resume":
+            st.info("🔁 Resuming from the last completed agent...")
+        else:
+            st.info(f"🔄 Regenerating {REGENERATE_OPTIONS[job.agent][0].lower()}...")
+        return
+    
+    st.markdown("---")
+    st.subheader("🤖 AI Team Working...")
+    
+    finished_nodes = [node for node in job.completed_nodes if node in NODE_PROGRESS]
+    st.progress(max((NODE_PROGRESS[node][0] for node in finished_nodes), default=0))
+    
+    if job.status == "queued":
+        ahead = job_manager.queue_position(job.job_id)
+        st.text(f"Waiting for a free worker ({ahead} analyses ahead of yours)...")
+    elif finished_nodes:
+        st.text(NODE_PROGRESS[finished_nodes[-1]][1])
+    else:
+        st.text("Strategy Agent (CEO) analyzing business viability...")
+    
+    # The first agent still working is the one analyzing right now
+    current_node = next(
+        (node for node, _, field in AGENT_NODES if field not in job.finished_fields), None
+    )
+    
+    for column, (node, label, field) in zip(st.columns(3), AGENT_NODES):
+        with column:
+            if field in job.finished_fields:
+                st.markdown(f"{label}: ✅ Complete")
+            elif job.live_text.get(field):
+                st.markdown(f"{label}: ✍️ Writing...")
+            elif node == "technical_agent" and "technical_draft" in job.completed_nodes:
+                # Speculative mode: the CTO drafted a plan while the CEO works
+                st.markdown(f"{label}: 📝 Draft ready, waiting for strategy...")
+            elif node == current_node and job.status == "running":
+                st.markdown(f"{label}: 🔄 Analyzing...")
+            else:
+                st.markdown(f"{label}: ⏳ Waiting...")
+    
+    # Live output - each tab fills up as its agent writes
+    for tab, (field, _) in zip(st.tabs([label for _, label in LIVE_SECTIONS]), LIVE_SECTIONS):
+        with tab:
+            text = job.live_text.get(field)
+            if not text:
+                st.markdown("*Waiting for this agent...*")
+            elif field in job.finished_fields:
+                st.markdown(text)
+            else:
+                st.markdown(text + " ▌")
 
 # Main App
 def main():
@@ -111,8 +409,21 @@ def main():
         """)
         
         st.markdown("---")
-        st.markdown("**Model:** Llama 3.3 70B via Groq")
+        st.markdown(f"**Model:** {model_for('strategy', 'analysis')} via Groq")
+        st.caption(f"Quick scan & drafts: {model_for('strategy', 'quick')}")
         st.markdown("**Status:** ✅ Multi-Agent Active")
+        
+        llm_cache = get_llm_cache()
+        if llm_cache:
+            cache_stats = llm_cache.stats()
+            cache_hits = cache_stats["memory_hits"] + cache_stats["disk_hits"]
+            st.markdown(f"**Response cache:** {cache_hits} hits / {cache_stats['misses']} misses")
+        
+        job_stats = load_job_manager().stats()
+        st.markdown(
+            f"**Analyses:** {job_stats['running']} running / {job_stats['queued']} queued "
+            f"({job_stats['workers']} workers)"
+        )
     
     # Main content
     col1, col2 = st.columns([2, 1])
@@ -130,7 +441,14 @@ def main():
         analyze_button = st.button(
             "🚀 Analyze with Full AI Team", 
             type="primary", 
-            use_container_width=True
+            use_container_width=True,
+            disabled=bool(st.session_state.get("job_id"))
+        )
+        
+        quick_scan_button = st.button(
+            "⚡ Quick Scan (a few seconds)",
+            use_container_width=True,
+            help="Short feedback from each agent, in parallel - for triage before the full analysis"
         )
     
     with col2:
@@ -165,165 +483,94 @@ def main():
         st.session_state.analysis_result = None
         st.session_state.startup_idea = None
         st.session_state.analysis_time = None
+        st.session_state.first_token_time = None
+        st.session_state.failed_run_id = None
+        st.session_state.analysis_error = None
+        st.session_state.job_id = None
+        st.session_state.regenerate_error = None
+        st.session_state.quick_scan = None
     
-    # Process analysis
-    if analyze_button:
+    # Quick triage: the three agents' short answers, side by side
+    if quick_scan_button:
         if not startup_idea.strip():
-            st.error("⚠️ Please enter a startup idea to analyze!")
+            st.error("⚠️ Please enter a startup idea to scan!")
         else:
-            # Loading mym workflow
             workflow = load_workflow()
-            
-            # Creating progress container
-            progress_container = st.container()
-            
-            with progress_container:
-                st.markdown("---")
-                st.subheader("🤖 AI Team Working...")
-                
-                # Progress bar
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                # Agent status indicators
-                col_s, col_t, col_m = st.columns(3)
-                with col_s:
-                    strategy_status = st.empty()
-                    strategy_status.markdown("🎯 **Strategy Agent**: ⏳ Waiting...")
-                with col_t:
-                    technical_status = st.empty()
-                    technical_status.markdown("💻 **Technical Agent**: ⏳ Waiting...")
-                with col_m:
-                    marketing_status = st.empty()
-                    marketing_status.markdown("📢 **Marketing Agent**: ⏳ Waiting...")
-            
             try:
-                start_time = time.time()
-                
-                # Update status : Strategy Agent working
-                status_text.text("Strategy Agent (CEO) analyzing business viability...")
-                strategy_status.markdown("🎯 **Strategy Agent**: 🔄 Analyzing...")
-                progress_bar.progress(25)
-                
-                # Running the complete workflow
-                # We'll update status by checking the state as it progresses
-                result = workflow.analyze_startup(startup_idea)
-                
-                # Technical Agent
-                progress_bar.progress(50)
-                strategy_status.markdown("🎯 **Strategy Agent**: ✅ Complete")
-                technical_status.markdown("💻 **Technical Agent**: ✅ Complete")
-                status_text.text("Technical Agent (CTO) completed tech plan...")
-                
-                # Marketing Agent
-                progress_bar.progress(75)
-                marketing_status.markdown("📢 **Marketing Agent**: ✅ Complete")
-                status_text.text("Marketing Agent (CMO) completed strategy...")
-                
-                # Final compilation
-                progress_bar.progress(100)
-                status_text.text("Compiling comprehensive report...")
-                
-                end_time = time.time()
-                analysis_time = round(end_time - start_time, 2)
-                
-                # Storing  in session state
-                st.session_state.analysis_result = result
-                st.session_state.startup_idea = startup_idea
-                st.session_state.analysis_time = analysis_time
-                
-                # Clearng progress indicators
-                time.sleep(0.5)
-                progress_container.empty()
-                
+                with st.spinner("Your AI team is taking a quick look..."):
+                    start_time = time.time()
+                    st.session_state.quick_scan = workflow.quick_scan(startup_idea)
+                    st.session_state.quick_scan["duration_s"] = round(time.time() - start_time, 2)
             except Exception as e:
-                st.error(f"❌ Error during analysis: {str(e)}")
-                st.info("💡 Tips:\n- Check your API key in .env\n- Ensure internet connection\n- Try again")
+                st.error(f"❌ Error during quick scan: {str(e)}")
+                st.info(error_tips(e))
     
-    # Displaying results
-    if st.session_state.analysis_result:
-        result = st.session_state.analysis_result
+    if st.session_state.get("quick_scan") and not st.session_state.analysis_result:
+        scan = st.session_state.quick_scan
+        st.markdown("---")
+        st.subheader(f"⚡ Quick Scan ({scan['duration_s']} seconds)")
         
-        st.success(f"✅ Complete analysis by your AI team! (took {st.session_state.analysis_time} seconds)")
+        col_q1, col_q2, col_q3 = st.columns(3)
+        with col_q1:
+            st.markdown("**🎯 Strategy (CEO)**")
+            st.markdown(scan["strategy_feedback"])
+        with col_q2:
+            st.markdown("**💻 Technical (CTO)**")
+            st.markdown(scan["tech_assessment"])
+        with col_q3:
+            st.markdown("**📢 Launch (CMO)**")
+            st.markdown(scan["launch_campaign"])
         
-        st.markdown("---")
+        st.caption("Looks promising? Run the full analysis for the complete, collaborative plan.")
+    
+    # Process analysis - a background worker runs it (workflows/jobs.py);
+    # this session only submits the job and polls, so reruns don't stop it
+    if analyze_button:
+        if not startup_idea.strip():
+            st.error("⚠️ Please enter a startup idea to analyze!")
+        else:
+            st.session_state.job_id = load_job_manager().submit(startup_idea)
+            st.session_state.startup_idea = startup_idea
+            # The old idea's result would otherwise hide this run's outcome
+            st.session_state.analysis_result = None
+            st.session_state.failed_run_id = None
+            st.session_state.analysis_error = None
+            st.session_state.regenerate_error = None
+    
+    if st.session_state.get("job_id"):
+        analysis_progress()
+    
+    # Offer to continue a failed run without paying for finished agents again
+    if st.session_state.get("failed_run_id") and not st.session_state.analysis_result:
+        error = st.session_state.get("analysis_error")
+        if error is not None:
+            st.error(f"❌ Error during analysis: {str(error)}")
+            st.info(error_tips(error))
+        if load_workflow().pipelined:
+            # The agents share one checkpointed step there
+            st.warning("⚠️ The last analysis stopped part-way. In pipelined mode nothing is saved until all three agents finish, so resuming runs them all again.")
+        else:
+            st.warning("⚠️ The last analysis stopped part-way. Completed agents' work has been saved.")
+        if st.button("🔁 Resume Analysis"):
+            # A background job like the analysis - if it fails too, the
+            # poller puts the run id back here
+            st.session_state.job_id = load_job_manager().submit_resume(st.session_state.failed_run_id)
+            st.session_state.failed_run_id = None
+            st.session_state.analysis_error = None
+            st.rerun()
+    
+    # Displaying results
+    if st.session_state.analysis_result:
+        error = st.session_state.get("regenerate_error")
+        if error is not None:
+            st.error(f"❌ Error while regenerating: {str(error)}")
+            st.info(error_tips(error))
         
-        # Creating tabs for different views
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
-            "📊 Master Plan", 
-            "🎯 Strategy (CEO)", 
-            "💻 Technical (CTO)", 
-            "📢 Marketing (CMO)",
-            "💾 Export"
-        ])
-        
-        with tab1:
-            st.header("📊 Comprehensive Master Plan")
-            st.markdown("*All three agents collaborated to create this unified strategy*")
-            st.markdown(result["final_report"])
-        
-        with tab2:
-            st.header("🎯 Business Strategy Analysis")
-            st.markdown("*by Strategy Agent (CEO)*")
-            st.markdown(result["strategy_analysis"])
-        
-        with tab3:
-            st.header("💻 Technical Architecture & Plan")
-            st.markdown("*by Technical Agent (CTO)*")
-            st.markdown(result["technical_analysis"])
-        
-        with tab4:
-            st.header("📢 Marketing Strategy & Go-to-Market")
-            st.markdown("*by Marketing Agent (CMO)*")
-            st.markdown(result["marketing_strategy"])
-        
-        with tab5:
-            st.markdown("### 💾 Export Your Analysis")
-            
-            col_e1, col_e2 = st.columns(2)
-            
-            with col_e1:
-                st.markdown("**📥 Download Complete Report**")
-                st.download_button(
-                    label="Download Master Plan (Markdown)",
-                    data=result["final_report"],
-                    file_name="startup_analysis_complete.md",
-                    mime="text/markdown"
-                )
-            
-            with col_e2:
-                st.markdown("**📋 Copy to Clipboard**")
-                st.code(result["final_report"], language=None)
-                st.caption("Click the copy button ☝️")
-            
-            st.markdown("---")
-            st.markdown("**Individual Agent Reports:**")
-            
-            col_d1, col_d2, col_d3 = st.columns(3)
-            
-            with col_d1:
-                st.download_button(
-                    label="📥 Strategy Report",
-                    data=result["strategy_analysis"],
-                    file_name="strategy_analysis.txt",
-                    mime="text/plain"
-                )
-            
-            with col_d2:
-                st.download_button(
-                    label="📥 Technical Report",
-                    data=result["technical_analysis"],
-                    file_name="technical_analysis.txt",
-                    mime="text/plain"
-                )
-            
-            with col_d3:
-                st.download_button(
-                    label="📥 Marketing Report",
-                    data=result["marketing_strategy"],
-                    file_name="marketing_strategy.txt",
-                    mime="text/plain"
-                )
+        render_results(
+            st.session_state.analysis_result,
+            st.session_state.analysis_time,
+            st.session_state.get("first_token_time")
+        )
         
         # Feedback section
         st.markdown("---")
@@ -341,6 +588,11 @@ def main():
         with col_fb3:
             if st.button("🔄 Analyze New Idea"):
                 st.session_state.analysis_result = None
+                st.session_state.failed_run_id = None
+                st.session_state.regenerate_error = None
+                # Stop following a regeneration still running for the old idea
+                st.session_state.job_id = None
+                st.session_state.quick_scan = None
                 st.session_state.startup_idea = None
                 st.session_state.analysis_time = None
                 st.rerun()
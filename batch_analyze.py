@@ -0,0 +1,220 @@
+"""
+Batch Analysis - Headless runner for many startup ideas
+Reads ideas from a JSONL file, analyzes them concurrently with
+StartupCoFounderWorkflow and writes one JSONL result per idea as soon as it finishes
+
+Usage:
+    python batch_analyze.py ideas.jsonl results.jsonl --concurrency 20
+
+Each input line is either a JSON string or an object with an "idea" (or
+"startup_idea") field and an optional "id". Each output record carries the
+run's id and per-node metrics.
+
+Checkpoints are kept in memory unless --checkpoints names a file; with a
+file, a failed idea can be continued with workflow.resume(record["run_id"])
+(set WORKFLOW_CHECKPOINT_MAX_RUNS=0 so large batches keep every run).
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+import uuid
+
+from workflows.collaboration import OUTPUT_FIELDS, StartupCoFounderWorkflow
+
+
+# Typed versions of OUTPUT_FIELDS, only filled in with --structured
+BRIEF_FIELDS = ("strategy_brief", "technical_brief", "marketing_brief")
+
+
+def read_ideas(path: str) -> list:
+    """
+    Load ideas from a JSONL file
+
+    Args:
+        path (str): Input file
+
+    Returns:
+        list: (idea_id, startup_idea) tuples in file order
+    """
+    ideas = []
+
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            record = json.loads(line)
+            if isinstance(record, str):
+                ideas.append((line_number, record))
+            else:
+                idea = record.get("idea") or record.get("startup_idea")
+                if not idea:
+                    raise ValueError(f"{path}:{line_number}: no 'idea' field")
+                ideas.append((record.get("id", line_number), idea))
+
+    return ideas
+
+
+def count_tokens(result: dict) -> int:
+    """
+    Tokens the agents generated for one idea, from the run's per-node metrics
+    """
+    return sum(node["completion_tokens"] for node in result.get("metrics", {}).values())
+
+
+async def run_batch(
+    workflow: StartupCoFounderWorkflow,
+    ideas: list,
+    output_path: str,
+    concurrency: int
+) -> dict:
+    """
+    Analyze all ideas with at most `concurrency` workflows in flight
+
+    Results are appended to output_path in completion order.
+
+    Returns:
+        dict: Throughput summary
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def analyze(idea_id, startup_idea):
+        async with semaphore:
+            started = time.time()
+            run_id = uuid.uuid4().hex
+            try:
+                result = await workflow.aanalyze_startup(startup_idea, run_id=run_id)
+                record = {
+                    "id": idea_id,
+                    "run_id": run_id,
+                    "status": "ok",
+                    "startup_idea": startup_idea,
+                    "duration_s": round(time.time() - started, 3),
+                    **{field: result[field] for field in OUTPUT_FIELDS},
+                    **{field: result[field] for field in BRIEF_FIELDS if result.get(field)},
+                    "final_report": result["final_report"],
+                    "metrics": result["metrics"],
+                }
+                tokens = count_tokens(result)
+            except Exception as e:
+                record = {
+                    "id": idea_id,
+                    "run_id": run_id,
+                    "status": "error",
+                    "startup_idea": startup_idea,
+                    "duration_s": round(time.time() - started, 3),
+                    "error": f"{type(e).__name__}: {e}",
+                }
+                tokens = 0
+            return record, tokens
+
+    start_time = time.time()
+    completed = failed = total_tokens = 0
+
+    with open(output_path, "a", encoding="utf-8") as out:
+        tasks = [asyncio.create_task(analyze(idea_id, idea)) for idea_id, idea in ideas]
+
+        for task in asyncio.as_completed(tasks):
+            record, tokens = await task
+
+            # Write each result the moment it exists
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+            completed += 1
+            total_tokens += tokens
+            if record["status"] == "error":
+                failed += 1
+
+            print(
+                f"[{completed}/{len(ideas)}] {record['status']:5} id={record['id']} "
+                f"({record['duration_s']}s)",
+                file=sys.stderr
+            )
+
+    elapsed = time.time() - start_time
+
+    succeeded = completed - failed
+
+    return {
+        "ideas": len(ideas),
+        "succeeded": succeeded,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 2),
+        # Failed ideas finish too, often fast - only successes count as throughput
+        "ideas_per_min": round(succeeded / elapsed * 60, 2) if elapsed else 0.0,
+        "attempted_per_min": round(completed / elapsed * 60, 2) if elapsed else 0.0,
+        "completion_tokens": total_tokens,
+        "tokens_per_s": round(total_tokens / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a JSONL file of startup ideas")
+    parser.add_argument("input", help="JSONL file with one idea per line")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument(
+        "--concurrency", type=int, default=10,
+        help="Maximum analyses running at the same time (default: 10)"
+    )
+    parser.add_argument(
+        "--speculative", action="store_true",
+        help="Start each technical plan in parallel with its strategy (compare duration_s with a normal run)"
+    )
+    parser.add_argument(
+        "--pipelined", action="store_true",
+        help="Start each agent while the previous one is still writing"
+    )
+    parser.add_argument(
+        "--structured", action="store_true",
+        help="Have the agents answer and hand off typed JSON instead of prose"
+    )
+    parser.add_argument(
+        "--checkpoints", default=":memory:",
+        help="SQLite file for the runs' checkpoints, to resume failed ideas later (default: memory only)"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="Show the workflow's per-agent progress output"
+    )
+    args = parser.parse_args()
+
+    ideas = read_ideas(args.input)
+    workflow = StartupCoFounderWorkflow(
+        checkpoint_path=args.checkpoints,
+        speculative=args.speculative or None,
+        pipelined=args.pipelined or None,
+        structured=args.structured or None
+    )
+
+    print(f"🚀 Analyzing {len(ideas)} ideas with concurrency {args.concurrency}...", file=sys.stderr)
+
+    # The workflow prints progress per agent - too noisy for thousands of runs
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        summary = asyncio.run(run_batch(workflow, ideas, args.output, args.concurrency))
+
+    print("\n" + "=" * 70, file=sys.stderr)
+    print("✅ BATCH COMPLETE", file=sys.stderr)
+    print("=" * 70, file=sys.stderr)
+    print(
+        f"Ideas: {summary['ideas']} ({summary['succeeded']} ok, {summary['failed']} failed)\n"
+        f"Elapsed: {summary['elapsed_s']}s\n"
+        f"Throughput: {summary['ideas_per_min']} successful ideas/min "
+        f"({summary['attempted_per_min']} attempted), "
+        f"{summary['tokens_per_s']} generated tokens/s",
+        file=sys.stderr
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
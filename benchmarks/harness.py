@@ -0,0 +1,168 @@
+"""
+Benchmark Harness - Time one benchmark case and summarize it
+Each case runs a few untimed warm-up iterations, then timed iterations,
+then one more under tracemalloc (tracing slows Python down, so memory is
+measured separately from latency).
+
+Python-side overhead is an iteration's wall time minus the time LLM calls
+were in flight, taken from the calls BaseAgent reports (overlapping calls
+count once).
+"""
+
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from typing import Callable, Iterator, List
+
+from agents.instrumentation import track_llm_calls
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Linear-interpolated percentile, `pct` in 0-100
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> dict:
+    """
+    p50/p95/p99 plus mean, min and max, in seconds
+    """
+    return {
+        "p50": round(percentile(values, 50), 6),
+        "p95": round(percentile(values, 95), 6),
+        "p99": round(percentile(values, 99), 6),
+        "mean": round(sum(values) / len(values), 6) if values else 0.0,
+        "min": round(min(values), 6) if values else 0.0,
+        "max": round(max(values), 6) if values else 0.0,
+    }
+
+
+def busy_time(intervals: List[tuple]) -> float:
+    """
+    Total length of the union of (start, end) intervals
+    """
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def run_case(fn: Callable[[], object], iterations: int, warmup: int = 1) -> dict:
+    """
+    Benchmark one callable
+
+    Args:
+        fn (callable): One iteration of the case
+        iterations (int): Timed iterations
+        warmup (int): Untimed iterations first (imports, connections, caches)
+
+    Returns:
+        dict: wall time and Python overhead percentiles, LLM calls per
+        iteration, peak traced memory and what one iteration left allocated
+    """
+    for _ in range(warmup):
+        fn()
+
+    wall_times = []
+    overheads = []
+    llm_calls = 0
+    for _ in range(iterations):
+        with track_llm_calls() as calls:
+            started = time.perf_counter()
+            fn()
+            wall = time.perf_counter() - started
+        llm_time = busy_time([(call.started_at, call.ended_at) for call in calls])
+        wall_times.append(wall)
+        overheads.append(max(0.0, wall - llm_time))
+        llm_calls += len(calls)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = [stat for stat in after.compare_to(before, "filename") if stat.size_diff > 0]
+
+    return {
+        "iterations": iterations,
+        "wall_s": summarize(wall_times),
+        "python_overhead_s": summarize(overheads),
+        "llm_calls_per_iteration": round(llm_calls / iterations, 2) if iterations else 0,
+        "peak_memory_kb": round(peak / 1024, 1),
+        "retained_kb": round(sum(stat.size_diff for stat in retained) / 1024, 1),
+        "retained_blocks": sum(stat.count_diff for stat in retained if stat.count_diff > 0),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def fake_backend(
+    tokens_per_s: float = 0.0,
+    ttft_s: float = 0.0,
+    rate_429: float = 0.0,
+    rate_500: float = 0.0
+) -> Iterator[str]:
+    """
+    Run tools/fake_llm_server.py in a separate process (so serving the
+    fake answers doesn't compete with the code being measured for the GIL)
+
+    Args:
+        tokens_per_s (float): Streaming speed (0: no delay)
+        ttft_s (float): Delay before the first token
+        rate_429 (float): Share of requests answered with 429
+        rate_500 (float): Share of requests answered with 500
+
+    Yields:
+        str: Base URL to use as GROQ_API_BASE
+    """
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    process = subprocess.Popen(
+        [sys.executable, "-m", "tools.fake_llm_server", "--port", str(port),
+         "--tokens-per-s", str(tokens_per_s), "--ttft", str(ttft_s),
+         "--rate-429", str(rate_429), "--rate-500", str(rate_500)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.time() + 10
+        while True:
+            try:
+                urllib.request.urlopen(f"{url}/openai/v1/models", timeout=1).close()
+                break
+            except OSError:
+                if time.time() > deadline or process.poll() is not None:
+                    raise RuntimeError("Fake LLM server did not start")
+                time.sleep(0.05)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=5)
@@ -0,0 +1,198 @@
+"""
+Load Test - Many users clicking "Analyze" at once on one deployment
+Every Streamlit session submits its analysis to the one JobManager
+app.load_job_manager() caches with st.cache_resource, and polls it. This
+tool starts N such sessions at the same moment, each submitting and
+polling the way app.py's Analyze button does, against the offline fake
+LLM backend, and repeats that at increasing N.
+
+Per level it reports:
+- throughput: finished analyses per minute
+- error rate: share of sessions whose analysis raised
+- latency and time to first token per session (p50 / p95 / p99)
+- queueing delay per session: time before its first LLM call started
+  (mostly waiting for a free worker) plus the time its calls were held
+  back by the shared rate limiter
+
+Usage:
+    python -m benchmarks.load_test --sessions 1 5 10 25 50 --tokens-per-s 150 --ttft 0.3
+    python -m benchmarks.load_test --sessions 10 50 --workers 8 --rpm-limit 30 --rate-429 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.instrumentation import track_llm_calls
+from benchmarks.harness import fake_backend, summarize
+from benchmarks.run import IDEA, configure_environment, git_commit
+
+
+# Seconds between two status checks of a session - timings come from the
+# job's own timestamps, so this only decides how soon a session notices
+POLL_INTERVAL = 0.05
+
+
+def run_session(job_manager, startup_idea: str, clicked_at: float) -> dict:
+    """
+    One user's analysis: submit the job, then poll until it has finished
+
+    Returns:
+        dict: ok, error (exception class name), latency_s, ttft_s, queue_s
+    """
+    # The job runs in a copy of this context, so its calls are tracked here
+    with track_llm_calls() as calls:
+        job_id = job_manager.submit(startup_idea)
+        job = job_manager.get(job_id)
+        while not job.done:
+            time.sleep(POLL_INTERVAL)
+            job = job_manager.get(job_id)
+
+    error = type(job.error).__name__ if job.error else None
+    first_token_at = job.first_token_at
+    finished_at = job.finished_at
+
+    queue_s = sum(call.queued_s for call in calls)
+    if calls:
+        queue_s += min(call.started_at for call in calls) - clicked_at
+
+    return {
+        "ok": error is None,
+        "error": error,
+        "latency_s": finished_at - clicked_at,
+        "ttft_s": first_token_at - clicked_at if first_token_at else None,
+        "queue_s": queue_s,
+    }
+
+
+def run_level(job_manager, sessions: int, stagger_s: float = 0.0) -> dict:
+    """
+    Start `sessions` analyses together and wait for all of them
+
+    Args:
+        job_manager: The shared JobManager
+        sessions (int): Concurrent users
+        stagger_s (float): Gap between two users' clicks (0: all at once)
+
+    Returns:
+        dict: throughput, error rate and latency/TTFT/queueing percentiles
+    """
+    ready = threading.Barrier(sessions + 1)
+
+    def session(index: int) -> dict:
+        ready.wait()
+        time.sleep(index * stagger_s)
+        return run_session(job_manager, f"{IDEA} (user {index + 1})", time.time())
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(session, index) for index in range(sessions)]
+        ready.wait()
+        started_at = time.time()
+        outcomes = [future.result() for future in futures]
+        wall_s = time.time() - started_at
+
+    finished = [outcome for outcome in outcomes if outcome["ok"]]
+    return {
+        "sessions": sessions,
+        "completed": len(finished),
+        "errors": sessions - len(finished),
+        "error_rate": round((sessions - len(finished)) / sessions, 3),
+        "error_types": dict(Counter(outcome["error"] for outcome in outcomes if outcome["error"])),
+        "wall_s": round(wall_s, 3),
+        "throughput_per_min": round(len(finished) / wall_s * 60, 2) if wall_s else 0.0,
+        "latency_s": summarize([outcome["latency_s"] for outcome in finished]),
+        "ttft_s": summarize([outcome["ttft_s"] for outcome in finished if outcome["ttft_s"] is not None]),
+        "queue_s": summarize([outcome["queue_s"] for outcome in outcomes]),
+    }
+
+
+def print_level(level: dict) -> None:
+    latency, ttft, queue = level["latency_s"], level["ttft_s"], level["queue_s"]
+    print(f"{level['sessions']:>8} {level['completed']:>6} {level['error_rate']:>7.1%} "
+          f"{level['throughput_per_min']:>10.1f} {latency['p50']:>9.2f}s {latency['p95']:>8.2f}s "
+          f"{ttft['p95']:>9.2f}s {queue['p50']:>9.2f}s {queue['p95']:>8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of the Streamlit app against a fake LLM")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 25, 50],
+                        help="Concurrency levels to run, in order")
+    parser.add_argument("--workers", type=int, help="ANALYSIS_WORKERS of the job manager (default: its own)")
+    parser.add_argument("--stagger", type=float, default=0.0, help="Seconds between two users' clicks")
+    parser.add_argument("--tokens-per-s", type=float, default=150.0, help="Fake LLM speed per stream")
+    parser.add_argument("--ttft", type=float, default=0.3, help="Fake LLM time to first token")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of LLM requests rejected with 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Share of LLM requests failing with 500")
+    parser.add_argument("--rpm-limit", help="GROQ_RPM_LIMIT for the shared rate limiter (default: off)")
+    parser.add_argument("--tpm-limit", help="GROQ_TPM_LIMIT for the shared rate limiter (default: off)")
+    parser.add_argument("--output", default="benchmarks/results/load_test.json")
+    parser.add_argument("--verbose", action="store_true", help="Show the workflow's progress output")
+    args = parser.parse_args()
+
+    levels = []
+    with fake_backend(args.tokens_per_s, args.ttft, args.rate_429, args.rate_500) as base_url:
+        configure_environment(base_url)
+        # Checkpoints on disk, as deployed - concurrent runs share the SQLite file
+        os.environ["WORKFLOW_CHECKPOINT_PATH"] = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+        os.environ["GROQ_RPM_LIMIT"] = args.rpm_limit or ""
+        os.environ["GROQ_TPM_LIMIT"] = args.tpm_limit or ""
+        if args.workers:
+            os.environ["ANALYSIS_WORKERS"] = str(args.workers)
+
+        print(f"{'Sessions':>8} {'Done':>6} {'Errors':>7} {'Per min':>10} {'p50 lat':>10} "
+              f"{'p95 lat':>9} {'p95 TTFT':>10} {'p50 queue':>10} {'p95 queue':>9}")
+
+        with contextlib.ExitStack() as stack:
+            if not args.verbose:
+                stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+            # The same cached job manager every Streamlit session gets. Importing
+            # the app outside `streamlit run` warns once per widget call
+            logging.disable(logging.WARNING)
+            try:
+                from app import load_job_manager
+                job_manager = load_job_manager()
+            finally:
+                logging.disable(logging.NOTSET)
+
+            for sessions in args.sessions:
+                level = run_level(job_manager, sessions, args.stagger)
+                levels.append(level)
+                with contextlib.redirect_stdout(sys.__stdout__):
+                    print_level(level)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "settings": {
+            "workers": job_manager.max_workers,
+            "stagger_s": args.stagger,
+            "tokens_per_s": args.tokens_per_s,
+            "ttft_s": args.ttft,
+            "rate_429": args.rate_429,
+            "rate_500": args.rate_500,
+            "rpm_limit": args.rpm_limit,
+            "tpm_limit": args.tpm_limit,
+        },
+        "levels": levels,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
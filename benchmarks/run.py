@@ -0,0 +1,192 @@
+"""
+Benchmark Runner - End-to-end latency of the workflow, the agents and the UI
+Runs every case against the offline fake LLM backend (deterministic
+answers, configurable speed) and writes the results to JSON, so two
+commits can be compared on the same machine.
+
+Usage:
+    python -m benchmarks.run --iterations 20 --output benchmarks/results/latest.json
+    python -m benchmarks.run --compare benchmarks/results/baseline.json
+    python -m benchmarks.run --only workflow --tokens-per-s 500 --ttft 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import fake_backend, run_case
+
+IDEA = (
+    "An AI-powered meal planning app that creates personalized weekly meal plans "
+    "based on dietary preferences, budget, and cooking time. Generates shopping "
+    "lists and provides recipes."
+)
+
+WORKFLOW_MODES = {
+    "default": {},
+    "speculative": {"speculative": True},
+    "pipelined": {"pipelined": True},
+    "structured": {"structured": True},
+}
+
+
+def configure_environment(base_url: str) -> None:
+    """
+    Point the agents at the fake backend and switch off everything that
+    would make iterations differ (response cache, rate limiter, checkpoints
+    on disk). Must run before the agents are imported.
+    """
+    os.environ.update({
+        "GROQ_API_BASE": base_url,
+        "GROQ_API_KEY": "fake",
+        "LLM_CACHE_ENABLED": "false",
+        "GROQ_RPM_LIMIT": "",
+        "GROQ_TPM_LIMIT": "",
+        "WORKFLOW_CHECKPOINT_PATH": ":memory:",
+    })
+
+
+def _render_script(result: dict) -> None:
+    # Runs inside AppTest as its own Streamlit script
+    import app
+    app.render_results(result, 12.3, 0.8)
+
+
+def build_cases(modes: list) -> dict:
+    """
+    Every benchmark case: {name: callable running one iteration}
+    """
+    from streamlit.testing.v1 import AppTest
+    from workflows.collaboration import StartupCoFounderWorkflow
+
+    cases = {}
+    workflows = {}
+    for mode in modes:
+        workflows[mode] = StartupCoFounderWorkflow(**WORKFLOW_MODES[mode])
+        cases[f"workflow.analyze_startup[{mode}]"] = (
+            lambda workflow=workflows[mode]: workflow.analyze_startup(IDEA)
+        )
+
+    workflow = workflows.get("default") or StartupCoFounderWorkflow()
+    result = workflow.analyze_startup(IDEA)
+    strategy, technical, marketing = (
+        workflow.strategy_agent, workflow.technical_agent, workflow.marketing_agent
+    )
+
+    cases.update({
+        "strategy.analyze_startup_idea": lambda: strategy.analyze_startup_idea(IDEA),
+        "strategy.analyze_startup_idea_stream": lambda: "".join(strategy.analyze_startup_idea_stream(IDEA)),
+        "strategy.get_quick_feedback": lambda: strategy.get_quick_feedback(IDEA),
+        "technical.analyze_technical_requirements": lambda: technical.analyze_technical_requirements(
+            IDEA, result["strategy_analysis"]
+        ),
+        "technical.quick_tech_assessment": lambda: technical.quick_tech_assessment(IDEA),
+        "marketing.create_marketing_strategy": lambda: marketing.create_marketing_strategy(
+            IDEA, result["strategy_analysis"], result["technical_analysis"]
+        ),
+        "marketing.create_launch_campaign": lambda: marketing.create_launch_campaign(IDEA),
+        "app.render_results": lambda: AppTest.from_function(
+            _render_script, args=(result,), default_timeout=30
+        ).run(),
+    })
+    return cases
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_comparison(results: dict, baseline_path: str) -> None:
+    """
+    p50 / p95 wall time and p50 overhead of each case against an earlier run
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["cases"]
+
+    print(f"\n{'Case':<48}{'p50 Δ':>10}{'p95 Δ':>10}{'overhead Δ':>12}")
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+
+        def change(section, key):
+            old = before[section][key]
+            return f"{(current[section][key] - old) / old:+.0%}" if old else "-"
+
+        print(f"{name:<48}{change('wall_s', 'p50'):>10}{change('wall_s', 'p95'):>10}"
+              f"{change('python_overhead_s', 'p50'):>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the workflow, agents and UI against a fake LLM")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--only", nargs="*", default=[], help="Run cases whose name starts with one of these")
+    parser.add_argument("--modes", nargs="*", default=list(WORKFLOW_MODES), choices=list(WORKFLOW_MODES))
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="Fake LLM speed (0: no delay)")
+    parser.add_argument("--ttft", type=float, default=0.0, help="Fake LLM time to first token")
+    parser.add_argument("--verbose", action="store_true", help="Show the workflow's progress output")
+    args = parser.parse_args()
+
+    results = {}
+    with fake_backend(args.tokens_per_s, args.ttft) as base_url:
+        configure_environment(base_url)
+
+        # The workflow prints progress per agent - noise at this volume
+        with contextlib.ExitStack() as stack:
+            if not args.verbose:
+                stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+            cases = build_cases(args.modes)
+
+        for name, fn in cases.items():
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            with contextlib.ExitStack() as stack:
+                if not args.verbose:
+                    stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+                results[name] = run_case(fn, args.iterations, args.warmup)
+
+            wall, overhead = results[name]["wall_s"], results[name]["python_overhead_s"]
+            print(f"{name:<48} p50 {wall['p50']:.4f}s  p95 {wall['p95']:.4f}s  p99 {wall['p99']:.4f}s  "
+                  f"overhead p50 {overhead['p50']:.4f}s  peak {results[name]['peak_memory_kb']} KB")
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "tokens_per_s": args.tokens_per_s,
+            "ttft_s": args.ttft,
+        },
+        "cases": results,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
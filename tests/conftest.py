@@ -0,0 +1,9 @@
+"""
+Shared test setup - makes the repo's packages importable when pytest is
+run from any directory
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,176 @@
+"""
+Tests for workflows/jobs.py - the background job manager
+"""
+
+import threading
+import time
+
+from workflows.jobs import JobManager
+
+
+class FakeWorkflow:
+    """
+    Stands in for StartupCoFounderWorkflow: each analysis streams a few
+    events, and waits for `release` first when one is given
+    """
+
+    def __init__(self, release: threading.Event = None, error: Exception = None):
+        self.release = release
+        self.error = error
+
+    def stream_analysis(self, startup_idea, run_id=None):
+        if self.release:
+            self.release.wait(5)
+        yield {"type": "token", "field": "strategy_analysis", "text": "Stra"}
+        yield {"type": "token", "field": "strategy_analysis", "text": "tegy"}
+        if self.error:
+            raise self.error
+        yield {
+            "type": "node_complete",
+            "node": "strategy_agent",
+            "update": {"strategy_analysis": "Strategy.", "current_step": "Strategy Complete"},
+        }
+        yield {"type": "complete", "result": {"startup_idea": startup_idea, "run_id": run_id}}
+
+    def resume(self, run_id):
+        return {"run_id": run_id, "resumed": True}
+
+    def regenerate(self, run_id, agent):
+        return {"run_id": run_id, "regenerated": agent}
+
+
+def wait_until_done(manager: JobManager, job_id: str):
+    deadline = time.time() + 5
+    job = manager.get(job_id)
+    while not job.done:
+        assert time.time() < deadline, f"job still {job.status}"
+        time.sleep(0.01)
+        job = manager.get(job_id)
+    return job
+
+
+def test_analysis_completes_with_result_and_output():
+    manager = JobManager(FakeWorkflow(), max_workers=1)
+
+    job = wait_until_done(manager, manager.submit("An idea"))
+
+    assert job.status == "complete"
+    assert job.error is None
+    assert job.result == {"startup_idea": "An idea", "run_id": job.run_id}
+    assert job.completed_nodes == ["strategy_agent"]
+    assert job.started_at is not None and job.first_token_at is not None and job.finished_at is not None
+
+
+def test_only_output_fields_count_as_finished():
+    manager = JobManager(FakeWorkflow(), max_workers=1)
+
+    job = wait_until_done(manager, manager.submit("An idea"))
+
+    # The node's text replaces the streamed fragments; current_step is not output
+    assert job.finished_fields == {"strategy_analysis"}
+    assert job.live_text == {"strategy_analysis": "Strategy."}
+
+
+def test_streamed_text_is_visible_while_running():
+    release = threading.Event()
+
+    class Paused(FakeWorkflow):
+        def stream_analysis(self, startup_idea, run_id=None):
+            yield {"type": "token", "field": "strategy_analysis", "text": "Stra"}
+            yield {"type": "token", "field": "strategy_analysis", "text": "tegy"}
+            release.wait(5)
+            yield {"type": "complete", "result": {}}
+
+    manager = JobManager(Paused(), max_workers=1)
+    job_id = manager.submit("An idea")
+
+    deadline = time.time() + 5
+    while manager.get(job_id).live_text.get("strategy_analysis") != "Strategy":
+        assert time.time() < deadline
+        time.sleep(0.01)
+    assert manager.get(job_id).status == "running"
+
+    release.set()
+    assert wait_until_done(manager, job_id).status == "complete"
+
+
+def test_failed_analysis_keeps_error_and_run_id():
+    error = RuntimeError("backend down")
+    manager = JobManager(FakeWorkflow(error=error), max_workers=1)
+
+    job = wait_until_done(manager, manager.submit("An idea"))
+
+    assert job.status == "failed"
+    assert job.error is error
+    assert job.run_id
+    assert job.result is None
+
+
+def test_jobs_beyond_the_workers_queue_in_order():
+    release = threading.Event()
+    manager = JobManager(FakeWorkflow(release=release), max_workers=1)
+
+    first = manager.submit("Idea 1")
+    second = manager.submit("Idea 2")
+    third = manager.submit("Idea 3")
+
+    deadline = time.time() + 5
+    while manager.get(first).status != "running":
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+    assert manager.get(second).status == "queued"
+    assert manager.queue_position(first) == 0
+    assert manager.queue_position(second) == 0
+    assert manager.queue_position(third) == 1
+    assert manager.stats() == {"queued": 2, "running": 1, "complete": 0, "failed": 0, "workers": 1}
+
+    release.set()
+    for job_id in (first, second, third):
+        assert wait_until_done(manager, job_id).status == "complete"
+    assert manager.stats()["complete"] == 3
+
+
+def test_snapshot_is_independent_of_the_job():
+    manager = JobManager(FakeWorkflow(), max_workers=1)
+    job_id = manager.submit("An idea")
+    snapshot = wait_until_done(manager, job_id)
+
+    snapshot.completed_nodes.append("tampered")
+    snapshot.finished_fields.add("tampered")
+
+    job = manager.get(job_id)
+    assert "tampered" not in job.completed_nodes
+    assert "tampered" not in job.finished_fields
+
+
+def test_resume_and_regenerate_jobs():
+    manager = JobManager(FakeWorkflow(), max_workers=2)
+
+    resumed = wait_until_done(manager, manager.submit_resume("run-1"))
+    regenerated = wait_until_done(manager, manager.submit_regenerate("run-2", "marketing"))
+
+    assert (resumed.kind, resumed.run_id, resumed.result) == ("resume", "run-1", {"run_id": "run-1", "resumed": True})
+    assert (regenerated.kind, regenerated.agent) == ("regenerate", "marketing")
+    assert regenerated.result == {"run_id": "run-2", "regenerated": "marketing"}
+
+
+def test_oldest_finished_jobs_are_dropped():
+    manager = JobManager(FakeWorkflow(), max_workers=1, keep_finished=2)
+
+    job_ids = [manager.submit(f"Idea {index}") for index in range(3)]
+    for job_id in job_ids:
+        wait_until_done(manager, job_id)
+    # Pruning happens when a job is submitted or finishes
+    wait_until_done(manager, manager.submit("Idea 3"))
+
+    assert manager.get(job_ids[0]) is None
+    assert manager.get(job_ids[1]) is None
+    assert manager.get(job_ids[2]) is not None
+
+
+def test_unknown_job_id():
+    manager = JobManager(FakeWorkflow(), max_workers=1)
+
+    assert manager.get("missing") is None
+    assert manager.queue_position("missing") == 0
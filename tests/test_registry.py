@@ -0,0 +1,115 @@
+"""
+Tests for workflows/registry.py - deriving the graph from reads and writes
+"""
+
+import pytest
+
+from workflows.registry import AgentSpec, critical_path, derive_dependencies
+
+
+def spec(name, reads=(), writes=()):
+    return AgentSpec(name, reads=tuple(reads), writes=tuple(writes), run=lambda state: {})
+
+
+# The sequential workflow: strategy -> technical -> marketing -> report
+SEQUENTIAL = [
+    spec("strategy_agent", ["startup_idea"], ["strategy_analysis"]),
+    spec("technical_agent", ["startup_idea", "strategy_analysis"], ["technical_analysis"]),
+    spec("marketing_agent", ["startup_idea", "strategy_analysis", "technical_analysis"], ["marketing_strategy"]),
+    spec("compile_report", ["strategy_analysis", "technical_analysis", "marketing_strategy"], ["final_report"]),
+]
+
+
+def test_dependencies_follow_reads():
+    dependencies = derive_dependencies(SEQUENTIAL, inputs=["startup_idea"])
+
+    assert dependencies["strategy_agent"] == set()
+    assert dependencies["technical_agent"] == {"strategy_agent"}
+
+
+def test_implied_dependencies_are_dropped():
+    # Marketing reads strategy too, but already waits for it through technical
+    dependencies = derive_dependencies(SEQUENTIAL, inputs=["startup_idea"])
+
+    assert dependencies["marketing_agent"] == {"technical_agent"}
+    assert dependencies["compile_report"] == {"marketing_agent"}
+
+
+def test_independent_nodes_share_a_dependency():
+    specs = [
+        spec("strategy_agent", ["startup_idea"], ["strategy_analysis"]),
+        spec("technical_draft", ["startup_idea"], ["technical_draft"]),
+        spec("technical_agent", ["strategy_analysis", "technical_draft"], ["technical_analysis"]),
+    ]
+
+    dependencies = derive_dependencies(specs, inputs=["startup_idea"])
+
+    assert dependencies["technical_draft"] == set()
+    assert dependencies["technical_agent"] == {"strategy_agent", "technical_draft"}
+
+
+def test_reading_own_output_is_not_a_dependency():
+    specs = [spec("agent", ["startup_idea", "notes"], ["notes"])]
+
+    assert derive_dependencies(specs, inputs=["startup_idea"]) == {"agent": set()}
+
+
+def test_cycle_is_rejected():
+    specs = [
+        spec("a", ["b_out"], ["a_out"]),
+        spec("b", ["a_out"], ["b_out"]),
+    ]
+
+    with pytest.raises(ValueError, match="cycle"):
+        derive_dependencies(specs, inputs=[])
+
+
+def test_field_with_two_writers_is_rejected():
+    specs = [
+        spec("a", ["startup_idea"], ["analysis"]),
+        spec("b", ["startup_idea"], ["analysis"]),
+    ]
+
+    with pytest.raises(ValueError, match="written by both a and b"):
+        derive_dependencies(specs, inputs=["startup_idea"])
+
+
+def test_field_nobody_writes_is_rejected():
+    specs = [spec("a", ["missing"], ["a_out"])]
+
+    with pytest.raises(ValueError, match="a reads missing"):
+        derive_dependencies(specs, inputs=["startup_idea"])
+
+
+def test_critical_path_takes_the_slowest_branch():
+    dependencies = {
+        "strategy_agent": set(),
+        "technical_draft": set(),
+        "technical_agent": {"strategy_agent", "technical_draft"},
+        "compile_report": {"technical_agent"},
+    }
+    metrics = {
+        "strategy_agent": {"duration_s": 4.0},
+        "technical_draft": {"duration_s": 6.0},
+        "technical_agent": {"duration_s": 1.0},
+        "compile_report": {"duration_s": 0.5},
+    }
+
+    path = critical_path(dependencies, metrics)
+
+    assert path == {"nodes": ["technical_draft", "technical_agent", "compile_report"], "duration_s": 7.5}
+
+
+def test_critical_path_runs_through_to_the_final_node():
+    # Nodes without metrics take no time - the path still ends at the report
+    dependencies = derive_dependencies(SEQUENTIAL, inputs=["startup_idea"])
+    metrics = {"strategy_agent": {"duration_s": 2.0}, "technical_agent": {"duration_s": 3.0}}
+
+    path = critical_path(dependencies, metrics)
+
+    assert path["nodes"] == ["strategy_agent", "technical_agent", "marketing_agent", "compile_report"]
+    assert path["duration_s"] == 5.0
+
+
+def test_critical_path_of_no_nodes():
+    assert critical_path({}, {}) == {"nodes": [], "duration_s": 0.0}
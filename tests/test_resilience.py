@@ -0,0 +1,144 @@
+"""
+Tests for agents/resilience.py - error classification and the circuit breaker
+"""
+
+import time
+
+import groq
+import httpx
+import pytest
+
+from agents import base_agent
+from agents.resilience import CircuitBreaker, CircuitOpenError, backend_answered, is_retryable
+
+
+RESET_TIMEOUT = 0.05
+
+
+def status_error(status_code: int) -> groq.APIStatusError:
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    return groq.APIStatusError("error", response=httpx.Response(status_code, request=request), body=None)
+
+
+def open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=RESET_TIMEOUT)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    return breaker
+
+
+def half_open_breaker() -> CircuitBreaker:
+    breaker = open_breaker()
+    time.sleep(RESET_TIMEOUT * 1.5)
+    return breaker
+
+
+@pytest.mark.parametrize("status_code", [408, 409, 429, 500, 503])
+def test_transient_statuses_are_retryable(status_code):
+    assert is_retryable(status_error(status_code))
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 404, 422])
+def test_rejected_requests_are_not_retryable(status_code):
+    assert not is_retryable(status_error(status_code))
+    assert backend_answered(status_error(status_code))
+
+
+def test_local_errors_are_not_backend_answers():
+    assert not is_retryable(ValueError("bug"))
+    assert not backend_answered(ValueError("bug"))
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=RESET_TIMEOUT)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=RESET_TIMEOUT)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_a_single_trial_through():
+    breaker = half_open_breaker()
+    assert breaker.state == "half_open"
+
+    breaker.before_call()
+
+    # Everyone else waits for the trial's outcome
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_successful_trial_closes_the_circuit():
+    breaker = half_open_breaker()
+    breaker.before_call()
+
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_reopens_the_circuit():
+    breaker = half_open_breaker()
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_released_trial_lets_the_next_caller_try():
+    breaker = half_open_breaker()
+    breaker.before_call()
+
+    breaker.release_trial()
+
+    assert breaker.state == "half_open"
+    breaker.before_call()
+
+
+@pytest.fixture
+def agent_with_breaker(monkeypatch):
+    # A BaseAgent whose calls report to a breaker of its own
+    breaker = half_open_breaker()
+    monkeypatch.setattr(base_agent, "get_circuit_breaker", lambda: breaker)
+    monkeypatch.setattr(base_agent, "get_rate_limiter", lambda: None)
+    return base_agent.BaseAgent(), breaker
+
+
+def test_rejected_request_closes_a_half_open_circuit(agent_with_breaker):
+    agent, breaker = agent_with_breaker
+    breaker.before_call()
+
+    assert agent._attempt_failed(status_error(400), attempt=1, estimate=100) is None
+
+    assert breaker.state == "closed"
+
+
+def test_local_error_leaves_a_half_open_circuit_half_open(agent_with_breaker):
+    agent, breaker = agent_with_breaker
+    breaker.before_call()
+
+    assert agent._attempt_failed(ValueError("bug"), attempt=1, estimate=100) is None
+
+    # Not closed, but the trial slot is free again
+    assert breaker.state == "half_open"
+    breaker.before_call()
@@ -0,0 +1,422 @@
+"""
+Fake LLM Server - Offline stand-in for the Groq chat-completions API
+Speaks enough of the API for the agents (plain and streamed completions,
+JSON mode, usage with cached prompt tokens) with configurable speed and
+failures, and answers deterministically: the same prompt always gets the
+same text, shaped like the sections the prompt asks for.
+
+Standard library only, so it runs in CI and on air-gapped machines.
+
+Usage:
+    python -m tools.fake_llm_server --port 8765 --tokens-per-s 150 --ttft 0.3
+
+    GROQ_API_BASE=http://127.0.0.1:8765 GROQ_API_KEY=fake streamlit run app.py
+
+or in-process:
+    with FakeLLMServer(FakeLLMConfig(tokens_per_s=0)) as server:
+        os.environ["GROQ_API_BASE"] = server.url
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+CHARS_PER_TOKEN = 4          # same estimate as agents/rate_limiter.py
+PROMPT_CACHE_BLOCK = 1024    # prompt prefixes are cached in blocks of this many chars
+
+# "**STARTUP IDEA:**" - where a prompt's fixed instructions end and its
+# inputs begin (see BaseAgent._build_messages)
+INPUT_LABEL = re.compile(r"^\*\*[^*\n]+:\*\*", re.MULTILINE)
+SECTION_HEADING = re.compile(r"^(#{2,3} .+?)\s*$", re.MULTILINE)
+SCHEMA_MARKER = "JSON schema:\n"
+
+WORDS = """
+customers market growth pricing subscription platform retention onboarding segment
+revenue launch roadmap mobile analytics partners budget pilot churn acquisition
+infrastructure latency scaling feedback positioning channel content referral brand
+conversion margin team hiring runway milestone integration security compliance
+""".split()
+
+FIGURES = ["$9.99/month", "$29/month", "$12k/month", "35%", "20%", "3 months",
+           "6 weeks", "10,000 users", "2 engineers", "$150k", "99.9%", "4x"]
+
+
+@dataclass
+class FakeLLMConfig:
+    """
+    How the fake backend behaves
+
+    Error rates are probabilities per request; a "timeout" holds the
+    request for `hang_s` without answering.
+    """
+    tokens_per_s: float = 200.0        # 0 streams as fast as possible
+    ttft_s: float = 0.2                # delay before the first token
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    rate_timeout: float = 0.0
+    hang_s: float = 65.0
+    retry_after_s: float = 1.0         # Retry-After sent with 429s
+    words_per_section: int = 80
+    seed: int = 0
+    models: tuple = ("llama-3.3-70b-versatile", "llama-3.1-8b-instant")
+
+
+def _message_text(message: dict) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.sample(WORDS, rng.randint(6, 12))
+    if rng.random() < 0.4:
+        words.insert(rng.randint(1, len(words)), rng.choice(FIGURES))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraphs(rng: random.Random, words: int) -> str:
+    sentences = []
+    while sum(len(s.split()) for s in sentences) < words:
+        sentences.append(_sentence(rng))
+    return " ".join(sentences)
+
+
+def _schema_instance(schema: dict, defs: dict, rng: random.Random):
+    """
+    A value matching a pydantic-generated JSON schema
+    """
+    if "$ref" in schema:
+        return _schema_instance(defs[schema["$ref"].split("/")[-1]], defs, rng)
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return _schema_instance(options[0], defs, rng) if options else None
+
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            name: _schema_instance(prop, defs, rng)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [_schema_instance(schema.get("items", {}), defs, rng) for _ in range(rng.randint(2, 4))]
+    if kind in ("integer", "number"):
+        return rng.randint(1, 100)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return _sentence(rng)
+
+
+def canned_answer(messages: list, json_mode: bool, words_per_section: int) -> str:
+    """
+    The deterministic answer to a conversation
+
+    - JSON mode: an object matching the JSON schema quoted in the prompt
+    - prompt asks for "## " sections: those sections, in order
+    - otherwise: a short paragraph (quick feedback and similar)
+    """
+    prompt = "\n".join(_message_text(message) for message in messages)
+    rng = random.Random(hashlib.sha256(prompt.encode()).hexdigest())
+
+    last_user = next(
+        (_message_text(m) for m in reversed(messages) if m.get("role") == "user"), ""
+    )
+
+    if json_mode:
+        start = last_user.find(SCHEMA_MARKER)
+        if start < 0:
+            return json.dumps({"answer": _paragraphs(rng, words_per_section)})
+        schema, _ = json.JSONDecoder().raw_decode(last_user[start + len(SCHEMA_MARKER):])
+        return json.dumps(_schema_instance(schema, schema.get("$defs", {}), rng))
+
+    # Only the instructions - upstream analyses in the inputs have headings too
+    label = INPUT_LABEL.search(last_user)
+    instructions = last_user[:label.start()] if label else last_user
+    headings = SECTION_HEADING.findall(instructions)
+
+    if not headings:
+        return _paragraphs(rng, 60)
+    return "\n\n".join(
+        f"{heading}\n{_paragraphs(rng, words_per_section)}" for heading in headings
+    )
+
+
+class PromptCache:
+    """
+    Remembers prompt prefixes, the way providers cache them: a request
+    reuses every leading block it shares with an earlier request
+    """
+
+    def __init__(self):
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def cached_tokens(self, prompt: str) -> int:
+        hasher = hashlib.sha256()
+        cached_chars = 0
+        still_cached = True
+
+        with self._lock:
+            for end in range(PROMPT_CACHE_BLOCK, len(prompt) + 1, PROMPT_CACHE_BLOCK):
+                hasher.update(prompt[end - PROMPT_CACHE_BLOCK:end].encode())
+                digest = hasher.copy().hexdigest()
+                if still_cached and digest in self._seen:
+                    cached_chars = end
+                else:
+                    still_cached = False
+                    self._seen.add(digest)
+
+        return cached_chars // CHARS_PER_TOKEN
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes - without this, Nagle's
+    # algorithm holds the body back ~40ms on keep-alive connections
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass  # one line per request drowns benchmark output
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {
+                "object": "list",
+                "data": [{"id": model, "object": "model"} for model in self.server.config.models],
+            })
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "type": "not_found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found", "type": "not_found"}})
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        config = self.server.config
+
+        failure = self.server.draw_failure()
+        if failure == "timeout":
+            time.sleep(config.hang_s)
+            self.close_connection = True
+            return
+        if failure == "429":
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (injected)", "type": "rate_limit_exceeded"}},
+                {"Retry-After": str(config.retry_after_s)}
+            )
+            return
+        if failure == "500":
+            self._send_json(500, {"error": {"message": "Internal error (injected)", "type": "internal_server_error"}})
+            return
+
+        messages = request.get("messages", [])
+        json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+        text = canned_answer(messages, json_mode, config.words_per_section)
+
+        # Split into word-sized tokens, keeping the whitespace
+        tokens = re.findall(r"\S+\s*|\s+", text)
+        finish_reason = "stop"
+        max_tokens = request.get("max_tokens") or request.get("max_completion_tokens")
+        if max_tokens and len(tokens) > max_tokens:
+            tokens = tokens[:max_tokens]
+            finish_reason = "length"
+
+        prompt = "\n".join(_message_text(message) for message in messages)
+        prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+            "prompt_tokens_details": {"cached_tokens": self.server.prompt_cache.cached_tokens(prompt)},
+        }
+        completion = {
+            "id": f"chatcmpl-fake-{self.server.next_id()}",
+            "created": int(time.time()),
+            "model": request.get("model", config.models[0]),
+        }
+
+        time.sleep(config.ttft_s)
+        if request.get("stream"):
+            self._stream(completion, tokens, finish_reason, usage)
+            return
+
+        if config.tokens_per_s:
+            time.sleep(len(tokens) / config.tokens_per_s)
+        self._send_json(200, {
+            **completion,
+            "object": "chat.completion",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": finish_reason,
+            }],
+            "usage": usage,
+        })
+
+    def _stream(self, completion: dict, tokens: list, finish_reason: str, usage: dict) -> None:
+        """
+        Server-sent events, one token per chunk, usage in the last chunk's
+        x_groq field like the real API
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(delta: dict, finish: Optional[str] = None, extra: Optional[dict] = None) -> None:
+            chunk = {
+                **completion,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                **(extra or {}),
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        delay = 1.0 / self.server.config.tokens_per_s if self.server.config.tokens_per_s else 0.0
+        try:
+            send({"role": "assistant", "content": ""})
+            for token in tokens:
+                send({"content": token})
+                if delay:
+                    time.sleep(delay)
+            send({}, finish_reason, {"x_groq": {"id": completion["id"], "usage": usage}})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default backlog of 5 refuses or delays connections
+    # when a load test opens many at once - the fake must not be the bottleneck
+    request_queue_size = 1024
+
+    def __init__(self, address, config: FakeLLMConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.prompt_cache = PromptCache()
+        self.stats = {"requests": 0, "429": 0, "500": 0, "timeout": 0}
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            return self.stats["requests"]
+
+    def draw_failure(self) -> Optional[str]:
+        """
+        Decide whether this request fails - the draws come from one
+        seeded generator, so a run with the same seed fails the same way
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            draw = self._rng.random()
+            for kind, rate in (("429", self.config.rate_429), ("500", self.config.rate_500),
+                               ("timeout", self.config.rate_timeout)):
+                if draw < rate:
+                    self.stats[kind] += 1
+                    return kind
+                draw -= rate
+            return None
+
+
+@dataclass
+class FakeLLMServer:
+    """
+    Runs the fake backend on a background thread
+
+    Port 0 picks a free port; `url` is what GROQ_API_BASE should be set to.
+    """
+    config: FakeLLMConfig = field(default_factory=FakeLLMConfig)
+    host: str = "127.0.0.1"
+    port: int = 0
+
+    def start(self) -> "FakeLLMServer":
+        self._server = _Server((self.host, self.port), self.config)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stats(self) -> dict:
+        """
+        Requests served and failures injected so far
+        """
+        return dict(self._server.stats)
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Groq chat-completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tokens-per-s", type=float, default=200.0, help="Streaming speed (0: no delay)")
+    parser.add_argument("--ttft", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests rejected with 429")
+    parser.add_argument("--rate-500", type=float, default=0.0, help="Share of requests failing with 500")
+    parser.add_argument("--rate-timeout", type=float, default=0.0, help="Share of requests never answered")
+    parser.add_argument("--hang", type=float, default=65.0, help="Seconds a timed-out request is held")
+    parser.add_argument("--words-per-section", type=int, default=80)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the injected failures")
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(
+        tokens_per_s=args.tokens_per_s,
+        ttft_s=args.ttft,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        rate_timeout=args.rate_timeout,
+        hang_s=args.hang,
+        words_per_section=args.words_per_section,
+        seed=args.seed
+    )
+    server = _Server((args.host, args.port), config)
+    print(f"🧪 Fake LLM server on http://{args.host}:{args.port}")
+    print(f"   GROQ_API_BASE=http://{args.host}:{args.port} GROQ_API_KEY=fake streamlit run app.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
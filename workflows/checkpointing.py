@@ -0,0 +1,132 @@
+"""
+Checkpointing - Persistent LangGraph checkpoints in a local SQLite file
+Every finished node is saved under the run's id, so a failed run can be
+resumed from the last completed agent instead of starting over.
+Only the most recent runs are kept, so the file doesn't grow forever.
+"""
+
+import asyncio
+import os
+import sqlite3
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+# Saved checkpoints between two retention passes
+PRUNE_EVERY_PUTS = 100
+
+
+class ThreadedSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver that also serves LangGraph's async API
+
+    The stock SqliteSaver is sync-only, which would break ainvoke(). Here
+    the async methods run the (lock-protected) sync ones in a worker
+    thread, so invoke() and ainvoke() share one checkpoint database.
+
+    With `max_runs` set, runs beyond the `max_runs` most recent ones are
+    deleted every PRUNE_EVERY_PUTS checkpoints.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, max_runs: Optional[int] = None):
+        super().__init__(conn)
+        self.max_runs = max_runs
+        self._puts = 0
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        self._puts += 1
+        if self.max_runs and self._puts % PRUNE_EVERY_PUTS == 0:
+            self.prune()
+        return saved
+
+    def prune(self) -> int:
+        """
+        Delete every run except the `max_runs` most recent ones
+
+        Checkpoint ids are time-ordered, so a run's newest id tells when it
+        was last written.
+
+        Returns:
+            int: Number of runs deleted
+        """
+        with self.cursor() as cur:
+            cur.execute(
+                """SELECT thread_id FROM checkpoints GROUP BY thread_id
+                ORDER BY MAX(checkpoint_id) DESC LIMIT -1 OFFSET ?""",
+                (self.max_runs,)
+            )
+            stale = [(row[0],) for row in cur.fetchall()]
+            cur.executemany("DELETE FROM checkpoints WHERE thread_id = ?", stale)
+            cur.executemany("DELETE FROM writes WHERE thread_id = ?", stale)
+        return len(stale)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(path: str, max_runs: Optional[int] = None) -> ThreadedSqliteSaver:
+    """
+    Open (or create) the checkpoint database at `path`
+
+    Args:
+        path (str): SQLite file, ":memory:" for a throwaway store
+        max_runs (int): Most recent runs to keep (None or 0: keep all)
+
+    Returns:
+        ThreadedSqliteSaver: Checkpointer to compile the graph with
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # check_same_thread=False is safe: SqliteSaver serializes access with a lock
+    conn = sqlite3.connect(path, check_same_thread=False)
+    checkpointer = ThreadedSqliteSaver(conn, max_runs=max_runs)
+    if max_runs:
+        # Leftovers of earlier processes
+        checkpointer.prune()
+    return checkpointer
@@ -3,14 +3,87 @@ Multi-Agent Collaboration Workflow using LangGraph
 This orchestrates the Strategy, Technical, and Marketing agents to work together
 """
 
-from typing import TypedDict, Annotated
+from typing import TypedDict, Annotated, Iterator, Iterable
 from langgraph.graph import StateGraph, END
+from langgraph.config import get_stream_writer
+from langchain_core.runnables import RunnableLambda
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import itertools
 import operator
+import os
+import threading
+import time
+import uuid
 
 # Importing all my agents
 from agents.strategy_agent import StrategyAgent
 from agents.technical_agent import TechnicalAgent
 from agents.marketing_agent import MarketingAgent
+from agents.schemas import MarketingBrief, StrategyBrief, TechnicalBrief
+from agents.instrumentation import track_llm_calls, summarize_node
+from agents.llm_cache import fresh_llm_responses
+from workflows.checkpointing import create_checkpointer
+from workflows.compression import compress_text, estimate_tokens
+from workflows.registry import AgentSpec, critical_path, derive_dependencies
+from workflows.sections import completed_text, sections_complete, select_sections
+
+
+# Agents that can be regenerated on their own: agent name -> graph node
+AGENT_NODES = {
+    "strategy": "strategy_agent",
+    "technical": "technical_agent",
+    "marketing": "marketing_agent",
+}
+
+# State fields filled in by the caller rather than by an agent
+INPUT_FIELDS = ("startup_idea", "run_id")
+
+# The agents' finished analyses - the sections shown to the user
+OUTPUT_FIELDS = ("strategy_analysis", "technical_analysis", "marketing_strategy")
+
+# The upstream sections each agent actually uses - {agent: {upstream
+# field: [section headings]}}. Only these are forwarded into its prompt;
+# fields not listed here are forwarded whole.
+CONSUMED_SECTIONS = {
+    "technical": {
+        "strategy_analysis": [
+            "Executive Summary", "Business Model", "Target Market",
+            "Revenue Model", "Strategic Recommendations",
+        ],
+    },
+    "marketing": {
+        "strategy_analysis": [
+            "Executive Summary", "Business Model", "Target Market",
+            "Competitive Analysis", "Revenue Model",
+        ],
+        "technical_analysis": [
+            "Technical Strategy Overview", "Recommended Technology Stack",
+            "Development Roadmap",
+        ],
+    },
+}
+
+# Token budget for each upstream output handed to a downstream agent:
+# {(agent, upstream field): tokens}. Longer outputs are compressed
+# extractively before they go into the agent's prompt.
+CONTEXT_BUDGETS = {
+    ("technical", "strategy_analysis"): 1200,
+    ("marketing", "strategy_analysis"): 800,
+    ("marketing", "technical_analysis"): 800,
+}
+
+# Pipelined mode: the upstream sections each agent waits for before it
+# starts - {agent: {upstream field: [section headings]}}
+PIPELINE_TRIGGERS = {
+    "technical": {
+        "strategy_analysis": ["Executive Summary", "Business Model", "Target Market"],
+    },
+    "marketing": {
+        "strategy_analysis": ["Target Market", "Competitive Analysis", "Revenue Model"],
+        "technical_analysis": ["Technical Strategy Overview", "Recommended Technology Stack"],
+    },
+}
 
 
 # Defineng the shared state that all agents can access
@@ -27,11 +100,29 @@ class AgentState(TypedDict):
     technical_analysis: str
     marketing_strategy: str
     
+    # Standalone technical plan written alongside the strategy (speculative mode)
+    technical_draft: str
+    
+    # Structured mode: each agent's answer as typed data (agents/schemas.py);
+    # the *_analysis / marketing_strategy fields hold its markdown rendering
+    strategy_brief: dict
+    technical_brief: dict
+    marketing_brief: dict
+    
     # Final combined output
     final_report: str
     
+    # Slowest chain of nodes in the run: {"nodes": [...], "duration_s": ...}
+    critical_path: dict
+    
     # Metadata
-    current_step: str
+    # (latest write wins, so agents finishing in the same step don't clash)
+    current_step: Annotated[str, lambda previous, latest: latest]
+    run_id: str
+    
+    # Per-node timing and token usage, keyed by node name
+    # (merged, so nodes running in parallel each add their own entry)
+    metrics: Annotated[dict, operator.or_]
 
 
 class StartupCoFounderWorkflow:
@@ -44,14 +135,90 @@ class StartupCoFounderWorkflow:
     3. Technical Agent reads strategy, creates tech plan
     4. Marketing Agent reads both, creates marketing strategy
     5. All combined into unified report
+    
+    In speculative mode the Technical Agent writes a standalone draft while
+    the Strategy Agent is still working, then only adds a short section
+    aligning the draft with the strategy once it arrives.
+    
+    In pipelined mode each agent starts as soon as the upstream sections it
+    needs have been streamed (see PIPELINE_TRIGGERS), so the three calls
+    overlap. Takes precedence over speculative mode. The three agents run
+    in one graph node, so nothing is checkpointed until all of them have
+    finished: resume() re-runs all three after any failure, and
+    regenerate() can't re-run a single agent.
+    
+    In structured mode every agent answers with JSON matching its schema in
+    agents/schemas.py, and downstream agents read the compact JSON instead
+    of the prose. Takes precedence over the other two modes.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        checkpoint_path: str = None,
+        speculative: bool = None,
+        pipelined: bool = None,
+        pipeline_triggers: dict = None,
+        context_budgets: dict = None,
+        consumed_sections: dict = None,
+        structured: bool = None
+    ):
         """
         Initialize all agents and build the workflow graph
+        
+        Args:
+            checkpoint_path (str): SQLite file where finished steps of every
+                run are saved (default: WORKFLOW_CHECKPOINT_PATH or
+                .cache/checkpoints.sqlite); only the last
+                WORKFLOW_CHECKPOINT_MAX_RUNS runs are kept (default: 200,
+                0 keeps all)
+            speculative (bool): Start the technical plan in parallel with the
+                strategy (default: WORKFLOW_SPECULATIVE_TECH, off)
+            pipelined (bool): Start each agent while the previous one is
+                still writing (default: WORKFLOW_PIPELINED, off); resuming
+                then re-runs all three agents and single agents can't be
+                regenerated
+            pipeline_triggers (dict): Sections each agent waits for in
+                pipelined mode (default: PIPELINE_TRIGGERS)
+            context_budgets (dict): Token budget per forwarded context
+                (default: CONTEXT_BUDGETS; CONTEXT_BUDGET_<AGENT>_<FIELD>
+                overrides one entry, CONTEXT_COMPRESSION=false turns
+                compression off)
+            consumed_sections (dict): Upstream sections forwarded to each
+                agent (default: CONSUMED_SECTIONS; CONTEXT_SECTIONS=false
+                forwards whole outputs)
+            structured (bool): Agents answer with typed JSON and hand that
+                on instead of prose (default: WORKFLOW_STRUCTURED, off)
         """
         print("🚀 Initializing Multi-Agent Workflow...")
         
+        # Saves the state after every node, keyed by run id
+        self.checkpointer = create_checkpointer(
+            checkpoint_path or os.getenv("WORKFLOW_CHECKPOINT_PATH", ".cache/checkpoints.sqlite"),
+            max_runs=int(os.getenv("WORKFLOW_CHECKPOINT_MAX_RUNS", "200"))
+        )
+        
+        if speculative is None:
+            speculative = os.getenv("WORKFLOW_SPECULATIVE_TECH", "false").lower() in ("1", "true", "yes")
+        self.speculative = speculative
+        
+        if pipelined is None:
+            pipelined = os.getenv("WORKFLOW_PIPELINED", "false").lower() in ("1", "true", "yes")
+        self.pipelined = pipelined
+        self.pipeline_triggers = pipeline_triggers or PIPELINE_TRIGGERS
+        
+        if structured is None:
+            structured = os.getenv("WORKFLOW_STRUCTURED", "false").lower() in ("1", "true", "yes")
+        self.structured = structured
+        
+        self.select_sections = os.getenv("CONTEXT_SECTIONS", "true").lower() not in ("0", "false", "no")
+        self.consumed_sections = consumed_sections or CONSUMED_SECTIONS
+        self.compress_context = os.getenv("CONTEXT_COMPRESSION", "true").lower() not in ("0", "false", "no")
+        self.context_budgets = dict(context_budgets or CONTEXT_BUDGETS)
+        for agent, field in list(self.context_budgets):
+            override = os.getenv(f"CONTEXT_BUDGET_{agent.upper()}_{field.upper()}")
+            if override:
+                self.context_budgets[(agent, field)] = int(override)
+        
         # Createing instances of all agents
         self.strategy_agent = StrategyAgent()
         self.technical_agent = TechnicalAgent()
@@ -62,35 +229,196 @@ class StartupCoFounderWorkflow:
         
         print("✅ Workflow initialized successfully!")
     
+    def _agent_specs(self) -> list:
+        """
+        Declare every node with the state fields it reads and writes
+        
+        The graph is derived from these declarations (see
+        workflows/registry.py): a new agent - say a CFO reading only
+        strategy_analysis - just needs its field in AgentState, an entry
+        here and its section in the report, and it runs in parallel with
+        the agents it doesn't depend on.
+        """
+        if self.structured:
+            # Downstream agents read the upstream briefs, not the prose
+            team = [
+                AgentSpec(
+                    "strategy_agent",
+                    reads=("startup_idea",),
+                    writes=("strategy_analysis", "strategy_brief"),
+                    run=self._run_structured_strategy,
+                    arun=self._arun_structured_strategy
+                ),
+                AgentSpec(
+                    "technical_agent",
+                    reads=("startup_idea", "strategy_brief"),
+                    writes=("technical_analysis", "technical_brief"),
+                    run=self._run_structured_technical,
+                    arun=self._arun_structured_technical
+                ),
+                AgentSpec(
+                    "marketing_agent",
+                    reads=("startup_idea", "strategy_brief", "technical_brief"),
+                    writes=("marketing_strategy", "marketing_brief"),
+                    run=self._run_structured_marketing,
+                    arun=self._arun_structured_marketing
+                ),
+            ]
+        elif self.pipelined:
+            # One node runs all three agents, overlapping their calls.
+            # It has no async version - ainvoke() runs it in a worker thread
+            team = [
+                AgentSpec(
+                    "pipelined_agents",
+                    reads=("startup_idea",),
+                    writes=("strategy_analysis", "technical_analysis", "marketing_strategy"),
+                    run=self._run_pipelined_agents
+                ),
+            ]
+        else:
+            # Agent nodes carry a sync and an async implementation, so the
+            # same graph serves both invoke()/stream() and ainvoke()
+            team = [
+                AgentSpec(
+                    "strategy_agent",
+                    reads=("startup_idea",),
+                    writes=("strategy_analysis",),
+                    run=self._run_strategy_agent,
+                    arun=self._arun_strategy_agent
+                ),
+                AgentSpec(
+                    "technical_agent",
+                    # Speculative mode: also reads the draft, which only needs the
+                    # idea - so the draft runs alongside the strategy
+                    reads=("startup_idea", "strategy_analysis")
+                    + (("technical_draft",) if self.speculative else ()),
+                    writes=("technical_analysis",),
+                    run=self._run_technical_agent,
+                    arun=self._arun_technical_agent
+                ),
+                AgentSpec(
+                    "marketing_agent",
+                    reads=("startup_idea", "strategy_analysis", "technical_analysis"),
+                    writes=("marketing_strategy",),
+                    run=self._run_marketing_agent,
+                    arun=self._arun_marketing_agent
+                ),
+            ]
+            if self.speculative:
+                team.append(AgentSpec(
+                    "technical_draft",
+                    reads=("startup_idea",),
+                    writes=("technical_draft",),
+                    run=self._run_technical_draft,
+                    arun=self._arun_technical_draft
+                ))
+        
+        return team + [
+            AgentSpec(
+                "compile_report",
+                reads=("startup_idea", "strategy_analysis", "technical_analysis", "marketing_strategy")
+                + (("strategy_brief", "technical_brief", "marketing_brief") if self.structured else ()),
+                writes=("final_report", "critical_path"),
+                run=self._compile_final_report
+            ),
+        ]
+    
     def _build_workflow(self) -> StateGraph:
         """
         Build the LangGraph workflow
         
         This defines:
         - What agents exist (nodes)
-        - What order they run in (edges)
+        - What order they run in (edges), derived from what each node reads
         - How they share information (state)
         """
         
         # Createing the graph with our state structure
         workflow = StateGraph(AgentState)
         
+        specs = self._agent_specs()
+        self.dependencies = derive_dependencies(specs, INPUT_FIELDS)
+        
         # Addng nodes (each agent is a node)
-        workflow.add_node("strategy_agent", self._run_strategy_agent)
-        workflow.add_node("technical_agent", self._run_technical_agent)
-        workflow.add_node("marketing_agent", self._run_marketing_agent)
-        workflow.add_node("compile_report", self._compile_final_report)
+        for spec in specs:
+            workflow.add_node(
+                spec.name,
+                RunnableLambda(spec.run, afunc=spec.arun) if spec.arun else spec.run
+            )
+        
+        # the flow (edges between nodes): Strategy → Technical → Marketing → Compile
+        needed_by_others = set()
+        for name, deps in self.dependencies.items():
+            if not deps:
+                workflow.set_entry_point(name)  # Start here
+            elif len(deps) == 1:
+                workflow.add_edge(next(iter(deps)), name)
+            else:
+                # Waits until all of them have finished
+                workflow.add_edge(sorted(deps), name)
+            needed_by_others |= deps
+        
+        for name in self.dependencies:
+            if name not in needed_by_others:
+                workflow.add_edge(name, END)
+        
+        return workflow.compile(checkpointer=self.checkpointer)
+    
+    def _collect_stream(self, field: str, tokens: Iterable[str]) -> str:
+        """
+        Consume an agent's token stream and return the full text
+        
+        Every token is also forwarded to the graph's custom stream so that
+        stream_analysis() callers can render it live. When the graph is run
+        with invoke() the writer is a no-op.
+        """
+        writer = get_stream_writer()
+        parts = []
+        
+        for token in tokens:
+            parts.append(token)
+            writer({"type": "token", "field": field, "text": token})
+        
+        return "".join(parts)
+    
+    def _node_metrics(self, node: str, started_at: float, calls: list, context_tokens_saved: int = 0) -> dict:
+        """
+        A node's timing and token usage, as its update to state["metrics"]
+        """
+        return {node: {**summarize_node(started_at, calls), "context_tokens_saved": context_tokens_saved}}
+    
+    def _agent_context(self, agent: str, upstream: dict) -> tuple:
+        """
+        Prepare upstream outputs for an agent's prompt: keep the sections
+        it consumes (CONSUMED_SECTIONS), then compress what is still over
+        its budget in CONTEXT_BUDGETS
+        
+        Args:
+            agent (str): "technical" or "marketing"
+            upstream (dict): {state field: text} the agent reads
+            
+        Returns:
+            tuple: ({state field: text to forward}, prompt tokens saved)
+        """
+        forwarded = {}
+        saved = 0
         
-        # the flow (edges between nodes)
-        workflow.set_entry_point("strategy_agent")  # Start here
-        workflow.add_edge("strategy_agent", "technical_agent")  # Strategy → Technical
-        workflow.add_edge("technical_agent", "marketing_agent")  # Technical → Marketing
-        workflow.add_edge("marketing_agent", "compile_report")  # Marketing → Compile
-        workflow.add_edge("compile_report", END)  # Compile → End
+        for field, text in upstream.items():
+            forwarded[field] = text
+            
+            sections = self.consumed_sections.get(agent, {}).get(field)
+            if self.select_sections and sections and text:
+                forwarded[field] = select_sections(forwarded[field], sections)
+            
+            budget = self.context_budgets.get((agent, field))
+            if self.compress_context and budget and text:
+                forwarded[field] = compress_text(forwarded[field], budget)
+            
+            saved += estimate_tokens(text) - estimate_tokens(forwarded[field])
         
-        return workflow.compile()
+        return forwarded, saved
     
-    def _run_strategy_agent(self, state: AgentState) -> AgentState:
+    def _run_strategy_agent(self, state: AgentState) -> dict:
         """
         Run the Strategy Agent (CEO)
         This is the FIRST agent to run
@@ -98,18 +426,44 @@ class StartupCoFounderWorkflow:
         print("\n🎯 Strategy Agent (CEO) is analyzing the business idea...")
         
         startup_idea = state["startup_idea"]
+        started_at = time.time()
         
-        strategy_analysis = self.strategy_agent.analyze_startup_idea(startup_idea)
-        
-        # Updateing state with results
-        state["strategy_analysis"] = strategy_analysis
-        state["current_step"] = "Strategy Complete"
+        with track_llm_calls() as calls:
+            strategy_analysis = self._collect_stream(
+                "strategy_analysis",
+                self.strategy_agent.analyze_startup_idea_stream(startup_idea)
+            )
         
         print("✅ Strategy analysis complete!")
         
-        return state
+        # Updateing state with results - nodes return only the fields they
+        # produced, so nodes running in parallel don't overwrite each other
+        return {
+            "strategy_analysis": strategy_analysis,
+            "current_step": "Strategy Complete",
+            "metrics": self._node_metrics("strategy_agent", started_at, calls)
+        }
     
-    def _run_technical_agent(self, state: AgentState) -> AgentState:
+    def _run_technical_draft(self, state: AgentState) -> dict:
+        """
+        Speculative mode: the Technical Agent's standalone plan, written
+        while the Strategy Agent is still working
+        """
+        print("\n📝 Technical Agent (CTO) is drafting a plan in parallel...")
+        
+        started_at = time.time()
+        
+        with track_llm_calls() as calls:
+            technical_draft = self.technical_agent.draft_technical_plan(state["startup_idea"])
+        
+        print("✅ Technical draft complete!")
+        
+        return {
+            "technical_draft": technical_draft,
+            "metrics": self._node_metrics("technical_draft", started_at, calls)
+        }
+    
+    def _run_technical_agent(self, state: AgentState) -> dict:
         """
         Run the Technical Agent (CTO)
         This agent READS the strategy analysis
@@ -118,23 +472,41 @@ class StartupCoFounderWorkflow:
         print("   (Reading strategy analysis...)")
         
         startup_idea = state["startup_idea"]
-        strategy_context = state["strategy_analysis"]
+        technical_draft = state.get("technical_draft")
         
-        # collaboration!
-        technical_analysis = self.technical_agent.analyze_technical_requirements(
-            startup_idea,
-            strategy_context  # ← This is the key! Passing strategy to tech agent
+        started_at = time.time()
+        context, saved = self._agent_context(
+            "technical", {"strategy_analysis": state["strategy_analysis"]}
         )
+        strategy_context = context["strategy_analysis"]
         
-        # Updateing state
-        state["technical_analysis"] = technical_analysis
-        state["current_step"] = "Technical Complete"
+        # collaboration!
+        with track_llm_calls() as calls:
+            if technical_draft:
+                # Speculative mode: keep the draft, add how the strategy changes it
+                tokens = itertools.chain(
+                    [technical_draft, "\n\n"],
+                    self.technical_agent.reconcile_technical_draft_stream(
+                        startup_idea, strategy_context, technical_draft
+                    )
+                )
+            else:
+                tokens = self.technical_agent.analyze_technical_requirements_stream(
+                    startup_idea,
+                    strategy_context  # ← This is the key! Passing strategy to tech agent
+                )
+            technical_analysis = self._collect_stream("technical_analysis", tokens)
         
         print("✅ Technical plan complete!")
         
-        return state
+        # Updateing state
+        return {
+            "technical_analysis": technical_analysis,
+            "current_step": "Technical Complete",
+            "metrics": self._node_metrics("technical_agent", started_at, calls, saved)
+        }
     
-    def _run_marketing_agent(self, state: AgentState) -> AgentState:
+    def _run_marketing_agent(self, state: AgentState) -> dict:
         """
         Run the Marketing Agent (CMO)
         This agent READS both strategy and technical analyses
@@ -143,29 +515,418 @@ class StartupCoFounderWorkflow:
         print("   (Reading strategy and technical analyses...)")
         
         startup_idea = state["startup_idea"]
-        strategy_context = state["strategy_analysis"]
-        technical_context = state["technical_analysis"]
+        
+        started_at = time.time()
+        context, saved = self._agent_context("marketing", {
+            "strategy_analysis": state["strategy_analysis"],
+            "technical_analysis": state["technical_analysis"]
+        })
+        strategy_context = context["strategy_analysis"]
+        technical_context = context["technical_analysis"]
         
         # full collaboration
-        marketing_strategy = self.marketing_agent.create_marketing_strategy(
-            startup_idea,
-            strategy_context,   # ← From CEO
-            technical_context   # ← From CTO
-        )
+        with track_llm_calls() as calls:
+            marketing_strategy = self._collect_stream(
+                "marketing_strategy",
+                self.marketing_agent.create_marketing_strategy_stream(
+                    startup_idea,
+                    strategy_context,   # ← From CEO
+                    technical_context   # ← From CTO
+                )
+            )
+        
+        print("✅ Marketing strategy complete!")
         
         # Updateing state
-        state["marketing_strategy"] = marketing_strategy
-        state["current_step"] = "Marketing Complete"
+        return {
+            "marketing_strategy": marketing_strategy,
+            "current_step": "Marketing Complete",
+            "metrics": self._node_metrics("marketing_agent", started_at, calls, saved)
+        }
+    
+    def _brief_update(self, node: str, field: str, brief, started_at: float, calls: list) -> dict:
+        """
+        A structured node's update: the brief itself plus its markdown
+        rendering, which the UI and report show
+        
+        No context_tokens_saved here - the prose an unstructured run would
+        have forwarded was never written, so there is nothing to measure
+        the brief against.
+        """
+        return {
+            field: brief.to_markdown(),
+            node.replace("_agent", "_brief"): brief.model_dump(),
+            "metrics": self._node_metrics(node, started_at, calls)
+        }
+    
+    @staticmethod
+    def _brief_context(schema: type, state: AgentState, brief_field: str) -> str:
+        """
+        The compact JSON of an upstream brief for a downstream prompt
+        """
+        return schema.model_validate(state[brief_field]).to_context()
+    
+    def _run_structured_strategy(self, state: AgentState) -> dict:
+        """
+        Structured mode: the Strategy Agent's analysis as a StrategyBrief
+        """
+        print("\n🎯 Strategy Agent (CEO) is analyzing the business idea (structured)...")
+        
+        started_at = time.time()
+        
+        with track_llm_calls() as calls:
+            brief = self.strategy_agent.analyze_startup_idea_structured(state["startup_idea"])
+        
+        print("✅ Strategy analysis complete!")
+        
+        update = self._brief_update("strategy_agent", "strategy_analysis", brief, started_at, calls)
+        self._collect_stream("strategy_analysis", [update["strategy_analysis"]])
+        return {**update, "current_step": "Strategy Complete"}
+    
+    def _run_structured_technical(self, state: AgentState) -> dict:
+        """
+        Structured mode: the Technical Agent reads the strategy brief
+        """
+        print("\n💻 Technical Agent (CTO) is creating the technical plan (structured)...")
+        
+        started_at = time.time()
+        strategy_brief = self._brief_context(StrategyBrief, state, "strategy_brief")
+        
+        with track_llm_calls() as calls:
+            brief = self.technical_agent.analyze_technical_requirements_structured(
+                state["startup_idea"], strategy_brief
+            )
+        
+        print("✅ Technical plan complete!")
+        
+        update = self._brief_update("technical_agent", "technical_analysis", brief, started_at, calls)
+        self._collect_stream("technical_analysis", [update["technical_analysis"]])
+        return {**update, "current_step": "Technical Complete"}
+    
+    def _run_structured_marketing(self, state: AgentState) -> dict:
+        """
+        Structured mode: the Marketing Agent reads both briefs
+        """
+        print("\n📢 Marketing Agent (CMO) is developing the marketing strategy (structured)...")
+        
+        started_at = time.time()
+        strategy_brief = self._brief_context(StrategyBrief, state, "strategy_brief")
+        technical_brief = self._brief_context(TechnicalBrief, state, "technical_brief")
+        
+        with track_llm_calls() as calls:
+            brief = self.marketing_agent.create_marketing_strategy_structured(
+                state["startup_idea"], strategy_brief, technical_brief
+            )
+        
+        print("✅ Marketing strategy complete!")
+        
+        update = self._brief_update("marketing_agent", "marketing_strategy", brief, started_at, calls)
+        self._collect_stream("marketing_strategy", [update["marketing_strategy"]])
+        return {**update, "current_step": "Marketing Complete"}
+    
+    def _run_pipelined_agents(self, state: AgentState) -> dict:
+        """
+        Pipelined mode: run all three agents with overlapping calls
+        
+        The strategy streams in this thread. The Technical and Marketing
+        agents each wait in a worker thread until the sections they need
+        (self.pipeline_triggers) are complete, then start with the finished
+        sections as their context. If the expected headings never appear,
+        an agent simply waits for the full upstream answer.
+        """
+        print("\n⚡ Pipelined mode: agents start as soon as their inputs are ready...")
+        
+        startup_idea = state["startup_idea"]
+        writer = get_stream_writer()
+        node_started_at = time.time()
+        
+        # Shared between the threads, guarded by `changed`
+        outputs = {"strategy_analysis": "", "technical_analysis": "", "marketing_strategy": ""}
+        finished = set()
+        metrics = {}
+        failed = []
+        changed = threading.Condition()
+        
+        def produce(node: str, field: str, tokens: Iterable[str], saved: int = 0) -> None:
+            started_at = time.time()
+            try:
+                with track_llm_calls() as calls:
+                    for token in tokens:
+                        with changed:
+                            outputs[field] += token
+                            changed.notify_all()
+                        writer({"type": "token", "field": field, "text": token})
+            except Exception as e:
+                with changed:
+                    failed.append(e)
+                    changed.notify_all()
+                raise
+            
+            with changed:
+                finished.add(field)
+                metrics.update(self._node_metrics(node, started_at, calls, saved))
+                changed.notify_all()
+        
+        def wait_for(agent: str) -> dict:
+            # Returns ({upstream field: complete sections so far}, tokens saved)
+            triggers = self.pipeline_triggers[agent]
+            with changed:
+                changed.wait_for(lambda: failed or all(
+                    sections_complete(outputs[field], headings, field in finished)
+                    for field, headings in triggers.items()
+                ))
+                if failed:
+                    raise RuntimeError("Upstream agent failed") from failed[0]
+                upstream = {
+                    field: completed_text(outputs[field], field in finished)
+                    for field in ("strategy_analysis", "technical_analysis")
+                }
+            return self._agent_context(agent, upstream)
+        
+        def run_technical() -> None:
+            context, saved = wait_for("technical")
+            print("   💻 Technical Agent (CTO) starting...")
+            produce(
+                "technical_agent", "technical_analysis",
+                self.technical_agent.analyze_technical_requirements_stream(
+                    startup_idea, context["strategy_analysis"]
+                ),
+                saved
+            )
+        
+        def run_marketing() -> None:
+            context, saved = wait_for("marketing")
+            print("   📢 Marketing Agent (CMO) starting...")
+            produce(
+                "marketing_agent", "marketing_strategy",
+                self.marketing_agent.create_marketing_strategy_stream(
+                    startup_idea, context["strategy_analysis"], context["technical_analysis"]
+                ),
+                saved
+            )
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # copy_context: the workers see the same context variables as this node
+            downstream = [
+                executor.submit(contextvars.copy_context().run, run_technical),
+                executor.submit(contextvars.copy_context().run, run_marketing),
+            ]
+            # If the strategy fails, produce() wakes the waiting workers up
+            # so they give up instead of blocking the executor's shutdown
+            produce(
+                "strategy_agent", "strategy_analysis",
+                self.strategy_agent.analyze_startup_idea_stream(startup_idea)
+            )
+            
+            for future in downstream:
+                future.result()
+        
+        print("✅ Pipelined agents complete!")
+        
+        # The agents' own entries show the overlap; this one the node as a whole
+        metrics["pipelined_agents"] = summarize_node(node_started_at, [])
+        
+        return {
+            **outputs,
+            "current_step": "Marketing Complete",
+            "metrics": metrics
+        }
+    
+    async def _arun_strategy_agent(self, state: AgentState) -> dict:
+        """
+        Async version of _run_strategy_agent
+        """
+        print("\n🎯 Strategy Agent (CEO) is analyzing the business idea...")
+        
+        started_at = time.time()
+        
+        with track_llm_calls() as calls:
+            strategy_analysis = await self.strategy_agent.aanalyze_startup_idea(
+                state["startup_idea"]
+            )
+        
+        print("✅ Strategy analysis complete!")
+        
+        return {
+            "strategy_analysis": strategy_analysis,
+            "current_step": "Strategy Complete",
+            "metrics": self._node_metrics("strategy_agent", started_at, calls)
+        }
+    
+    async def _arun_technical_draft(self, state: AgentState) -> dict:
+        """
+        Async version of _run_technical_draft
+        """
+        print("\n📝 Technical Agent (CTO) is drafting a plan in parallel...")
+        
+        started_at = time.time()
+        
+        with track_llm_calls() as calls:
+            technical_draft = await self.technical_agent.adraft_technical_plan(state["startup_idea"])
+        
+        print("✅ Technical draft complete!")
+        
+        return {
+            "technical_draft": technical_draft,
+            "metrics": self._node_metrics("technical_draft", started_at, calls)
+        }
+    
+    async def _arun_technical_agent(self, state: AgentState) -> dict:
+        """
+        Async version of _run_technical_agent
+        """
+        print("\n💻 Technical Agent (CTO) is creating the technical plan...")
+        
+        technical_draft = state.get("technical_draft")
+        started_at = time.time()
+        context, saved = self._agent_context(
+            "technical", {"strategy_analysis": state["strategy_analysis"]}
+        )
+        
+        with track_llm_calls() as calls:
+            if technical_draft:
+                alignment = await self.technical_agent.areconcile_technical_draft(
+                    state["startup_idea"],
+                    context["strategy_analysis"],
+                    technical_draft
+                )
+                technical_analysis = f"{technical_draft}\n\n{alignment}"
+            else:
+                technical_analysis = await self.technical_agent.aanalyze_technical_requirements(
+                    state["startup_idea"],
+                    context["strategy_analysis"]
+                )
+        
+        print("✅ Technical plan complete!")
+        
+        return {
+            "technical_analysis": technical_analysis,
+            "current_step": "Technical Complete",
+            "metrics": self._node_metrics("technical_agent", started_at, calls, saved)
+        }
+    
+    async def _arun_marketing_agent(self, state: AgentState) -> dict:
+        """
+        Async version of _run_marketing_agent
+        """
+        print("\n📢 Marketing Agent (CMO) is developing the marketing strategy...")
+        
+        started_at = time.time()
+        context, saved = self._agent_context("marketing", {
+            "strategy_analysis": state["strategy_analysis"],
+            "technical_analysis": state["technical_analysis"]
+        })
+        
+        with track_llm_calls() as calls:
+            marketing_strategy = await self.marketing_agent.acreate_marketing_strategy(
+                state["startup_idea"],
+                context["strategy_analysis"],
+                context["technical_analysis"]
+            )
+        
+        print("✅ Marketing strategy complete!")
+        
+        return {
+            "marketing_strategy": marketing_strategy,
+            "current_step": "Marketing Complete",
+            "metrics": self._node_metrics("marketing_agent", started_at, calls, saved)
+        }
+    
+    async def _arun_structured_strategy(self, state: AgentState) -> dict:
+        """
+        Async version of _run_structured_strategy
+        """
+        print("\n🎯 Strategy Agent (CEO) is analyzing the business idea (structured)...")
+        
+        started_at = time.time()
+        
+        with track_llm_calls() as calls:
+            brief = await self.strategy_agent.aanalyze_startup_idea_structured(state["startup_idea"])
+        
+        print("✅ Strategy analysis complete!")
+        
+        return {
+            **self._brief_update("strategy_agent", "strategy_analysis", brief, started_at, calls),
+            "current_step": "Strategy Complete"
+        }
+    
+    async def _arun_structured_technical(self, state: AgentState) -> dict:
+        """
+        Async version of _run_structured_technical
+        """
+        print("\n💻 Technical Agent (CTO) is creating the technical plan (structured)...")
+        
+        started_at = time.time()
+        strategy_brief = self._brief_context(StrategyBrief, state, "strategy_brief")
+        
+        with track_llm_calls() as calls:
+            brief = await self.technical_agent.aanalyze_technical_requirements_structured(
+                state["startup_idea"], strategy_brief
+            )
+        
+        print("✅ Technical plan complete!")
+        
+        return {
+            **self._brief_update("technical_agent", "technical_analysis", brief, started_at, calls),
+            "current_step": "Technical Complete"
+        }
+    
+    async def _arun_structured_marketing(self, state: AgentState) -> dict:
+        """
+        Async version of _run_structured_marketing
+        """
+        print("\n📢 Marketing Agent (CMO) is developing the marketing strategy (structured)...")
+        
+        started_at = time.time()
+        strategy_brief = self._brief_context(StrategyBrief, state, "strategy_brief")
+        technical_brief = self._brief_context(TechnicalBrief, state, "technical_brief")
+        
+        with track_llm_calls() as calls:
+            brief = await self.marketing_agent.acreate_marketing_strategy_structured(
+                state["startup_idea"], strategy_brief, technical_brief
+            )
         
         print("✅ Marketing strategy complete!")
         
-        return state
+        return {
+            **self._brief_update("marketing_agent", "marketing_strategy", brief, started_at, calls),
+            "current_step": "Marketing Complete"
+        }
     
-    def _compile_final_report(self, state: AgentState) -> AgentState:
+    @staticmethod
+    def _next_steps(state: AgentState) -> str:
+        """
+        The report's action items - taken from the briefs in structured
+        mode, a generic plan otherwise
+        """
+        if not state.get("marketing_brief"):
+            return """Based on the collaborative analysis above, here are the immediate priorities:
+
+1. **Week 1-2**: Validate assumptions with target customers (from Strategy)
+2. **Week 3-4**: Set up technical infrastructure (from Technical)
+3. **Week 4-6**: Begin pre-launch marketing activities (from Marketing)
+4. **Month 2**: Start MVP development
+5. **Month 3**: Beta testing and launch preparation"""
+        
+        strategy = StrategyBrief.model_validate(state["strategy_brief"])
+        technical = TechnicalBrief.model_validate(state["technical_brief"])
+        marketing = MarketingBrief.model_validate(state["marketing_brief"])
+        
+        lines = ["**Business priorities** (from Strategy)"]
+        lines += [f"{i}. {step}" for i, step in enumerate(strategy.next_steps, 1)]
+        lines += ["", "**Build plan** (from Technical)"]
+        lines += [f"- **{phase.name}** ({phase.timeline}): {', '.join(phase.deliverables)}" for phase in technical.roadmap]
+        lines += ["", "**Go-to-market** (from Marketing)"]
+        lines += [f"- **{phase.name}** ({phase.timeline}): {', '.join(phase.deliverables)}" for phase in marketing.timeline]
+        lines += ["", "**Track**: " + ", ".join(marketing.kpis)]
+        return "\n".join(lines)
+    
+    def _compile_final_report(self, state: AgentState) -> dict:
         """
         Compile all agent outputs into one unified report
         """
         print("\n📊 Compiling final comprehensive report...")
+        started_at = time.time()
         
         final_report = f"""
 # 🚀 COMPREHENSIVE STARTUP ANALYSIS
@@ -201,36 +962,87 @@ class StartupCoFounderWorkflow:
 
 ## ✅ NEXT STEPS & ACTION ITEMS
 
-Based on the collaborative analysis above, here are the immediate priorities:
-
-1. **Week 1-2**: Validate assumptions with target customers (from Strategy)
-2. **Week 3-4**: Set up technical infrastructure (from Technical)
-3. **Week 4-6**: Begin pre-launch marketing activities (from Marketing)
-4. **Month 2**: Start MVP development
-5. **Month 3**: Beta testing and launch preparation
+{self._next_steps(state)}
 
 ---
 
 *This report was generated by a multi-agent AI system where each agent built upon the insights of previous agents to create a cohesive, unified strategy.*
 """
         
+        print("✅ Final report compiled!")
+        
         # Updateing state with final report
-        state["final_report"] = final_report
-        state["current_step"] = "Complete"
+        metrics = self._node_metrics("compile_report", started_at, [])
+        return {
+            "final_report": final_report,
+            "critical_path": critical_path(self.dependencies, {**state["metrics"], **metrics}),
+            "current_step": "Complete",
+            "metrics": metrics
+        }
+    
+    def _initial_state(self, startup_idea: str, run_id: str) -> AgentState:
+        """
+        Build the empty state a new run starts from
+        """
+        return {
+            "run_id": run_id,
+            "startup_idea": startup_idea,
+            "strategy_analysis": "",
+            "technical_analysis": "",
+            "marketing_strategy": "",
+            "technical_draft": "",
+            "strategy_brief": {},
+            "technical_brief": {},
+            "marketing_brief": {},
+            "final_report": "",
+            "critical_path": {},
+            "current_step": "Starting",
+            "metrics": {}
+        }
+    
+    def _print_metrics(self, state: AgentState) -> None:
+        """
+        Print where the time and tokens of a run went, node by node,
+        and the chain of nodes that determined the total time
+        """
+        print(f"\n{'Node':<18}{'Time (s)':>10}{'TTFT (s)':>10}{'Prompt tok':>12}{'Cached tok':>12}{'Output tok':>12}")
+        for node, m in state["metrics"].items():
+            ttft = m["ttft_s"] if m["ttft_s"] is not None else "-"
+            cached = m.get("cached_prompt_tokens", 0)
+            print(f"{node:<18}{m['duration_s']:>10}{ttft:>10}{m['prompt_tokens']:>12}{cached:>12}{m['completion_tokens']:>12}")
         
-        print("✅ Final report compiled!")
+        prompt_tokens = sum(m["prompt_tokens"] for m in state["metrics"].values())
+        cached = sum(m.get("cached_prompt_tokens", 0) for m in state["metrics"].values())
+        if cached:
+            print(f"\nProvider prompt cache served {cached / prompt_tokens:.0%} of prompt tokens")
+        
+        saved = sum(m.get("context_tokens_saved", 0) for m in state["metrics"].values())
+        if saved:
+            print(f"\nContext selection and compression saved ~{saved} prompt tokens")
         
-        return state
+        path = state.get("critical_path")
+        if path:
+            print(f"\nCritical path: {' → '.join(path['nodes'])} ({path['duration_s']}s)")
+        print("="*70 + "\n")
     
-    def analyze_startup(self, startup_idea: str) -> dict:
+    def _run_config(self, run_id: str) -> dict:
+        """
+        LangGraph config that stores a run's checkpoints under its id
+        """
+        return {"configurable": {"thread_id": run_id}}
+    
+    def analyze_startup(self, startup_idea: str, run_id: str = None) -> dict:
         """
         Main method to run the complete multi-agent workflow
         
         Args:
             startup_idea (str): The startup idea to analyze
+            run_id (str): Id to save the run's progress under (generated
+                if not given, returned as result["run_id"])
             
         Returns:
-            dict: Complete analysis with all agent outputs
+            dict: Complete analysis with all agent outputs, plus
+            "metrics" with per-node timing and token usage
         """
         
         print("\n" + "="*70)
@@ -239,21 +1051,232 @@ Based on the collaborative analysis above, here are the immediate priorities:
         print(f"\n💡 Analyzing: {startup_idea[:100]}...")
         print("\n" + "="*70)
         
-        initial_state = {
-            "startup_idea": startup_idea,
-            "strategy_analysis": "",
-            "technical_analysis": "",
-            "marketing_strategy": "",
-            "final_report": "",
-            "current_step": "Starting"
-        }
+        run_id = run_id or uuid.uuid4().hex
+        initial_state = self._initial_state(startup_idea, run_id)
         
         # This executes: Strategy → Technical → Marketing → Compile
-        final_state = self.workflow.invoke(initial_state)
+        final_state = self.workflow.invoke(initial_state, self._run_config(run_id))
         
         print("\n" + "="*70)
         print("✅ ANALYSIS COMPLETE!")
-        print("="*70 + "\n")
+        print("="*70)
+        self._print_metrics(final_state)
+        
+        return final_state
+    
+    async def aanalyze_startup(self, startup_idea: str, run_id: str = None) -> dict:
+        """
+        Async version of analyze_startup
+        
+        Many analyses can run concurrently on one event loop, e.g.
+        await asyncio.gather(*(workflow.aanalyze_startup(idea) for idea in ideas))
+        
+        Args:
+            startup_idea (str): The startup idea to analyze
+            run_id (str): Id to save the run's progress under
+            
+        Returns:
+            dict: Complete analysis with all agent outputs
+        """
+        
+        print(f"\n💡 Analyzing: {startup_idea[:100]}...")
+        
+        run_id = run_id or uuid.uuid4().hex
+        final_state = await self.workflow.ainvoke(
+            self._initial_state(startup_idea, run_id),
+            self._run_config(run_id)
+        )
+        
+        print(f"✅ Analysis complete: {startup_idea[:50]}...")
+        
+        return final_state
+    
+    def stream_analysis(self, startup_idea: str, run_id: str = None) -> Iterator[dict]:
+        """
+        Run the complete workflow and yield output while the agents write it
+        
+        Args:
+            startup_idea (str): The startup idea to analyze
+            run_id (str): Id to save the run's progress under, so a failed
+                run can be continued with resume(run_id)
+            
+        Yields:
+            dict: Events of the form
+                {"type": "token", "field": "strategy_analysis", "text": "..."}
+                for every generated fragment,
+                {"type": "node_complete", "node": "strategy_agent", "update": {...}}
+                as soon as each of strategy_agent, technical_agent,
+                marketing_agent and compile_report finishes, and finally
+                {"type": "complete", "result": <same dict as analyze_startup>}
+        """
+        
+        final_state = None
+        run_id = run_id or uuid.uuid4().hex
+        
+        for mode, chunk in self.workflow.stream(
+            self._initial_state(startup_idea, run_id),
+            self._run_config(run_id),
+            stream_mode=["custom", "updates", "values"]
+        ):
+            if mode == "custom":
+                yield chunk
+            elif mode == "updates":
+                # One entry per node that finished in this step
+                for node, update in chunk.items():
+                    yield {"type": "node_complete", "node": node, "update": update}
+            else:
+                final_state = chunk
+        
+        yield {"type": "complete", "result": final_state}
+    
+    def quick_scan(self, startup_idea: str) -> dict:
+        """
+        Triage an idea in a few seconds before committing to the full analysis
+        
+        Runs the agents' short-form methods on the raw idea, all at the same
+        time - they don't read each other's output.
+        
+        Args:
+            startup_idea (str): The startup idea to scan
+            
+        Returns:
+            dict: "strategy_feedback", "tech_assessment", "launch_campaign",
+            a combined "quick_report" and per-agent "metrics"
+        """
+        print(f"\n⚡ Quick scan: {startup_idea[:100]}...")
+        
+        # output field -> (metrics name, short-form method)
+        quick_methods = {
+            "strategy_feedback": ("strategy_quick", self.strategy_agent.get_quick_feedback),
+            "tech_assessment": ("technical_quick", self.technical_agent.quick_tech_assessment),
+            "launch_campaign": ("marketing_quick", self.marketing_agent.create_launch_campaign),
+        }
+        
+        def run(method):
+            started_at = time.time()
+            with track_llm_calls() as calls:
+                output = method(startup_idea)
+            return output, summarize_node(started_at, calls)
+        
+        with ThreadPoolExecutor(max_workers=len(quick_methods)) as executor:
+            futures = {
+                field: executor.submit(contextvars.copy_context().run, run, method)
+                for field, (_, method) in quick_methods.items()
+            }
+            outputs = {field: future.result() for field, future in futures.items()}
+        
+        result = {"startup_idea": startup_idea}
+        result.update({field: output for field, (output, _) in outputs.items()})
+        result["metrics"] = {
+            quick_methods[field][0]: node_metrics for field, (_, node_metrics) in outputs.items()
+        }
+        result["quick_report"] = f"""
+# ⚡ QUICK SCAN
+
+## 📋 STARTUP IDEA
+{startup_idea}
+
+## 🎯 Strategic Feedback (CEO)
+{result["strategy_feedback"]}
+
+## 💻 Technical Assessment (CTO)
+{result["tech_assessment"]}
+
+## 📢 Launch Campaign Sketch (CMO)
+{result["launch_campaign"]}
+
+---
+
+*Quick triage only - run the full analysis for the complete, collaborative plan.*
+"""
+        
+        print("✅ Quick scan complete!")
+        self._print_metrics(result)
+        
+        return result
+    
+    def resume(self, run_id: str) -> dict:
+        """
+        Continue a saved run from its last completed node
+        
+        Agents that already finished are not called again - e.g. if the
+        marketing call failed, only marketing and the report are run. In
+        pipelined mode the agents share one node, so all three run again.
+        
+        Args:
+            run_id (str): Id the run was started with
+            
+        Returns:
+            dict: Complete analysis, same shape as analyze_startup
+        """
+        config = self._run_config(run_id)
+        snapshot = self.workflow.get_state(config)
+        
+        if not snapshot.values:
+            raise ValueError(f"No saved run with id {run_id}")
+        
+        if not snapshot.next:
+            print(f"✅ Run {run_id} is already complete")
+            return snapshot.values
+        
+        print(f"\n🔁 Resuming run {run_id} at: {', '.join(snapshot.next)}")
+        if "pipelined_agents" in snapshot.next:
+            # Nothing of a failed pipelined node was saved
+            print("⚠️ Pipelined mode keeps no partial progress - all three agents run again")
+        
+        # None input = continue from the saved checkpoint
+        final_state = self.workflow.invoke(None, config)
+        
+        print("\n✅ RESUMED RUN COMPLETE!")
+        self._print_metrics(final_state)
+        
+        return final_state
+    
+    def regenerate(self, run_id: str, agent: str = "marketing") -> dict:
+        """
+        Re-run one agent of a finished run, plus the agents that read its output
+        
+        Earlier agents are not called again - their saved output is reused.
+        Regenerating "marketing" costs one agent call instead of three.
+        
+        Args:
+            run_id (str): Id of the run to regenerate part of
+            agent (str): "strategy", "technical" or "marketing"
+            
+        Returns:
+            dict: Complete analysis, same shape as analyze_startup
+        """
+        if agent not in AGENT_NODES:
+            raise ValueError(f"Unknown agent {agent!r}, expected one of {', '.join(AGENT_NODES)}")
+        if self.pipelined:
+            raise ValueError("Single agents can't be regenerated in pipelined mode - all three share one graph node")
+        
+        node = AGENT_NODES[agent]
+        
+        # The saved checkpoint taken just before the node ran holds all
+        # upstream outputs; continuing from it forks the run at that node
+        fork = next(
+            (snapshot for snapshot in self.workflow.get_state_history(self._run_config(run_id))
+             if node in snapshot.next),
+            None
+        )
+        if fork is None:
+            raise ValueError(f"No saved run with id {run_id} that reached {node}")
+        
+        print(f"\n🔄 Regenerating {agent} for run {run_id}...")
+        
+        config = fork.config
+        if agent == "technical" and fork.values.get("technical_draft"):
+            # Speculative mode would only append an alignment note to the
+            # old draft - without it the node writes a whole new plan
+            config = self.workflow.update_state(config, {"technical_draft": ""}, as_node="technical_draft")
+        
+        # The prompt is unchanged, so skip the response cache to get a new answer
+        with fresh_llm_responses():
+            final_state = self.workflow.invoke(None, config)
+        
+        print("\n✅ REGENERATION COMPLETE!")
+        self._print_metrics(final_state)
         
         return final_state
 
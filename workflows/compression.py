@@ -0,0 +1,119 @@
+"""
+Context Compression - Shrink an agent's output before the next agent reads it
+Extractive and local (no LLM call): sentences are scored by how many of
+the document's frequent content words they carry, and the best ones are
+kept, in their original order, until the token budget is used up.
+Markdown headings are kept for every section that keeps a sentence.
+"""
+
+import math
+import re
+from collections import Counter
+
+from agents.rate_limiter import CHARS_PER_TOKEN
+
+HEADING = re.compile(r"^\s*#{1,6}\s")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9*\"'(])")
+WORD = re.compile(r"[a-z][a-z0-9'-]+")
+FIGURE = re.compile(r"[$€£%]|\d")
+
+STOPWORDS = set("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers him his how i if in into is
+it its itself just let me more most my no nor not now of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then
+there these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count, same ratio the rate limiter uses
+    """
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _split_units(text: str) -> list:
+    """
+    Break text into (line index, kind, text) units: one per heading,
+    one per sentence of every other non-empty line
+    """
+    units = []
+    for line_index, line in enumerate(text.splitlines()):
+        if not line.strip():
+            continue
+        if HEADING.match(line):
+            units.append((line_index, "heading", line.strip()))
+            continue
+        for sentence in SENTENCE_END.split(line.strip()):
+            if sentence:
+                units.append((line_index, "sentence", sentence))
+    return units
+
+
+def compress_text(text: str, max_tokens: int) -> str:
+    """
+    Keep the most informative sentences of `text` within `max_tokens`
+
+    A sentence scores the average document frequency of its content
+    words; the first sentence of a section and sentences with figures
+    (prices, percentages, timelines) get a bonus.
+
+    Args:
+        text (str): Agent output to forward
+        max_tokens (int): Budget for the compressed text
+
+    Returns:
+        str: `text` unchanged if it fits, else the selected sentences
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    units = _split_units(text)
+    frequencies = Counter(
+        word for _, kind, unit in units if kind == "sentence"
+        for word in WORD.findall(unit.lower()) if word not in STOPWORDS
+    )
+
+    # Score sentences, remembering which section (heading unit) they belong to
+    scored = []
+    section = None
+    first_in_section = True
+    for index, (_, kind, unit) in enumerate(units):
+        if kind == "heading":
+            section = index
+            first_in_section = True
+            continue
+
+        words = [word for word in WORD.findall(unit.lower()) if word not in STOPWORDS]
+        score = sum(frequencies[word] for word in words) / math.sqrt(len(words)) if words else 0.0
+        if first_in_section:
+            score *= 1.5
+        if FIGURE.search(unit):
+            score *= 1.2
+        scored.append((score, index, section))
+        first_in_section = False
+
+    # Greedy: best sentences first, paying for a section's heading with its first sentence
+    keep = set()
+    budget = max_tokens * CHARS_PER_TOKEN
+    for score, index, section in sorted(scored, reverse=True):
+        cost = len(units[index][2]) + 1
+        if section is not None and section not in keep:
+            cost += len(units[section][2]) + 1
+        if cost > budget:
+            continue
+        keep.add(index)
+        if section is not None:
+            keep.add(section)
+        budget -= cost
+
+    # Rebuild in the original order, sentences of one line joined back together
+    lines = {}
+    for index in sorted(keep):
+        line_index, _, unit = units[index]
+        lines.setdefault(line_index, []).append(unit)
+
+    return "\n".join(" ".join(parts) for _, parts in sorted(lines.items()))
@@ -0,0 +1,222 @@
+"""
+Background Jobs - Analyses that run outside the Streamlit script thread
+A session submits its analysis and gets a job id back; a bounded worker
+pool runs the workflow and keeps the job's status and partial output
+up to date, so the page only polls. Reruns of the session (any widget
+click) no longer interrupt the work, and however many users click
+Analyze, at most `max_workers` analyses run at once - the rest queue.
+Resuming a failed run and regenerating one agent's section go through
+the same pool.
+"""
+
+import contextvars
+import copy
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from workflows.collaboration import OUTPUT_FIELDS
+
+load_dotenv()
+
+FINISHED = ("complete", "failed")
+
+
+@dataclass
+class AnalysisJob:
+    """
+    One submitted job, as its worker last left it
+    """
+    job_id: str
+    run_id: str                       # checkpoint id - a failed job can be resumed with it
+    kind: str = "analysis"            # analysis | resume | regenerate
+    startup_idea: str = ""            # analysis jobs only
+    agent: Optional[str] = None       # regenerate jobs only: "strategy", "technical" or "marketing"
+    status: str = "queued"            # queued -> running -> complete | failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    completed_nodes: list = field(default_factory=list)
+    live_text: dict = field(default_factory=dict)      # state field -> text written so far (analysis jobs, filled in by get())
+    live_chunks: dict = field(default_factory=dict)    # state field -> fragments the worker has appended
+    finished_fields: set = field(default_factory=set)  # fields whose node has finished
+    result: Optional[dict] = None
+    error: Optional[Exception] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED
+
+
+class JobManager:
+    """
+    Runs analyses of one shared workflow on a bounded thread pool
+
+    Finished jobs are kept until `keep_finished` newer ones have finished,
+    so a session that comes back late still finds its result.
+    """
+
+    def __init__(self, workflow, max_workers: int = None, keep_finished: int = 200):
+        """
+        Args:
+            workflow: The StartupCoFounderWorkflow the jobs run on
+            max_workers (int): Analyses running at once (default:
+                ANALYSIS_WORKERS or 4)
+            keep_finished (int): Finished jobs remembered before the oldest
+                are dropped
+        """
+        self.workflow = workflow
+        self.max_workers = max_workers or int(os.getenv("ANALYSIS_WORKERS", "4"))
+        self.keep_finished = keep_finished
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="analysis")
+        self._jobs = OrderedDict()  # job id -> AnalysisJob, in submission order
+        self._lock = threading.Lock()
+
+    def submit(self, startup_idea: str) -> str:
+        """
+        Queue a full analysis
+
+        The worker runs in a copy of the caller's context, so blocks like
+        track_llm_calls() around submit() still see the job's LLM calls.
+
+        Returns:
+            str: Job id to poll with get()
+        """
+        return self._submit(AnalysisJob(job_id=uuid.uuid4().hex, run_id=uuid.uuid4().hex, startup_idea=startup_idea))
+
+    def submit_resume(self, run_id: str) -> str:
+        """
+        Queue the rest of a saved run that stopped part-way
+
+        Returns:
+            str: Job id to poll with get()
+        """
+        return self._submit(AnalysisJob(job_id=uuid.uuid4().hex, run_id=run_id, kind="resume"))
+
+    def submit_regenerate(self, run_id: str, agent: str) -> str:
+        """
+        Queue a new version of one agent's section of a finished run
+
+        Returns:
+            str: Job id to poll with get()
+        """
+        return self._submit(AnalysisJob(job_id=uuid.uuid4().hex, run_id=run_id, kind="regenerate", agent=agent))
+
+    def _submit(self, job: AnalysisJob) -> str:
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+
+        context = contextvars.copy_context()
+        self._pool.submit(context.run, self._run, job)
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """
+        A snapshot of the job, safe to read while the worker carries on
+
+        Returns:
+            AnalysisJob or None if the id is unknown (or long finished)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = copy.copy(job)
+            snapshot.completed_nodes = list(job.completed_nodes)
+            snapshot.live_chunks = {name: list(chunks) for name, chunks in job.live_chunks.items()}
+            snapshot.finished_fields = set(job.finished_fields)
+
+        # Joined outside the lock - the worker keeps appending meanwhile
+        snapshot.live_text = {name: "".join(chunks) for name, chunks in snapshot.live_chunks.items()}
+        return snapshot
+
+    def queue_position(self, job_id: str) -> int:
+        """
+        Returns:
+            int: Queued jobs submitted before this one (0 once it runs)
+        """
+        with self._lock:
+            ahead = 0
+            for queued_id, job in self._jobs.items():
+                if queued_id == job_id:
+                    return ahead if job.status == "queued" else 0
+                if job.status == "queued":
+                    ahead += 1
+            return 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Number of jobs per status, plus the worker count
+        """
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "complete": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        counts["workers"] = self.max_workers
+        return counts
+
+    def _prune(self) -> None:
+        # Caller holds self._lock
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: AnalysisJob) -> None:
+        with self._lock:
+            job.status = "running"
+            job.started_at = time.time()
+
+        status, error = "complete", None
+        try:
+            if job.kind == "analysis":
+                self._stream(job)
+            else:
+                if job.kind == "resume":
+                    result = self.workflow.resume(job.run_id)
+                else:
+                    result = self.workflow.regenerate(job.run_id, job.agent)
+                with self._lock:
+                    job.result = result
+        except Exception as e:
+            status, error = "failed", e
+
+        # Status and end time together - pollers never see one without the other
+        with self._lock:
+            job.status = status
+            job.error = error
+            job.finished_at = time.time()
+            self._prune()
+
+    def _stream(self, job: AnalysisJob) -> None:
+        # A new analysis - keeps the job's progress and partial output current
+        for event in self.workflow.stream_analysis(job.startup_idea, run_id=job.run_id):
+            with self._lock:
+                if event["type"] == "token":
+                    if job.first_token_at is None:
+                        job.first_token_at = time.time()
+                    job.live_chunks.setdefault(event["field"], []).append(event["text"])
+
+                elif event["type"] == "node_complete":
+                    job.completed_nodes.append(event["node"])
+                    if event["node"] == "technical_draft":
+                        # Speculative draft - not the final technical plan
+                        continue
+                    for name in OUTPUT_FIELDS:
+                        if name in event["update"]:
+                            # The finished section is final - replaces the streamed text
+                            job.live_chunks[name] = [event["update"][name]]
+                            job.finished_fields.add(name)
+
+                elif event["type"] == "complete":
+                    job.result = event["result"]
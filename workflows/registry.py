@@ -0,0 +1,128 @@
+"""
+Agent Registry - Derive the workflow graph from what each agent reads and writes
+Every node declares the AgentState fields it reads and writes. A node runs
+after the nodes producing its inputs, and nodes that don't depend on each
+other run in parallel - adding an agent means declaring it, not rewiring
+the graph by hand.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+@dataclass
+class AgentSpec:
+    """
+    One workflow node and the state fields it depends on
+
+    Metadata fields every node may touch (current_step, metrics) are not
+    declared.
+    """
+    name: str
+    reads: tuple
+    writes: tuple
+    run: Callable
+    arun: Optional[Callable] = None  # async version, if the node has one
+
+
+def _topological_order(dependencies: Dict[str, Set[str]]) -> List[str]:
+    """
+    Node names with every node after all of its dependencies
+    """
+    order = []
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"Agents depend on each other in a cycle: {', '.join(sorted(remaining))}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return order
+
+
+def derive_dependencies(specs: Iterable[AgentSpec], inputs: Iterable[str]) -> Dict[str, Set[str]]:
+    """
+    Work out which nodes each node has to wait for
+
+    A node depends on the producers of the fields it reads. Dependencies
+    already implied by another one are dropped (transitive reduction), so
+    marketing waits for technical only, not for strategy as well.
+
+    Args:
+        specs (iterable): AgentSpec of every node
+        inputs (iterable): Fields provided by the caller, not by a node
+
+    Returns:
+        dict: node name -> names of the nodes it directly waits for
+    """
+    specs = list(specs)
+    inputs = set(inputs)
+
+    producers = {}
+    for spec in specs:
+        for field in spec.writes:
+            if field in producers:
+                raise ValueError(f"{field} is written by both {producers[field]} and {spec.name}")
+            producers[field] = spec.name
+
+    dependencies = {}
+    for spec in specs:
+        deps = set()
+        for field in spec.reads:
+            if field in producers:
+                deps.add(producers[field])
+            elif field not in inputs:
+                raise ValueError(f"{spec.name} reads {field}, which no agent writes")
+        deps.discard(spec.name)
+        dependencies[spec.name] = deps
+
+    ancestors = {}
+    for name in _topological_order(dependencies):
+        ancestors[name] = set()
+        for dep in dependencies[name]:
+            ancestors[name] |= {dep} | ancestors[dep]
+
+    return {
+        name: {dep for dep in deps if not any(dep in ancestors[other] for other in deps)}
+        for name, deps in dependencies.items()
+    }
+
+
+def critical_path(dependencies: Dict[str, Set[str]], metrics: dict) -> dict:
+    """
+    The chain of nodes that determined how long a run took
+
+    Args:
+        dependencies (dict): Output of derive_dependencies
+        metrics (dict): Per-node metrics of the run (nodes without an
+            entry count as taking no time)
+
+    Returns:
+        dict: {"nodes": [names, first to last], "duration_s": their total time}
+    """
+    finish = {}
+    previous = {}
+
+    for name in _topological_order(dependencies):
+        duration = metrics.get(name, {}).get("duration_s", 0.0)
+        slowest = max(dependencies[name], key=lambda dep: finish[dep], default=None)
+        previous[name] = slowest
+        finish[name] = duration + (finish[slowest] if slowest else 0.0)
+
+    if not finish:
+        return {"nodes": [], "duration_s": 0.0}
+
+    # Ties go to the later node, so the path runs through to the final node
+    node = max(reversed(list(finish)), key=finish.get)
+    total = finish[node]
+    path = []
+    while node:
+        path.append(node)
+        node = previous[node]
+
+    return {"nodes": path[::-1], "duration_s": round(total, 3)}
@@ -0,0 +1,134 @@
+"""
+Sections - Work with the "## " sections of an agent answer
+The agents structure their answers as "## 1. Title" headings. Downstream
+agents are handed only the sections they use, and while an answer is
+still streaming, a section counts as finished once the next heading has
+started.
+"""
+
+import re
+from typing import Iterable, List, Tuple
+
+# "## 1. Executive Summary", "### **Target Market**", ...
+HEADING_PATTERN = re.compile(r"^#{2,6}[ \t]+(.+?)[ \t#]*$", re.MULTILINE)
+# Same, keeping the "#"s to tell "##" sections from "###" subsections
+LEVELED_HEADING_PATTERN = re.compile(r"^(#{2,6})[ \t]+(.+?)[ \t#]*$", re.MULTILINE)
+
+
+def normalize_heading(title: str) -> str:
+    """
+    Lower-case a heading and drop numbering and markdown emphasis, so
+    "## 2. **Business Model & Value Proposition**" becomes
+    "business model & value proposition"
+    """
+    title = title.replace("*", "").replace("_", " ")
+    title = re.sub(r"^\s*\d+[.)]?\s*", "", title)
+    return " ".join(title.lower().split())
+
+
+def parse_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Split an answer into its top-level sections
+
+    The top level is the largest heading the answer uses ("##" for the
+    agents' prompts); smaller headings stay inside their section.
+
+    Args:
+        text (str): Complete agent answer
+
+    Returns:
+        list: (normalized title, section text including its heading line);
+        text before the first heading comes first with title ""
+    """
+    headings = list(LEVELED_HEADING_PATTERN.finditer(text))
+    if not headings:
+        return [("", text)]
+
+    top_level = min(len(match.group(1)) for match in headings)
+    starts = [match for match in headings if len(match.group(1)) == top_level]
+
+    sections = []
+    if text[:starts[0].start()].strip():
+        sections.append(("", text[:starts[0].start()].strip()))
+    for match, following in zip(starts, starts[1:] + [None]):
+        end = following.start() if following else len(text)
+        sections.append((normalize_heading(match.group(2)), text[match.start():end].strip()))
+    return sections
+
+
+def select_sections(text: str, wanted: Iterable[str]) -> str:
+    """
+    Keep only the sections a downstream agent uses
+
+    A wanted title matches a heading that starts with it, e.g.
+    "Target Market" matches "Target Market & Customer Segments". If none
+    of the wanted sections are found (the model ignored the structure),
+    the whole text is returned rather than nothing.
+
+    Args:
+        text (str): Complete agent answer
+        wanted (iterable): Section titles to keep
+
+    Returns:
+        str: The matching sections, in their original order
+    """
+    wanted = [normalize_heading(name) for name in wanted]
+    kept = [
+        section for title, section in parse_sections(text)
+        if title and any(title.startswith(name) for name in wanted)
+    ]
+    return "\n\n".join(kept) if kept else text
+
+
+def completed_sections(text: str, finished: bool = False) -> List[str]:
+    """
+    Normalized titles of the sections whose text is complete
+
+    Args:
+        text (str): Answer generated so far
+        finished (bool): True once the stream has ended, which also
+            completes the last section
+
+    Returns:
+        list: Titles in the order they appear
+    """
+    titles = [normalize_heading(match.group(1)) for match in HEADING_PATTERN.finditer(text)]
+
+    # The last heading is only closed by the one after it (a heading line
+    # is only final once its newline has arrived)
+    if not finished and titles:
+        titles.pop()
+    return titles
+
+
+def completed_text(text: str, finished: bool = False) -> str:
+    """
+    The part of `text` made of complete sections - the section still being
+    written is cut off, so a downstream agent never reads half a sentence
+    """
+    if finished:
+        return text
+
+    headings = list(HEADING_PATTERN.finditer(text))
+    if not headings:
+        return ""
+    return text[:headings[-1].start()].rstrip()
+
+
+def sections_complete(text: str, required: Iterable[str], finished: bool = False) -> bool:
+    """
+    True once every required section is complete
+
+    A required title matches a heading that starts with it, e.g.
+    "Business Model" matches "Business Model & Value Proposition".
+    When the stream has ended everything counts as complete, even if the
+    model did not use the expected headings.
+    """
+    if finished:
+        return True
+
+    done = completed_sections(text)
+    return all(
+        any(title.startswith(normalize_heading(name)) for title in done)
+        for name in required
+    )